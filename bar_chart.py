@@ -0,0 +1,271 @@
+"""
+Array-backed bar charts for per-class metrics over many classes.
+
+A ``Rectangle`` and a label per bar is one VMobject per class, and sorting
+them means one ``Transform`` per bar.  ``BarChart`` keeps every bar's height,
+slot and RGBA in NumPy arrays and draws all bars as two triangles each in a
+single draw call.  Reordering is a permutation of the slot array, and
+``.animate`` interpolates heights, slots and colors of every bar at once, so
+sorting 1,000 classes is one vectorized interpolation per frame.
+
+When bars get narrower than a pixel, the chart draws one column per pixel
+instead, as tall as the tallest bar landing in it and colored like it: the
+envelope of the long tail, rather than thousands of sub-pixel slivers.
+
+    chart = BarChart(recall, width=6, height=3, colors=class_colors)
+    chart.track_camera(self.camera)          # re-pick bars or envelope as the camera zooms
+    self.play(FadeIn(chart))
+    self.play(chart.animate.sort_by_height())                    # descending, all bars at once
+    self.play(chart.animate.set_heights(new_recall))
+    curve = VMobject().set_points_smoothly(chart.get_tops_in_slot_order())
+"""
+from __future__ import annotations
+
+import moderngl
+import numpy as np
+
+from manimlib import BLUE_D
+from manimlib import DL
+from manimlib import DOWN
+from manimlib import DR
+from manimlib import FRAME_WIDTH
+from manimlib import UL
+from manimlib import Mobject
+from manimlib import Surface
+from manimlib.constants import DEFAULT_PIXEL_WIDTH
+from manimlib.shader_wrapper import ShaderWrapper
+
+from point_cloud import colors_to_rgb
+
+
+# Bar corners as (slot, height) fractions, two triangles per bar
+BAR_CORNER_U = np.array([0, 1, 1, 0, 1, 0])
+BAR_CORNER_V = np.array([0, 0, 1, 0, 1, 1])
+
+
+class BarChart(Mobject):
+    """
+    One bar per entry of ``heights``, bar ``i`` standing in slot
+    ``slots[i]`` (its order in the chart, 0 at the left; the entry order by
+    default).  ``n_slots`` slots of equal pitch span ``width``, heights up
+    to ``y_max`` span ``height``, and each bar covers ``bar_width`` of its
+    slot.  Bars can be hidden with zero opacity and brought in later.
+    """
+    shader_folder: str = "surface"
+    render_primitive: int = moderngl.TRIANGLES
+
+    def __init__(
+        self,
+        heights,
+        width: float = 6.0,
+        height: float = 3.0,
+        y_max: float | None = None,
+        n_slots: int | None = None,
+        slots=None,
+        colors=BLUE_D,
+        bar_opacity: float = 0.75,
+        bar_width: float = 0.8,
+        **kwargs
+    ):
+        heights = np.asarray(heights, dtype=float)
+        n = len(heights)
+        self.heights = heights.copy()
+        self.slots = np.arange(n, dtype=float) if slots is None else np.asarray(slots, dtype=float).copy()
+        self.bar_rgba = np.ones((n, 4))
+        self.bar_rgba[:, :3] = colors_to_rgb(colors, n)
+        self.bar_rgba[:, 3] = bar_opacity
+        self.n_slots = n if n_slots is None else n_slots
+        self.y_max = (heights.max() if n and heights.max() > 0 else 1.0) if y_max is None else y_max
+        self.bar_width = bar_width
+        self.chart_width = width
+        self.chart_height = height
+        self.pixel_size = FRAME_WIDTH / DEFAULT_PIXEL_WIDTH
+        self.label_buff = 0.0
+        super().__init__(**kwargs)
+
+    def init_data(self) -> None:
+        # Three corners of the chart's frame; the bars are laid out inside
+        # them, so shifting, scaling or rotating the chart moves every bar
+        super().init_data(length=3)
+        self.data["point"][:] = [DL, DR, UL]
+        self.data["rgba"][:] = 1
+
+    def init_points(self) -> None:
+        self.set_width(self.chart_width, stretch=True)
+        self.set_height(self.chart_height, stretch=True)
+
+    @property
+    def n_bars(self) -> int:
+        return len(self.heights)
+
+    @property
+    def bar_labels(self) -> list[Mobject]:
+        """The labels added by ``add_bar_labels``, one per bar; copies get their own."""
+        return self.submobjects
+
+    # ------------------------------------------------------------------
+    # Layout
+    # ------------------------------------------------------------------
+    def chart_to_point(self, u, v) -> np.ndarray:
+        """Scene points at fractions ``u`` of the width and ``v`` of the height."""
+        origin, right, top = self.data["point"]
+        u = np.asarray(u, dtype=float)[..., None]
+        v = np.asarray(v, dtype=float)[..., None]
+        return origin + u * (right - origin) + v * (top - origin)
+
+    def get_slot_pitch(self) -> float:
+        origin, right, _ = self.data["point"]
+        return np.linalg.norm(right - origin) / self.n_slots
+
+    def get_bar_bottoms(self) -> np.ndarray:
+        """(N, 3) midpoints of the bars' bottom edges."""
+        return self.chart_to_point((self.slots + 0.5) / self.n_slots, np.zeros(self.n_bars))
+
+    def get_bar_tops(self) -> np.ndarray:
+        """(N, 3) midpoints of the bars' top edges."""
+        return self.chart_to_point((self.slots + 0.5) / self.n_slots, self.heights / self.y_max)
+
+    def get_slot_order(self) -> np.ndarray:
+        """Bar indices from the leftmost slot to the rightmost."""
+        return np.argsort(self.slots, kind="stable")
+
+    def get_tops_in_slot_order(self, indices=None) -> np.ndarray:
+        """Bar tops left to right, e.g. for a curve over the chart; only ``indices`` if given."""
+        order = self.get_slot_order()
+        if indices is not None:
+            order = order[np.isin(order, indices)]
+        return self.get_bar_tops()[order]
+
+    def is_aggregated(self) -> bool:
+        """Whether bars are narrower than a pixel, so the envelope is drawn instead."""
+        return self.bar_width * self.get_slot_pitch() < self.pixel_size
+
+    # ------------------------------------------------------------------
+    # Bars
+    # ------------------------------------------------------------------
+    def refresh_bars(self):
+        self.note_changed_data()
+        if self.bar_labels:
+            self.place_bar_labels()
+        return self
+
+    def set_heights(self, heights, indices=None):
+        self.heights[slice(None) if indices is None else indices] = heights
+        return self.refresh_bars()
+
+    def set_slots(self, slots, indices=None):
+        self.slots[slice(None) if indices is None else indices] = slots
+        return self.refresh_bars()
+
+    def reorder(self, order):
+        """Put bar ``order[k]`` in slot ``k``; bars not in ``order`` keep their slots."""
+        order = np.asarray(order, dtype=int)
+        return self.set_slots(np.arange(len(order)), order)
+
+    def sort_by_height(self, descending: bool = True, indices=None):
+        """Reorder the bars (or just ``indices``, into the first slots) by height."""
+        indices = np.arange(self.n_bars) if indices is None else np.asarray(indices, dtype=int)
+        heights = self.heights[indices]
+        return self.reorder(indices[np.argsort(-heights if descending else heights, kind="stable")])
+
+    def set_bar_colors(self, colors, opacity=None, indices=None):
+        selection = slice(None) if indices is None else indices
+        n = len(self.bar_rgba[selection])
+        self.bar_rgba[selection, :3] = colors_to_rgb(colors, n)
+        if opacity is not None:
+            self.bar_rgba[selection, 3] = opacity
+        return self.refresh_bars()
+
+    def set_bar_opacity(self, opacity, indices=None):
+        self.bar_rgba[slice(None) if indices is None else indices, 3] = opacity
+        return self.refresh_bars()
+
+    def add_bar_labels(self, labels, buff: float = 0.12):
+        """
+        Hang one mobject under each bar.  The labels are submobjects placed
+        by the chart, so they follow the bars through every reorder.
+        """
+        self.label_buff = buff
+        self.set_submobjects(list(labels))
+        return self.place_bar_labels()
+
+    def place_bar_labels(self):
+        for label, bottom in zip(self.bar_labels, self.get_bar_bottoms()):
+            label.next_to(bottom, DOWN, buff=self.label_buff)
+        return self
+
+    def interpolate(self, mobject1, mobject2, alpha, *args, **kwargs):
+        super().interpolate(mobject1, mobject2, alpha, *args, **kwargs)
+        if isinstance(mobject1, BarChart) and isinstance(mobject2, BarChart) \
+                and mobject1.n_bars == mobject2.n_bars == self.n_bars:
+            self.heights[:] = (1 - alpha) * mobject1.heights + alpha * mobject2.heights
+            self.slots[:] = (1 - alpha) * mobject1.slots + alpha * mobject2.slots
+            self.bar_rgba[:] = (1 - alpha) * mobject1.bar_rgba + alpha * mobject2.bar_rgba
+            self.note_changed_data()
+        return self
+
+    # ------------------------------------------------------------------
+    # Rendering
+    # ------------------------------------------------------------------
+    def update_pixel_size(self, pixel_size: float):
+        """Draw for ``pixel_size`` scene units per pixel, switching to the envelope below a pixel."""
+        was_aggregated = self.is_aggregated()
+        self.pixel_size = pixel_size
+        if self.is_aggregated() or was_aggregated:
+            self.note_changed_data()
+        return self
+
+    def track_camera(self, camera):
+        """Keep choosing between bars and envelope from ``camera``'s zoom while the scene runs."""
+        self.update_pixel_size(camera.get_pixel_size())
+        self.add_updater(lambda m: m.update_pixel_size(camera.get_pixel_size()))
+        return self
+
+    def get_drawn_bars(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, float]:
+        """
+        Left edges and heights (as chart fractions), RGBA and the width of
+        the rectangles actually drawn: the visible bars, or, when those are
+        narrower than a pixel, one column per pixel holding the tallest of
+        the bars whose centers fall in it.
+        """
+        visible = self.bar_rgba[:, 3] > 0
+        centers = (self.slots[visible] + 0.5) / self.n_slots
+        heights = self.heights[visible] / self.y_max
+        rgba = self.bar_rgba[visible]
+        if not self.is_aggregated():
+            width = self.bar_width / self.n_slots
+            return centers - width / 2, heights, rgba, width
+
+        n_columns = max(int(np.ceil(self.n_slots * self.get_slot_pitch() / self.pixel_size)), 1)
+        columns = np.clip((centers * n_columns).astype(int), 0, n_columns - 1)
+        # Sorted by column, then height: the last bar of each column is its tallest
+        order = np.lexsort((heights, columns))
+        last = np.flatnonzero(np.append(np.diff(columns[order]) != 0, True))
+        tallest = order[last]
+        return columns[tallest] / n_columns, heights[tallest], rgba[tallest], 1 / n_columns
+
+    def init_shader_wrapper(self, ctx: moderngl.Context):
+        self.shader_wrapper = ShaderWrapper(
+            ctx=ctx,
+            vert_data=np.zeros(0, dtype=Surface.data_dtype),
+            shader_folder=self.shader_folder,
+            mobject_uniforms=self.uniforms,
+            depth_test=self.depth_test,
+            render_primitive=self.render_primitive,
+            code_replacements=self.shader_code_replacements,
+        )
+
+    def get_shader_data(self) -> np.ndarray:
+        lefts, heights, rgba, width = self.get_drawn_bars()
+        u = lefts[:, None] + width * BAR_CORNER_U
+        v = heights[:, None] * BAR_CORNER_V
+        points = self.chart_to_point(u, v).reshape(-1, 3)
+        origin, right, top = self.data["point"]
+        result = np.empty(len(points), dtype=Surface.data_dtype)
+        result["point"] = points
+        # Flat shading only needs the normal to face the camera
+        result["du_point"] = points + (right - origin)
+        result["dv_point"] = points + (top - origin)
+        rgba = rgba * [1, 1, 1, self.data["rgba"][0, 3]]
+        result["rgba"] = np.repeat(rgba, len(BAR_CORNER_U), axis=0)
+        return result
@@ -0,0 +1,270 @@
+"""
+Headless benchmark of every CLIP scene.
+
+    python benchmark.py                      # 1280x720 @ 30 fps
+    python benchmark.py --quick              # 426x240 @ 5 fps, for every change
+    python benchmark.py --out bench/main.json UMAPVisualizationScene
+
+Each scene runs in its own process (so peak RSS is per scene) against a
+software OpenGL context (EGL + llvmpipe), draws and reads back every frame
+exactly as a movie render would, but never starts ffmpeg.  Per scene it
+records total wall time, mean / p95 frame time, time spent in construct
+outside play/wait, peak RSS and peak mobject count, and writes them to JSON.
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import importlib.util
+import json
+import os
+import platform
+import resource
+import subprocess as sp
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from render_all import REPO_DIR, discover_scenes
+
+
+DEFAULT_RESOLUTION = (1280, 720)
+DEFAULT_FPS = 30
+QUICK_RESOLUTION = (426, 240)
+QUICK_FPS = 5
+
+
+# ------------------------------------------------------------------
+# Worker side: runs inside the per-scene child process
+# ------------------------------------------------------------------
+def install_headless_camera():
+    """Make every Scene create its camera on a standalone EGL context."""
+    import moderngl
+    import manimlib.scene.scene as scene_module
+    from manimlib.camera.camera import Camera
+
+    class HeadlessCamera(Camera):
+        def init_context(self) -> None:
+            self.ctx = moderngl.create_standalone_context(backend="egl")
+            self.ctx.enable(moderngl.PROGRAM_POINT_SIZE)
+            self.ctx.enable(moderngl.BLEND)
+
+    scene_module.Camera = HeadlessCamera
+
+
+class SceneProbe(object):
+    """Wraps a scene instance's play/wait/frame methods to collect timings."""
+
+    def __init__(self, scene):
+        self.scene = scene
+        self.frame_times = []
+        self.play_time = 0.0
+        self.peak_mobjects = 0
+        self.n_plays = 0
+        self._last_frame = None
+
+        for name in ("play", "wait"):
+            self.wrap_segment(name)
+        self.wrap("pre_play", after=self.on_pre_play)
+        self.wrap("emit_frame", after=self.on_frame)
+
+    def wrap(self, name, after):
+        method = getattr(self.scene, name)
+
+        def wrapper(*args, **kwargs):
+            result = method(*args, **kwargs)
+            after()
+            return result
+        setattr(self.scene, name, wrapper)
+
+    def wrap_segment(self, name):
+        method = getattr(self.scene, name)
+
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.play_time += time.perf_counter() - start
+                self.n_plays += 1
+                self.count_mobjects()
+        setattr(self.scene, name, wrapper)
+
+    def count_mobjects(self):
+        n = len(self.scene.get_mobject_family_members())
+        self.peak_mobjects = max(self.peak_mobjects, n)
+
+    def on_pre_play(self):
+        self.count_mobjects()
+        self._last_frame = time.perf_counter()
+
+    def on_frame(self):
+        # Read the frame back like the movie writer would, so GPU work is
+        # actually finished inside the measured interval
+        self.scene.camera.get_raw_fbo_data()
+        now = time.perf_counter()
+        if self._last_frame is not None:
+            self.frame_times.append(now - self._last_frame)
+        self._last_frame = now
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    k = (len(values) - 1) * q / 100
+    lo = int(k)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+
+def run_worker(file_name, scene_name, resolution, fps, result_file):
+    # manimlib parses sys.argv when imported, so hide our own arguments
+    sys.argv = sys.argv[:1]
+    os.chdir(REPO_DIR)
+    sys.path.insert(0, str(REPO_DIR))
+
+    install_headless_camera()
+    spec = importlib.util.spec_from_file_location(Path(file_name).stem, file_name)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    scene_class = getattr(module, scene_name)
+
+    start = time.perf_counter()
+    scene = scene_class(
+        camera_config=dict(resolution=resolution, fps=fps),
+        file_writer_config=dict(write_to_movie=False, quiet=True),
+    )
+    probe = SceneProbe(scene)
+    scene.run()
+    wall = time.perf_counter() - start
+
+    frames = probe.frame_times
+    result = dict(
+        file=file_name,
+        wall_time=wall,
+        frames=len(frames),
+        scene_time=scene.time,
+        n_plays=probe.n_plays,
+        mean_frame_time=sum(frames) / len(frames) if frames else 0.0,
+        p95_frame_time=percentile(frames, 95),
+        max_frame_time=max(frames, default=0.0),
+        construct_outside_play=wall - probe.play_time,
+        # ru_maxrss is in KiB on Linux and bytes on macOS
+        peak_rss_mb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (
+            1024 ** 2 if platform.system() == "Darwin" else 1024
+        ),
+        peak_mobjects=probe.peak_mobjects,
+    )
+    Path(result_file).write_text(json.dumps(result))
+
+
+# ------------------------------------------------------------------
+# Driver side
+# ------------------------------------------------------------------
+def benchmark_scene(file_name, scene_name, resolution, fps):
+    env = dict(os.environ)
+    env.update(
+        PYGLET_HEADLESS="1",
+        LIBGL_ALWAYS_SOFTWARE="1",
+        # The play cache only engages when writing movies, but be explicit
+        CLIP_PLAY_CACHE="0",
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        result_file = Path(tmp, "result.json")
+        cmd = [
+            sys.executable, str(Path(__file__).resolve()), "--worker",
+            "--resolution", "{}x{}".format(*resolution),
+            "--fps", str(fps),
+            "--result-file", str(result_file),
+            file_name, scene_name,
+        ]
+        proc = sp.run(cmd, cwd=REPO_DIR, env=env, stdout=sp.PIPE, stderr=sp.STDOUT, text=True)
+        if proc.returncode != 0 or not result_file.exists():
+            return dict(file=file_name, error=proc.stdout[-4000:])
+        return json.loads(result_file.read_text())
+
+
+def git_revision():
+    proc = sp.run(
+        ["git", "rev-parse", "--short", "HEAD"],
+        cwd=REPO_DIR, stdout=sp.PIPE, stderr=sp.DEVNULL, text=True,
+    )
+    return proc.stdout.strip() or None
+
+
+def parse_resolution(s):
+    w, h = s.lower().split("x")
+    return int(w), int(h)
+
+
+def print_summary(results):
+    header = f"{'scene':<34} {'wall':>8} {'frames':>7} {'mean':>8} {'p95':>8} {'setup':>8} {'rss':>8} {'mobs':>7}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        if "error" in r:
+            print(f"{name:<34} FAILED")
+            continue
+        print(
+            f"{name:<34} {r['wall_time']:7.1f}s {r['frames']:7d} "
+            f"{1000 * r['mean_frame_time']:6.1f}ms {1000 * r['p95_frame_time']:6.1f}ms "
+            f"{r['construct_outside_play']:7.1f}s {r['peak_rss_mb']:6.0f}MB {r['peak_mobjects']:7d}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="low resolution, few fps")
+    parser.add_argument("--resolution", type=parse_resolution, default=None, help="e.g. 1280x720")
+    parser.add_argument("--fps", type=int, default=None)
+    parser.add_argument("--out", default=None, help="JSON output path")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    parser.add_argument("scenes", nargs="*", help="scene names, or FILE SCENE with --worker")
+    args = parser.parse_args()
+
+    resolution = args.resolution or (QUICK_RESOLUTION if args.quick else DEFAULT_RESOLUTION)
+    fps = args.fps or (QUICK_FPS if args.quick else DEFAULT_FPS)
+
+    if args.worker:
+        file_name, scene_name = args.scenes
+        run_worker(file_name, scene_name, resolution, fps, args.result_file)
+        return 0
+
+    scenes = discover_scenes()
+    if args.scenes:
+        scenes = [s for s in scenes if s[1] in args.scenes]
+
+    results = {}
+    for file_name, scene_name in scenes:
+        print(f"Benchmarking {scene_name} ...", flush=True)
+        results[scene_name] = benchmark_scene(file_name, scene_name, resolution, fps)
+        if "error" in results[scene_name]:
+            print(results[scene_name]["error"])
+
+    report = dict(
+        meta=dict(
+            timestamp=datetime.datetime.now().isoformat(timespec="seconds"),
+            git_revision=git_revision(),
+            python=platform.python_version(),
+            platform=platform.platform(),
+            resolution=list(resolution),
+            fps=fps,
+            quick=args.quick,
+        ),
+        scenes=results,
+    )
+    out = Path(args.out or f"bench/{'quick' if args.quick else 'full'}.json")
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2))
+
+    print()
+    print_summary(results)
+    print(f"\nResults written to {out}")
+    return int(any("error" in r for r in results.values()))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
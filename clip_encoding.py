@@ -1,8 +1,17 @@
 from manimlib import *
 import numpy as np
+import os
+import sys
 
+# manimgl loads scene files by path, so make the sibling helper modules importable
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-class CLIPEncoding(Scene):
+from play_cache import PlayCacheMixin
+from play_profiler import PlayProfilerMixin
+from tex_cache import CachedTex
+
+
+class CLIPEncoding(PlayProfilerMixin, PlayCacheMixin, Scene):
     def construct(self):
         tok_colors = [BLUE_C, GREEN_C, TEAL_C, BLUE_B, YELLOW_C]
         patch_colors = [
@@ -24,7 +33,7 @@ class CLIPEncoding(Scene):
             box = SurroundingRectangle(layers, buff=0.2, color=color)
             box.set_stroke(width=2.5)
             box.set_fill(BLACK, opacity=0.6)
-            lbl = Tex(R"\text{" + label + "}", font_size=22, color=WHITE)
+            lbl = CachedTex(R"\text{" + label + "}", font_size=22, color=WHITE)
             lbl.next_to(box, UP, buff=0.15)
             grp = VGroup(box, layers, lbl)
             grp.move_to(pos)
@@ -44,7 +53,7 @@ class CLIPEncoding(Scene):
         # ================================================================
         # STAGE 1 — Text input on the left, image on the right
         # ================================================================
-        sentence = Tex(
+        sentence = CachedTex(
             R"\text{a photo of a dog}",
             font_size=40, color=GREEN_C,
         )
@@ -62,9 +71,9 @@ class CLIPEncoding(Scene):
         image_grid.center()
         image_grid.move_to([RX, 3.0, 0])
 
-        img_lbl = Tex(R"\text{Image}", font_size=22, color=GREY_B)
+        img_lbl = CachedTex(R"\text{Image}", font_size=22, color=GREY_B)
         img_lbl.next_to(image_grid, UP, buff=0.25)
-        txt_lbl = Tex(R"\text{Text}", font_size=22, color=GREY_B)
+        txt_lbl = CachedTex(R"\text{Text}", font_size=22, color=GREY_B)
         txt_lbl.next_to(sentence, UP, buff=0.25)
 
         self.play(
@@ -82,7 +91,7 @@ class CLIPEncoding(Scene):
         words = ["a", "photo", "of", "a", "dog"]
         toks = VGroup()
         for w, c in zip(words, tok_colors):
-            t = Tex(R"\text{" + w + "}", font_size=30, color=WHITE)
+            t = CachedTex(R"\text{" + w + "}", font_size=30, color=WHITE)
             bx = SurroundingRectangle(t, buff=0.1, color=c)
             bx.set_fill(c, opacity=0.25)
             bx.set_stroke(width=2)
@@ -125,7 +134,7 @@ class CLIPEncoding(Scene):
             te_box.get_bottom(), txt_emb.get_top(),
             buff=0.1, stroke_color=BLUE_C, thickness=2,
         )
-        te_lbl = Tex(R"\text{Text Embedding}", font_size=18, color=GREY_A)
+        te_lbl = CachedTex(R"\text{Text Embedding}", font_size=18, color=GREY_A)
         te_lbl.next_to(txt_emb, DOWN, buff=0.2)
 
         self.play(
@@ -159,7 +168,7 @@ class CLIPEncoding(Scene):
                 stroke_color=WHITE, stroke_width=2,
             ))
 
-        spl = Tex(R"\text{Split into patches}", font_size=18, color=GREY_A)
+        spl = CachedTex(R"\text{Split into patches}", font_size=18, color=GREY_A)
         spl.next_to(image_grid, DOWN, buff=0.25)
 
         self.play(
@@ -193,7 +202,7 @@ class CLIPEncoding(Scene):
             ie_box.get_bottom(), img_emb.get_top(),
             buff=0.1, stroke_color=TEAL_C, thickness=2,
         )
-        ie_lbl = Tex(R"\text{Image Embedding}", font_size=18, color=GREY_A)
+        ie_lbl = CachedTex(R"\text{Image Embedding}", font_size=18, color=GREY_A)
         ie_lbl.next_to(img_emb, DOWN, buff=0.2)
 
         self.play(
@@ -230,7 +239,7 @@ class CLIPEncoding(Scene):
         bg.set_stroke(BLUE_E, width=1.5)
         bg.move_to(axes.get_center())
 
-        sp_lbl = Tex(
+        sp_lbl = CachedTex(
             R"\text{Shared Embedding Space}",
             font_size=26, color=BLUE_B,
         )
@@ -272,13 +281,13 @@ class CLIPEncoding(Scene):
         )
         self.play(FadeIn(txt_glow), FadeIn(img_glow), run_time=0.5)
 
-        td_lbl = Tex(
+        td_lbl = CachedTex(
             R'\text{"a photo of a dog"}',
             font_size=16, color=BLUE_B,
         )
         td_lbl.next_to(txt_dot, UP + LEFT, buff=0.15)
 
-        id_lbl = Tex(
+        id_lbl = CachedTex(
             R"\text{dog image}",
             font_size=16, color=TEAL_B,
         )
@@ -294,7 +303,7 @@ class CLIPEncoding(Scene):
             dash_length=0.08, stroke_color=YELLOW_C,
         )
         mid = (np.array(txt_pt) + np.array(img_pt)) / 2
-        sim_lbl = Tex(
+        sim_lbl = CachedTex(
             R"\text{cosine similarity}",
             font_size=16, color=YELLOW_C,
         )
@@ -328,9 +337,9 @@ class CLIPEncoding(Scene):
                 t_p, i_p,
                 dash_length=0.05, stroke_color=GREY_B, stroke_width=1,
             )
-            tl = Tex(ts, font_size=13, color=tc)
+            tl = CachedTex(ts, font_size=13, color=tc)
             tl.next_to(td, UP, buff=0.08)
-            il = Tex(is_, font_size=13, color=ic)
+            il = CachedTex(is_, font_size=13, color=ic)
             il.next_to(id_, DOWN, buff=0.08)
 
             new_mobs.add(td, id_, dl, tl, il)
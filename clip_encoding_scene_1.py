@@ -2,8 +2,26 @@ from manimlib import *
 import numpy as np
 import random
 import os
-
-class CLIPSharedEmbeddingSpace(Scene):
+import sys
+
+# manimgl loads scene files by path, so make the sibling helper modules importable
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from image_patches import PixelImage
+from image_patches import embed_patches
+from image_patches import load_image
+from image_patches import patch_mobjects
+from image_patches import patch_projection
+from image_patches import patch_views
+from play_cache import PlayCacheMixin
+from play_profiler import PlayProfilerMixin
+
+# ViT-B/16 input: a 224 x 224 crop cut into a 14 x 14 grid of 16 x 16 patches
+IMAGE_SIZE = 224
+PATCH_SIZE = 16
+EMBED_DIM = 6
+
+class CLIPSharedEmbeddingSpace(PlayProfilerMixin, PlayCacheMixin, Scene):
     def construct(self):
         self.camera.background_color = BLACK
         # Use a TeX-like font via Pango (no LaTeX install needed)
@@ -33,14 +51,16 @@ class CLIPSharedEmbeddingSpace(Scene):
             box.set_fill(color, opacity=0.15)
             return VGroup(box, t)
 
-        def make_number_vector(n=6, buff=0.12, offset=0, pad=0.18):
+        def make_number_vector(n=6, buff=0.12, offset=0, pad=0.18, values=None):
             # Vertical vector: numbers in a column with bracket-like top/bottom (single math entity)
-            # offset 用來讓兩邊向量數字不同（e.g. text 用 0，image 用非 0）
+            # offset 用來讓兩邊向量數字不同（e.g. text 用 0，image 用非 0）；values 給定時直接顯示
             nums = VGroup()
             for i in range(n):
                 val = (i * 17 + offset * 13) % 100 / 100.0
                 if i % 2 == 1:
                     val = -val
+                if values is not None:
+                    val = values[i]
                 num = Text(f"{val:.2f}", font_size=22, color=WHITE)
                 nums.add(num)
             nums.arrange(DOWN, buff=buff)
@@ -61,39 +81,6 @@ class CLIPSharedEmbeddingSpace(Scene):
             vec = VGroup(brackets, nums)
             return vec
 
-        def make_image_grid(n=8, patch_size=0.28):
-            # lightweight "image" placeholder: colored grid
-            # (14x14 is heavy; this keeps it smooth while still conveying the idea)
-            palette = [BLUE_E, BLUE_D, BLUE_C, TEAL_E, TEAL_D, TEAL_C, GREEN_E, GREEN_D, GREEN_C, YELLOW_E]
-            grid = VGroup()
-            for i in range(n):
-                for j in range(n):
-                    sq = Square(side_length=patch_size)
-                    sq.set_fill(random.choice(palette), opacity=1)
-                    sq.set_stroke(BLACK, 0.0)
-                    sq.move_to(np.array([j * patch_size, -i * patch_size, 0]))
-                    grid.add(sq)
-            grid.center()
-            frame = SurroundingRectangle(grid, buff=0.05, color=GREY_B)
-            frame.set_stroke(width=1.2)
-            return VGroup(grid, frame)
-
-        def make_grid_overlay_for(grid_group, n=8, patch_size=0.28):
-            # overlay lines on top of the image grid
-            grid = grid_group[0]
-            left_x = grid[0].get_left()[0]
-            right_x = grid[n-1].get_right()[0]
-            top_y = grid[0].get_top()[1]
-            bot_y = grid[n*(n-1)].get_bottom()[1]
-
-            lines = VGroup()
-            for k in range(1, n):
-                y = top_y - k * patch_size
-                lines.add(Line([left_x, y, 0], [right_x, y, 0], stroke_color=WHITE, stroke_width=1.6))
-                x = left_x + k * patch_size
-                lines.add(Line([x, top_y, 0], [x, bot_y, 0], stroke_color=WHITE, stroke_width=1.6))
-            return lines
-
         def make_glow_dot(color=BLUE_C, r=0.08):
             core = Dot(radius=r)
             core.set_fill(color, opacity=1)
@@ -162,8 +149,10 @@ class CLIPSharedEmbeddingSpace(Scene):
         # 使用實際狗狗圖片檔
         self.play(FadeIn(right_title), run_time=1)
         self.play(FadeOut(right_title), run_time=0.5)
-        dog_img = ImageMobject("example_photos/dog_photo.jpg")
-        dog_img.set_height(2.0)  # [可調] 圖片高度
+        # 圖片只解碼一次；patch 與 embedding 都是同一塊 pixel 陣列的 view
+        dog_pixels = load_image("example_photos/dog_photo.jpg", size=IMAGE_SIZE)
+        dog_patches = patch_views(dog_pixels, PATCH_SIZE)
+        dog_img = PixelImage(dog_pixels, height=2.0)  # [可調] 圖片高度
         dog_img.move_to(np.array([right_track_x - 1.8, 1.8, 0]))  # [可調] 位置
 
         # 圖片上方的說明文字
@@ -173,8 +162,8 @@ class CLIPSharedEmbeddingSpace(Scene):
         # 動畫：圖片與說明淡入
         self.play(FadeIn(dog_img, shift=UP*0.2), FadeIn(img_cap), run_time=0.9)
 
-        # 在狗狗圖片上畫出 6x6 的網格線
-        n_grid = 6
+        # 在狗狗圖片上畫出 14x14 的 patch 網格線
+        n_grid = dog_patches.shape[0]
         grid_lines = VGroup()
         left_x  = dog_img.get_left()[0]
         right_x = dog_img.get_right()[0]
@@ -187,10 +176,10 @@ class CLIPSharedEmbeddingSpace(Scene):
         for k in range(1, n_grid):
             # 水平線
             y = top_y - k * dy
-            grid_lines.add(Line([left_x, y, 0], [right_x, y, 0], stroke_color=WHITE, stroke_width=1.6))
+            grid_lines.add(Line([left_x, y, 0], [right_x, y, 0], stroke_color=WHITE, stroke_width=0.8))
             # 垂直線
             x = left_x + k * dx
-            grid_lines.add(Line([x, top_y, 0], [x, bot_y, 0], stroke_color=WHITE, stroke_width=1.6))
+            grid_lines.add(Line([x, top_y, 0], [x, bot_y, 0], stroke_color=WHITE, stroke_width=0.8))
 
         # 「Split into patches」標籤
         split_lbl = Text("Split into patches", font_size=22, color=GREY_A)
@@ -207,21 +196,8 @@ class CLIPSharedEmbeddingSpace(Scene):
         self.play(FadeIn(img_encoder, shift=UP*0.2), run_time=0.6)
 
         # Patches lift off one-by-one into the encoder
-        # 依照剛才畫的 6x6 grid，在圖片範圍上建立「虛擬 patch 方塊」（實際畫的是 encoder 前要飛的方塊）
-        patches = VGroup()
-        for iy in range(n_grid):
-            for ix in range(n_grid):
-                cx = left_x + (ix + 0.5) * dx
-                cy = top_y  - (iy + 0.5) * dy
-                rect = Rectangle(
-                    width=dx * 0.9,
-                    height=dy * 0.9,
-                    stroke_color=YELLOW_E,
-                    stroke_width=1.2,
-                    fill_color=YELLOW_E,
-                    fill_opacity=0.35,
-                ).move_to(np.array([cx, cy, 0]))
-                patches.add(rect)
+        # 每個 patch 直接顯示圖片上那 16x16 的實際像素
+        patches = patch_mobjects(dog_patches, dog_img, scale=0.9)
 
         # pick a path (simple scan) and animate a subset for speed while still conveying \"one by one\"
         idxs = list(range(len(patches)))
@@ -229,11 +205,9 @@ class CLIPSharedEmbeddingSpace(Scene):
         idxs = idxs[::step]
 
         fly_anims = []
-        flying_patches = VGroup()
+        flying_patches = Group()
         for k, i in enumerate(idxs):
             p = patches[i].copy()
-            p.set_stroke(WHITE, 0.8)
-            p.set_fill(patches[i].get_fill_color(), opacity=1)
             # start at patch, then fly into encoder center
             flying_patches.add(p)
             fly_anims.append(Transform(p, p.copy().scale(0.6).move_to(img_encoder.get_center())))
@@ -242,7 +216,11 @@ class CLIPSharedEmbeddingSpace(Scene):
         self.play(FadeOut(flying_patches), run_time=0.6)
 
         # Image embedding vector（[可調] 同樣改成 6 列）
-        img_vec = make_number_vector(n=6, buff=0.12, offset=31)
+        # 所有 patch 一次 flatten + 線性投影，平均後正規化成 image embedding
+        patch_tokens = embed_patches(dog_patches, patch_projection(PATCH_SIZE, dim=EMBED_DIM))
+        img_embedding = patch_tokens.mean(axis=(0, 1))
+        img_embedding /= np.linalg.norm(img_embedding)
+        img_vec = make_number_vector(n=EMBED_DIM, buff=0.12, values=img_embedding)
         img_vec.move_to(np.array([right_track_x - 1.8, -2.3, 0]))
         img_vec_lbl = Text("Image embedding", font_size=22, color=GREY_A)
         img_vec_lbl.next_to(img_vec, DOWN, buff=0.2)
@@ -1,16 +1,44 @@
 from manimlib import *
 import numpy as np
+import os
+import sys
 
+# manimgl loads scene files by path, so make the sibling helper modules importable
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-def softmax_row(x):
-    """Softmax over a 1D array (row)."""
-    e = np.exp(np.array(x, dtype=float) - np.max(x))
-    return e / e.sum()
+from clip_loss import contrastive_scores
+from heatmap_matrix import HeatmapMatrix
+from number_label import NumberLabel
+from play_cache import PlayCacheMixin
+from play_profiler import PlayProfilerMixin
+from tex_cache import CachedTex
+from timeline import Timeline
+
+
+# Logit scale of the hand-built 3 x 3 example; unit vectors give logits in [-4.5, 4.5]
+LOGIT_SCALE = 4.5
+# Largest heatmap side drawn cell per pair; bigger batches are shown as block averages
+MAX_HEATMAP_CELLS = 256
+
+
+def clip_batch_size() -> int:
+    N = int(os.environ.get("CLIP_BATCH_SIZE", "3"))
+    if N < 1:
+        raise ValueError(f"CLIP_BATCH_SIZE must be a positive number of pairs, got {N}")
+    return N
+
+
+def synthetic_batch(N, dim=64, noise=0.8, seed=0):
+    """N matched (image, text) embedding pairs: each text vector is its image vector plus noise."""
+    rng = np.random.default_rng(seed)
+    img = rng.normal(size=(N, dim))
+    txt = img + noise * rng.normal(size=(N, dim))
+    return img, txt
 
 
 def create_matrix_cells(N, grid_anchor, step, cell_size, scale_factor):
     """
-    Create NxN grid of cells. Each cell is VGroup(box, num) where num is a Tex mobject.
+    Create NxN grid of cells. Each cell is VGroup(box, num) where num is a NumberLabel.
     Returns (cells, row_centers).
     """
     cells = []
@@ -26,7 +54,7 @@ def create_matrix_cells(N, grid_anchor, step, cell_size, scale_factor):
                 fill_opacity=0,
             )
             box.move_to(grid_anchor + np.array([j * step, -i * step, 0]))
-            num = Tex("0", font_size=int(22 * scale_factor), color=WHITE)
+            num = NumberLabel(0, num_decimal_places=1, font_size=int(22 * scale_factor), color=WHITE)
             num.move_to(box.get_center())
             cells.append(VGroup(box, num))
     row_centers = [
@@ -45,7 +73,7 @@ def logit_color(is_diag, value):
 
 def populate_raw_logits(cells, logits_matrix, N, scale_factor):
     """
-    Set each cell's number to the raw logit string and color the cell.
+    Set each cell's number to the raw logit and color the cell.
     logits_matrix[i][j] = logit for row i, col j.
     """
     for i in range(N):
@@ -56,20 +84,29 @@ def populate_raw_logits(cells, logits_matrix, N, scale_factor):
             c = logit_color(is_diag, val)
             cells[idx][0].set_fill(c, opacity=0.5 if is_diag else 0.3)
             cells[idx][0].set_stroke(c, width=1.2 * scale_factor)
-            s = f"{val:.1f}" if isinstance(val, (int, float)) else str(val)
-            cells[idx][1].become(Tex(s, font_size=int(22 * scale_factor), color=WHITE))
+            cells[idx][1].set_value(val)
             cells[idx][1].move_to(cells[idx][0].get_center())
     return cells
 
 
-class CLIPSimilarityMatrix(Scene):
+class CLIPSimilarityMatrix(PlayProfilerMixin, PlayCacheMixin, Scene):
     """
     Stage 1: Raw similarity logits (image vs text); diagonal = matched, off-diagonal = mismatched.
     Stage 2: Row-wise softmax → probabilities; then L_image, L_text, L_CLIP.
+
+    With ``batch_size`` (or ``$CLIP_BATCH_SIZE``) above 3, the matrix is a
+    synthetic batch of that size drawn as one HeatmapMatrix instead.
     """
+    batch_size: int | None = None
+
     def construct(self):
         self.camera.background_color = BLACK
 
+        batch_size = self.batch_size or clip_batch_size()
+        if batch_size > 3:
+            self.construct_heatmap(batch_size)
+            return
+
         N = 3
         scale_factor = 1.35
         cell_size = 0.65 * scale_factor
@@ -121,7 +158,7 @@ class CLIPSimilarityMatrix(Scene):
 
         prompts = VGroup()
         for i, t in enumerate(text_prompts):
-            p = Tex(t, font_size=int(28 * scale_factor), color=GREY_A)
+            p = CachedTex(t, font_size=int(28 * scale_factor), color=GREY_A)
             p.move_to(grid_anchor + np.array([-step * 0.9, -i * step, 0]))
             prompts.add(p)
 
@@ -148,10 +185,9 @@ class CLIPSimilarityMatrix(Scene):
             (-0.35, 0.1, 0.85),
         ]
 
-        def dot(u, v):
-            return sum(a * b for a, b in zip(u, v))
-
-        logits_matrix = [[dot(img_vecs[i], txt_vecs[j]) * 4.5 for j in range(N)] for i in range(N)]
+        scores = contrastive_scores(img_vecs, txt_vecs, temperature=1 / LOGIT_SCALE)
+        logits_matrix = scores.logits
+        probs = np.exp(scores.image_log_probs)
 
         cells, row_centers = create_matrix_cells(N, grid_anchor, step, cell_size, scale_factor)
         populate_raw_logits(cells, logits_matrix, N, scale_factor)
@@ -168,19 +204,19 @@ class CLIPSimilarityMatrix(Scene):
 
         for i in range(N):
             thumb_center = grid_anchor + np.array([i * step, step * 0.8, 0])
-            dummy = Tex(vec_str(*img_vecs[i]), font_size=fs_final, color=YELLOW_C)
+            dummy = CachedTex(vec_str(*img_vecs[i]), font_size=fs_final, color=YELLOW_C)
             dummy.next_to(thumb_center, UP, buff=vec_buff_above_thumb)
             img_targets.append(dummy.get_center())
 
         for j in range(N):
             prompt_center = grid_anchor + np.array([-step * 0.9, -j * step, 0])
-            dummy = Tex(vec_str(*txt_vecs[j]), font_size=fs_final, color=TEAL_C)
+            dummy = CachedTex(vec_str(*txt_vecs[j]), font_size=fs_final, color=TEAL_C)
             dummy.next_to(prompt_center, LEFT, buff=vec_buff_left_prompt)
             txt_targets.append(dummy.get_center())
 
         # 1) img_vec 先在畫面中間垂直排列，以較大字體出現
         for i in range(N):
-            v = Tex(vec_str(*img_vecs[i]), font_size=fs_center, color=YELLOW_C)
+            v = CachedTex(vec_str(*img_vecs[i]), font_size=fs_center, color=YELLOW_C)
             v.move_to(np.array([
                 img_center_x,
                 img_center_y - i * img_center_gap,
@@ -209,7 +245,7 @@ class CLIPSimilarityMatrix(Scene):
 
         # 3) text_vec 再出現在畫面中間，以較大字體出現；y 直接對齊最終位置
         for j in range(N):
-            v = Tex(vec_str(*txt_vecs[j]), font_size=fs_center, color=TEAL_C)
+            v = CachedTex(vec_str(*txt_vecs[j]), font_size=fs_center, color=TEAL_C)
             v.move_to(np.array([
                 txt_start_x,
                 txt_targets[j][1],
@@ -237,44 +273,48 @@ class CLIPSimilarityMatrix(Scene):
         self.wait(0.2)
 
         # 每個格子：從「圖片上方／文字左方」把兩向量移到下方 → 內積 → 數字進格子
+        # All N^2 cells are one timeline (one play) rather than four plays per cell
         below_offset = cell_size * 0.5 + vec_below_cell_offset
+        fill_timeline = Timeline()
+        t = 0
         for i in range(N):
             for j in range(N):
                 idx = i * N + j
                 cell = cells[idx]
-                self.add(cell[0])
                 center = cell[0].get_center()
                 below_center = center + DOWN * below_offset
 
-                copy_img = Tex(vec_str(*img_vecs[i]), font_size=fs_final, color=YELLOW_C)
-                copy_txt = Tex(vec_str(*txt_vecs[j]), font_size=fs_final, color=TEAL_C)
+                copy_img = CachedTex(vec_str(*img_vecs[i]), font_size=fs_final, color=YELLOW_C)
+                copy_txt = CachedTex(vec_str(*txt_vecs[j]), font_size=fs_final, color=TEAL_C)
                 copy_img.move_to(img_vec_mobs[i].get_center())
                 copy_txt.move_to(txt_vec_mobs[j].get_center())
-                self.add(copy_img, copy_txt)
+                fill_timeline.show(cell[0], copy_img, copy_txt, at=t)
 
-                dot_sym = Tex(r"\cdot", font_size=int(22 * scale_factor), color=GREY_A)
+                dot_sym = CachedTex(r"\cdot", font_size=int(22 * scale_factor), color=GREY_A)
                 target_left = below_center + LEFT * vec_spread_at_bottom
                 target_right = below_center + RIGHT * vec_spread_at_bottom
-                self.play(
-                    copy_img.animate.move_to(target_left),
-                    copy_txt.animate.move_to(target_right),
-                    run_time=0.4
+                t = fill_timeline.add(
+                    fill_timeline.animate(copy_img).move_to(target_left),
+                    fill_timeline.animate(copy_txt).move_to(target_right),
+                    start=t, run_time=0.4
                 )
                 dot_sym.move_to(below_center)
-                self.play(FadeIn(dot_sym), run_time=0.12)
+                fill_timeline.show(dot_sym, at=t)
+                t = fill_timeline.add(FadeIn(dot_sym), start=t, run_time=0.12)
 
                 val = logits_matrix[i][j]
-                s = f"{val:.1f}" if isinstance(val, (int, float)) else str(val)
-                result_num = Tex(s, font_size=int(22 * scale_factor), color=WHITE)
+                result_num = NumberLabel(val, num_decimal_places=1, font_size=int(22 * scale_factor), color=WHITE)
                 result_num.move_to(below_center)
-                self.play(
+                fill_timeline.show(result_num, at=t)
+                t = fill_timeline.add(
                     FadeOut(copy_img), FadeOut(copy_txt), FadeOut(dot_sym),
                     FadeIn(result_num),
-                    run_time=0.2
+                    start=t, run_time=0.2
                 )
-                self.play(result_num.animate.move_to(center), run_time=0.35)
-                self.remove(result_num)
-                self.add(cell[1])
+                t = fill_timeline.add(fill_timeline.animate(result_num).move_to(center), start=t, run_time=0.35)
+                fill_timeline.hide(result_num, at=t)
+                fill_timeline.show(cell[1], at=t)
+        self.play(fill_timeline)
 
         self.play(
             FadeOut(img_vec_mobs[0]), FadeOut(img_vec_mobs[1]), FadeOut(img_vec_mobs[2]),
@@ -335,24 +375,109 @@ class CLIPSimilarityMatrix(Scene):
             ],
             run_time=0.4
         )
-        norm_lbl = Tex(r"\text{Normalization}", font_size=28, color=YELLOW_C)
+        norm_lbl = CachedTex(r"\text{Normalization}", font_size=28, color=YELLOW_C)
         norm_lbl.move_to(grid_anchor + np.array([(N - 1) * step / 2, bottom_row_y, 0]))
         self.play(FadeIn(norm_lbl), run_time=0.5)
         self.wait(0.2)
 
+        softmax_timeline = Timeline()
+        t = 0
         for row_idx in range(N):
-            logits_row = logits_matrix[row_idx]
-            probs_row = softmax_row(logits_row)
+            probs_row = probs[row_idx]
 
             for j in range(N):
                 idx = row_idx * N + j
                 p_val = probs_row[j]
-                s = f"{p_val:.2f}" if p_val >= 0.01 else "<0.01"
-                new_num = Tex(s, font_size=int(20 * scale_factor), color=WHITE)
+                new_num = NumberLabel(p_val, floor=0.01, font_size=int(20 * scale_factor), color=WHITE)
                 new_num.move_to(cells[idx][0].get_center())
-                self.play(FadeOut(cells[idx][1]), FadeIn(new_num), run_time=0.2)
-                self.remove(cells[idx][1])
-                self.add(new_num)
-            self.wait(0.1)
+                softmax_timeline.show(new_num, at=t)
+                t = softmax_timeline.add(FadeOut(cells[idx][1]), FadeIn(new_num), start=t, run_time=0.2)
+            # Pause between rows
+            t += 0.1
+        softmax_timeline.extend_to(t)
+        self.play(softmax_timeline)
+
+        grid = VGroup(*[cell[0] for cell in cells])
+        self.show_losses(scores, grid)
+        self.wait(0.8)
+
+    def show_losses(self, scores, matrix_mob):
+        """L_image (row softmax), L_text (column softmax) and their mean, beside the matrix."""
+        losses = VGroup(
+            CachedTex(rf"L_{{\text{{image}}}} = {scores.loss_image:.3f}", font_size=30, color=YELLOW_C),
+            CachedTex(rf"L_{{\text{{text}}}} = {scores.loss_text:.3f}", font_size=30, color=TEAL_C),
+            CachedTex(rf"L_{{\text{{CLIP}}}} = {scores.loss_clip:.3f}", font_size=34, color=WHITE),
+        )
+        losses.arrange(DOWN, aligned_edge=LEFT, buff=0.3)
+        losses.next_to(matrix_mob, RIGHT, buff=0.8)
+        self.play(LaggedStart(*[FadeIn(l, shift=LEFT * 0.1) for l in losses], lag_ratio=0.3), run_time=1.2)
+
+    def construct_heatmap(self, N):
+        """The logits and row-wise softmax for a batch of N pairs, one heatmap cell per pair."""
+        img_vecs, txt_vecs = synthetic_batch(N)
+        scores = contrastive_scores(img_vecs, txt_vecs, temperature=1 / LOGIT_SCALE)
+        # Past MAX_HEATMAP_CELLS pairs each cell averages a block of pairs,
+        # pooled a row block at a time, so no batch size needs the full matrix
+        shown = min(N, MAX_HEATMAP_CELLS)
+        logits = scores.pooled_logits(shown)
+
+        caption = rf"batch of {N}" if shown == N else rf"batch of {N} in {shown} x {shown} blocks"
+        title = CachedTex(
+            rf"\text{{Similarity logits, {caption}}}",
+            font_size=34, color=WHITE
+        )
+        title.to_edge(UP, buff=0.4)
+
+        heatmap = HeatmapMatrix(
+            logits,
+            width=min(5.6, 0.9 * N),
+            colors=[BLUE_E, YELLOW_C],
+            vmin=-LOGIT_SCALE,
+            vmax=LOGIT_SCALE,
+        )
+        heatmap.next_to(title, DOWN, buff=0.7)
+        img_lbl = CachedTex(r"\text{images}", font_size=28, color=YELLOW_C)
+        img_lbl.rotate(PI / 2).next_to(heatmap, LEFT, buff=0.25)
+        txt_lbl = CachedTex(r"\text{texts}", font_size=28, color=TEAL_C)
+        txt_lbl.next_to(heatmap, UP, buff=0.2)
+
+        # Empty unless the cells are large enough to read
+        value_labels = heatmap.get_value_labels(num_decimal_places=1)
+
+        self.play(FadeIn(title), FadeIn(img_lbl), FadeIn(txt_lbl), run_time=0.8)
+        heatmap.set_cell_opacity(0)
+        self.add(heatmap)
+        self.play(heatmap.animate.set_cell_opacity(1), run_time=1.2)
+        if len(value_labels) > 0:
+            self.play(FadeIn(value_labels), run_time=0.6)
+        self.wait(0.3)
+
+        # Diagonal = matched pairs, everything else = mismatched
+        off_diag = ~heatmap.get_diagonal_mask()
+        self.play(heatmap.animate.set_cell_opacity(0.12, where=off_diag), run_time=0.5)
+        self.wait(0.4)
+        self.play(heatmap.animate.set_cell_opacity(1, where=off_diag), run_time=0.5)
+        self.wait(0.3)
+
+        # Row-wise softmax: the first row on its own, then every other row at once
+        probs = scores.pooled_image_probs(shown)
+        # Each pooled row spreads its mass over `shown` blocks, so scale to the largest one
+        prob_max = 1 if shown == N else probs.max()
+
+        norm_lbl = CachedTex(r"\text{Normalization}", font_size=28, color=YELLOW_C)
+        norm_lbl.next_to(heatmap, DOWN, buff=0.3)
+        row_frame = heatmap.get_cell_rectangle(rows=0, stroke_color=YELLOW_C)
+        self.play(FadeIn(norm_lbl), ShowCreation(row_frame), run_time=0.5)
+        self.play(heatmap.animate.set_values(probs[0], vmin=0, vmax=prob_max, rows=0), run_time=0.8)
+        self.wait(0.3)
+        self.play(
+            heatmap.animate.set_values(probs, rows=range(1, shown)),
+            FadeOut(row_frame),
+            run_time=1.2
+        )
+        prob_labels = heatmap.get_value_labels(num_decimal_places=2)
+        if len(prob_labels) > 0:
+            self.play(FadeOut(value_labels), FadeIn(prob_labels), run_time=0.4)
 
-        self.wait(0.8)
\ No newline at end of file
+        self.show_losses(scores, heatmap)
+        self.wait(0.8)
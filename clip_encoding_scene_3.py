@@ -1,8 +1,50 @@
 from manimlib import *
 import numpy as np
+import os
+import sys
+
+# manimgl loads scene files by path, so make the sibling helper modules importable
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from clip_loss import l2_normalize
+from embedding_dataset import EmbeddingDataset
+from embedding_dataset import load_scene_embeddings
+from inplace_updaters import always_set_points
+from inplace_updaters import segment_points
+from number_label import NumberLabel
+from play_cache import PlayCacheMixin
+from play_profiler import PlayProfilerMixin
+from point_cloud import FadeInPoints
+from slerp import TrackerCache
+from slerp import great_circle_points
+from slerp import slerp
+from sphere_markers import SphereMarkers
+from tex_cache import CachedTex
+
+
+def synthetic_sphere_embeddings(n, dim=64, seed=3):
+    """Stand-in for real CLIP embeddings: three Gaussian clusters in `dim` dimensions."""
+    rng = np.random.default_rng(seed)
+    labels = rng.choice(3, size=n)
+    means = 0.6 * rng.normal(size=(3, dim))
+    return EmbeddingDataset.from_arrays(means[labels] + rng.normal(size=(n, dim)), labels=labels)
+
+
+class L2NormalizationCosineSimilarity(PlayProfilerMixin, PlayCacheMixin, ThreeDScene):
+    """
+    With ``sphere_cloud_size`` set, that many embeddings (``$CLIP_EMBEDDINGS``
+    or synthetic) are also plotted on the unit sphere as faint markers.
+    """
+    sphere_cloud_size: int = 0
+
+    def show_embedding_cloud(self, n):
+        data = load_scene_embeddings(lambda: synthetic_sphere_embeddings(n)).sample(n, seed=0)
+        directions = l2_normalize(data.project(3))
+        cloud = SphereMarkers(1.012 * directions, colors=GREY_B, radius=0.012, opacity=0.6)
+        cloud.track_camera(self.camera)
+        self.play(FadeInPoints(cloud, scale=0.3, lag_ratio=2.0 / n), run_time=1.5)
+        return cloud
 
-
-class L2NormalizationCosineSimilarity(ThreeDScene):
     def construct(self):
         self.camera.background_color = "#0f1117"
 
@@ -54,7 +96,7 @@ class L2NormalizationCosineSimilarity(ThreeDScene):
             color=BLUE
         )
 
-        raw_label = Tex(r"\mathbf{v}", color=YELLOW)
+        raw_label = CachedTex(r"\mathbf{v}", color=YELLOW)
         raw_label.scale(0.9)
         raw_label.next_to(raw_arrow.get_end(), UR, buff=0.12)
 
@@ -65,7 +107,7 @@ class L2NormalizationCosineSimilarity(ThreeDScene):
             color=GREEN_B
         )
 
-        norm_label_target = Tex(
+        norm_label_target = CachedTex(
             r"\hat{\mathbf{v}} = \frac{\mathbf{v}}{\left\lVert \mathbf{v} \right\rVert}",
             color=GREEN_B
         )
@@ -115,7 +157,7 @@ class L2NormalizationCosineSimilarity(ThreeDScene):
         sphere.set_color(BLUE_D)
         sphere.set_opacity(0.1)
 
-        formula = Tex(
+        formula = CachedTex(
             r"\text{cosine similarity}=\cos(\theta)=\hat{\mathbf{u}}\cdot\hat{\mathbf{v}}",
             color=WHITE
         )
@@ -125,6 +167,8 @@ class L2NormalizationCosineSimilarity(ThreeDScene):
 
         self.play(ShowCreation(axes), run_time=1.0)
         self.play(FadeIn(sphere), run_time=1.2)
+        if self.sphere_cloud_size > 0:
+            self.show_embedding_cloud(self.sphere_cloud_size)
 
         # ============================================================
         # 左側：三張圖片 + 對應文字 (car, cat, dog) → embedding
@@ -183,18 +227,15 @@ class L2NormalizationCosineSimilarity(ThreeDScene):
         for i, (th, ph) in enumerate(image_params):
             p = spherical_to_cartesian(th, ph)
             p_surface = surface_radius * p
-            sphere = Sphere(radius=dot_radius)
-            sphere.set_color(image_colors[i])
-            sphere.move_to(p_surface)
-            image_dots.add(sphere)
+            image_dots.add(SphereMarkers([p_surface], colors=image_colors[i], radius=dot_radius))
 
         for i, (th, ph) in enumerate(text_params):
             p = spherical_to_cartesian(th, ph)
             p_surface = surface_radius * p
-            sphere = Sphere(radius=dot_radius)
-            sphere.set_color(text_colors[i])
-            sphere.move_to(p_surface)
-            text_dots.add(sphere)
+            text_dots.add(SphereMarkers([p_surface], colors=text_colors[i], radius=dot_radius))
+
+        for markers in (*image_dots, *text_dots):
+            markers.track_camera(self.camera)
 
         # 每張圖片縮小淡出，同時對應的藍點在球面上淡入（圖片 → 球面點）
         for i in range(3):
@@ -225,19 +266,19 @@ class L2NormalizationCosineSimilarity(ThreeDScene):
 
         t_tracker = ValueTracker(0.0)
 
+        def get_tip_and_arc(t):
+            # 箭頭方向：car_text → cat_text 的球面插值；弧：car_image → 箭頭
+            tip = slerp(car_text_vec, cat_text_vec, t)
+            return tip, great_circle_points(car_image_vec, tip, 60)
+
+        # 箭頭、弧、θ 標籤與 cosine 每幀共用同一次計算
+        tip_and_arc = TrackerCache(t_tracker, get_tip_and_arc)
+
         def get_tip():
-            t = t_tracker.get_value()
-            a = car_text_vec / np.linalg.norm(car_text_vec)
-            b = cat_text_vec / np.linalg.norm(cat_text_vec)
-            dot_ab = np.clip(np.dot(a, b), -1, 1)
-            omega = np.arccos(dot_ab)
-            if omega < 1e-5:
-                return a.copy()
-            p = (
-                np.sin((1 - t) * omega) / np.sin(omega) * a
-                + np.sin(t * omega) / np.sin(omega) * b
-            )
-            return p / np.linalg.norm(p)
+            return tip_and_arc()[0]
+
+        def get_arc_points():
+            return tip_and_arc()[1]
 
         highlight_radius = 0.038
         highlight_surface = 1.0 + highlight_radius
@@ -246,10 +287,14 @@ class L2NormalizationCosineSimilarity(ThreeDScene):
         def get_tip_surface():
             return highlight_surface * get_tip()
 
-        car_image_dot = Sphere(radius=highlight_radius).set_color(GOLD_A).move_to(car_image_surface)
+        car_image_dot = SphereMarkers([car_image_surface], colors=GOLD_A, radius=highlight_radius)
+        car_image_dot.track_camera(self.camera)
 
-        # ========== 箭頭部件可調參數（約 259～287 行）==========
-        def make_solid_arrow(start, end, color=GOLD_A, line_width=1, tip_size=0.01):
+        # ========== 箭頭部件可調參數（約 293～340 行）==========
+        # 箭頭三角形範本：中心在原點、尖端朝右
+        tip_template = Triangle().rotate(-PI / 2).move_to(ORIGIN).get_points().copy()
+
+        def solid_arrow_points(start, end, tip_size):
             direction = end - start
             length = np.linalg.norm(direction)
             if length < 1e-6:
@@ -258,58 +303,52 @@ class L2NormalizationCosineSimilarity(ThreeDScene):
             unit = direction / length
             line_end = end - unit * tip_size * 0.1  # 0.9 = 箭桿與箭頭銜接比例，可調
 
-            line = Line(start, line_end)
+            angle = angle_of_vector(unit[:2])
+            rotation = np.array(rotation_about_z(angle - PI / 2))
+            tip_points = tip_size * tip_template @ rotation.T + end  # tip_size = 三角形箭頭大小
+            return segment_points(start, line_end), tip_points
+
+        def make_solid_arrow(start, end, color=GOLD_A, line_width=1, tip_size=0.01):
+            line_points, tip_points = solid_arrow_points(start, end, tip_size)
+
+            line = Line(start, end).set_points(line_points)
             line.set_stroke(color=color, width=line_width)  # line_width = 箭桿粗細
 
-            tip = Triangle()
+            tip = Triangle().set_points(tip_points)
             tip.set_fill(color, opacity=1)
             tip.set_stroke(color, width=0)  # width=0 無邊線；改 >0 可加邊框
-            tip.scale(tip_size)  # tip_size = 三角形箭頭大小
-            tip.rotate(-PI / 2)
-            tip.move_to(end)
-            angle = angle_of_vector(unit[:2])
-            tip.rotate(angle - PI / 2)
 
             return VGroup(line, tip)
 
-        arrow_from_center = always_redraw(lambda: make_solid_arrow(
+        def put_solid_arrow_on(arrow, start, end, tip_size=0.01):
+            # 只改寫既有箭桿／箭頭的點，不重建 mobject
+            line_points, tip_points = solid_arrow_points(start, end, tip_size)
+            arrow[0].set_points(line_points)
+            arrow[1].set_points(tip_points)
+            return arrow
+
+        arrow_tip_size = 0.16  # 箭頭三角形大小
+        arrow_from_center = make_solid_arrow(
             ORIGIN,
             get_tip_surface(),
             color=GOLD_A,       # 箭頭顏色
             line_width=6,       # 箭桿粗細
-            tip_size=0.16       # 箭頭三角形大小
-        ))
-
-        def great_circle_arc_points(a, b, n=40):
-            a = a / np.linalg.norm(a)
-            b = b / np.linalg.norm(b)
-            dot_ab = np.clip(np.dot(a, b), -1, 1)
-            omega = np.arccos(dot_ab)
-            if omega < 1e-5:
-                return [a.copy() for _ in range(n)]
-            pts = []
-            for s in np.linspace(0, 1, n):
-                p = (
-                    np.sin((1 - s) * omega) / np.sin(omega) * a
-                    + np.sin(s * omega) / np.sin(omega) * b
-                )
-                pts.append(p / np.linalg.norm(p))
-            return pts
-
-        arc = always_redraw(lambda: VMobject(
-            stroke_color=WHITE,
-            stroke_width=4
-        ).set_points_smoothly(
-            great_circle_arc_points(car_image_vec, get_tip(), n=60)
-        ))
-
-        theta_label = Tex(r"\theta", color=WHITE)
+            tip_size=arrow_tip_size
+        )
+        arrow_from_center.add_updater(
+            lambda m: put_solid_arrow_on(m, ORIGIN, get_tip_surface(), arrow_tip_size)
+        )
+
+        arc = VMobject(stroke_color=WHITE, stroke_width=4)
+        always_set_points(arc, get_arc_points, smooth=True)
+
+        theta_label = CachedTex(r"\theta", color=WHITE)
         theta_label.scale(0.9)
         theta_label.set_fill(WHITE, opacity=1)
         theta_label.set_stroke(WHITE, width=2)
 
         def update_theta_label(m):
-            pts = great_circle_arc_points(car_image_vec, get_tip(), n=60)
+            pts = get_arc_points()
             mid = pts[len(pts) // 2]
             m.move_to(mid * 1.12)
             return m
@@ -329,7 +368,7 @@ class L2NormalizationCosineSimilarity(ThreeDScene):
         # ============================================================
         cosine_text = Text("cosine =", font_size=24, color=WHITE)
         u_n = car_image_vec / np.linalg.norm(car_image_vec)
-        cosine_value = DecimalNumber(
+        cosine_value = NumberLabel(
             np.dot(u_n, car_text_vec / np.linalg.norm(car_text_vec)),
             num_decimal_places=2
         )
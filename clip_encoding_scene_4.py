@@ -1,5 +1,23 @@
 from manimlib import *
 import numpy as np
+import os
+import sys
+
+# manimgl loads scene files by path, so make the sibling helper modules importable
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from embedding_dataset import EmbeddingDataset
+from embedding_dataset import load_scene_embeddings
+from play_cache import PlayCacheMixin
+from play_profiler import PlayProfilerMixin
+from point_cloud import FadeInPoints
+from point_cloud import GrowSegments
+from point_cloud import PointCloud
+from point_cloud import Segments
+from point_cloud import TransitionPoints
+from point_cloud import points_3d
+from spatial_index import SpatialIndex
+from umap_projection import umap_project
 
 
 # ============================================================
@@ -12,19 +30,104 @@ CAR_COLOR = ORANGE
 EDGE_COLOR = "#aaaaff"
 LABEL_COLOR = WHITE
 DIM_COLOR = "#555577"
+CLASS_COLORS = [DOG_COLOR, CAT_COLOR, CAR_COLOR]
+# How far above its cluster center each of the three classes' captions sits
+CLASS_LABEL_RISE = [0.85, 0.85, 0.9]
+# Datasets with more classes only caption (and land) their largest few
+MAX_CLASS_CAPTIONS = 6
 
 
 # ============================================================
 # Helpers
 # ============================================================
-def random_sphere_points(n, radius=2.8, seed=42):
+def synthetic_embeddings(n=250, dim=64, seed=42):
+    """
+    Stand-in for real CLIP embeddings: labelled Gaussian clusters in `dim`
+    dimensions, dogs and cats close together and cars further away.
+    """
+    labels = np.random.default_rng(7).choice(len(CLASS_COLORS), size=n)
     rng = np.random.default_rng(seed)
-    pts = rng.standard_normal((n, 3))
-    norms = np.linalg.norm(pts, axis=1, keepdims=True)
-    pts = pts / norms
-    r = radius * rng.random(n) ** (1 / 3)
-    pts = pts * r[:, None]
-    return pts
+    axes = np.linalg.qr(rng.normal(size=(dim, 2)))[0].T
+    means = np.array([-2 * axes[0], 2 * axes[0], 8 * axes[1]])
+    pts = means[labels] + rng.normal(size=(n, dim))
+    return EmbeddingDataset.from_arrays(pts, labels=labels, label_names=["Dogs", "Cats", "Cars"])
+
+
+def label_classes(labels) -> list[int]:
+    """The class ids present in ``labels``, ascending; none for unlabelled data."""
+    return [] if labels is None else np.unique(labels).tolist()
+
+
+def is_three_class(classes) -> bool:
+    """Whether ``classes`` fit the scene's hand-placed dog / cat / car layout."""
+    return all(0 <= c < len(CLASS_COLORS) for c in classes)
+
+
+def class_palette(classes) -> dict:
+    """
+    Color of each class: the dog / cat / car colors for the three-class
+    layout, otherwise a gradient through them in class order.
+    """
+    if is_three_class(classes):
+        return {c: CLASS_COLORS[c] for c in classes}
+    gradient = color_gradient(CLASS_COLORS, len(classes))
+    return {c: rgb_to_hex(color_to_rgb(color)) for c, color in zip(classes, gradient)}
+
+
+def label_colors(labels):
+    if labels is None:
+        return DIM_COLOR
+    classes, index = np.unique(labels, return_inverse=True)
+    palette = class_palette(classes.tolist())
+    return np.array([palette[c] for c in classes.tolist()])[index]
+
+
+def class_centers(points, labels) -> dict:
+    """Mean position of each class in ``labels``; empty for unlabelled data."""
+    labels = None if labels is None else np.asarray(labels)
+    return {c: points[labels == c].mean(axis=0) for c in label_classes(labels)}
+
+
+def largest_classes(labels, n=MAX_CLASS_CAPTIONS) -> list[int]:
+    """The ``n`` most frequent classes in ``labels``, in class order."""
+    classes, counts = np.unique(labels, return_counts=True)
+    return sorted(classes[np.argsort(-counts, kind="stable")[:n]].tolist())
+
+
+def tsne_stand_in_specs(classes, origin) -> dict:
+    """
+    (center, spread, seed) of each class's cluster in the t-SNE stand-in:
+    the hand-placed dog / cat / car clusters, or evenly spaced on a ring
+    around ``origin`` when there are other classes.
+    """
+    origin = np.asarray(origin, dtype=float)
+    if is_three_class(classes):
+        placed = [
+            (np.array([-1.2, 0.5]), 0.48, 10),
+            (np.array([-1.2, -1.5]), 0.48, 20),
+            (np.array([0.2, 0.5]), 0.5, 30),
+        ]
+        return {c: (origin + placed[c][0], *placed[c][1:]) for c in classes}
+    angles = np.linspace(0, TAU, len(classes), endpoint=False)
+    spread = min(0.48, 2.4 / len(classes))
+    return {
+        c: (origin + 1.5 * np.array([np.cos(a), np.sin(a)]), spread, 10 * (k + 1))
+        for k, (c, a) in enumerate(zip(classes, angles))
+    }
+
+
+def class_captions(centers, palette, names, scale, rise=None):
+    """One caption per class in ``centers``, named by ``names(c)`` and placed above its center."""
+    captions = VGroup()
+    three_class = is_three_class(centers)
+    for c, center in centers.items():
+        lbl = caption_text(names(c), scale=scale, color=palette[c])
+        if rise is not None:
+            lift = rise
+        else:
+            lift = CLASS_LABEL_RISE[c] if three_class else CLASS_LABEL_RISE[0]
+        captions.add(lbl.move_to(np.array([center[0], center[1] + lift, 0])))
+    return captions
 
 
 def cluster_2d_points(n, center, spread, seed):
@@ -65,7 +168,7 @@ def caption_text(s, scale=0.42, color="#ccccdd"):
 # ============================================================
 # Main Scene
 # ============================================================
-class UMAPVisualizationScene(Scene):
+class UMAPVisualizationScene(PlayProfilerMixin, PlayCacheMixin, Scene):
     def construct(self):
         self.camera.background_color = BG_COLOR
 
@@ -86,22 +189,17 @@ class UMAPVisualizationScene(Scene):
     def scene1_highdim_cloud(self):
         frame = self.camera.frame
 
-        title = title_text("768-Dimensional CLIP Embedding Space", scale=0.62)
-        title.to_edge(UP, buff=0.35)
+        # Real embeddings (CLIP_EMBEDDINGS=...) are shown by their top 3
+        # principal components, scaled into the same ball
+        data = load_scene_embeddings(synthetic_embeddings).sample(250, seed=42)
 
-        pts = random_sphere_points(250, radius=2.8, seed=42)
-        rng = np.random.default_rng(7)
-        colors = rng.choice([DOG_COLOR, CAT_COLOR, CAR_COLOR], size=250)
+        title = title_text(f"{data.dim}-Dimensional CLIP Embedding Space", scale=0.62)
+        title.to_edge(UP, buff=0.35)
+        pts = data.project(3)
+        pts *= 2.8 / np.linalg.norm(pts, axis=1).max()
+        colors = label_colors(data.labels)
 
-        cloud = VGroup()
-        for p, c in zip(pts, colors):
-            d = Dot(
-                point=np.array([p[0], p[1], p[2]]),
-                radius=0.055,
-                color=c
-            )
-            d.set_opacity(0.75)
-            cloud.add(d)
+        cloud = PointCloud(pts, colors=colors, radius=0.055, opacity=0.75)
 
         self.play(
             FadeIn(title, shift=UP * 0.2),
@@ -109,10 +207,7 @@ class UMAPVisualizationScene(Scene):
         )
 
         self.play(
-            LaggedStart(
-                *[FadeIn(d, scale=0.4) for d in cloud],
-                lag_ratio=0.008
-            ),
+            FadeInPoints(cloud, scale=0.4, lag_ratio=0.008),
             run_time=2.8,
         )
 
@@ -131,6 +226,7 @@ class UMAPVisualizationScene(Scene):
         self.wait(0.5)
 
         self._cloud_3d = cloud
+        self._data = data
         self._title1 = VGroup(title)
 
     # --------------------------------------------------------
@@ -153,8 +249,10 @@ class UMAPVisualizationScene(Scene):
         )
         self.play(FadeIn(arrow_label), run_time=0.5)
 
-        rng = np.random.default_rng(3)
-        targets_2d = rng.uniform(-2.5, 2.5, (len(cloud), 2))
+        # Real UMAP layout, every epoch framed into the same region; the cloud
+        # first lands on the optimizer's starting layout
+        umap = umap_project(self._data, n_epochs=200).fitted(6.2, 4.0, center=(0.6, -0.2))
+        targets_2d = umap.snapshots[0]
 
         start_theta = -20 + 28
         start_phi = 68 - 12
@@ -166,16 +264,17 @@ class UMAPVisualizationScene(Scene):
                 interpolate(start_phi, 0, a),
             )
 
-        anims = [UpdateFromAlphaFunc(frame, flatten_camera)]
-        for i, dot in enumerate(cloud):
-            tx, ty = targets_2d[i]
-            anims.append(dot.animate.move_to(np.array([tx, ty, 0])))
-
-        self.play(*anims, run_time=3.0, rate_func=smooth)
+        self.play(
+            UpdateFromAlphaFunc(frame, flatten_camera),
+            TransitionPoints(cloud, points=targets_2d),
+            run_time=3.0,
+            rate_func=smooth,
+        )
         self.wait(0.6)
 
         self._cloud_2d = cloud
         self._targets_2d = targets_2d
+        self._umap = umap
         self._funnel_labels = VGroup(funnel_title, arrow_label)
 
     # --------------------------------------------------------
@@ -194,8 +293,8 @@ class UMAPVisualizationScene(Scene):
             0
         ])
 
-        dists = np.linalg.norm(targets_2d - targets_2d[focal_idx], axis=1)
-        neighbor_indices = np.argsort(dists)[1:7]
+        index = SpatialIndex(targets_2d)
+        neighbor_indices = index.neighbors_of(focal_idx, k=6)[0]
 
         focal_dot = glowing_dot(focal_pos, YELLOW, radius=0.1)
 
@@ -216,37 +315,43 @@ class UMAPVisualizationScene(Scene):
             run_time=0.8,
         )
 
-        edges = VGroup()
-        for ni in neighbor_indices:
-            np2 = np.array([targets_2d[ni, 0], targets_2d[ni, 1], 0])
-            line = Line(
-                focal_pos,
-                np2,
-                stroke_width=1.8,
-                stroke_color=EDGE_COLOR,
-                stroke_opacity=0.65
-            )
-            edges.add(line)
-
-        self.play(
-            LaggedStart(*[ShowCreation(e) for e in edges], lag_ratio=0.18),
-            run_time=2.0,
+        edges = Segments(
+            np.repeat([focal_pos], len(neighbor_indices), axis=0),
+            targets_2d[neighbor_indices],
+            stroke_width=1.8,
+            stroke_color=EDGE_COLOR,
+            stroke_opacity=0.65
         )
 
-        neighbor_halos = VGroup()
-        for ni in neighbor_indices:
-            np2 = np.array([targets_2d[ni, 0], targets_2d[ni, 1], 0])
-            h = Dot(point=np2, radius=0.13, color=YELLOW)
-            h.set_opacity(0.22)
-            neighbor_halos.add(h)
+        self.play(GrowSegments(edges, lag_ratio=0.18), run_time=2.0)
+
+        neighbor_halos = cloud.subset(neighbor_indices)
+        neighbor_halos.set_point_colors(YELLOW, 0.22).set_point_radii(0.13)
 
         self.play(FadeIn(neighbor_halos, scale=1.4), run_time=0.7)
         self.wait(1.2)
 
+        # Every point's neighborhood at once, spreading out from the focal point
+        pairs = index.knn_edges(k=6)
+        start_dists = np.linalg.norm(targets_2d[pairs[:, 0]] - targets_2d[focal_idx], axis=1)
+        pairs = pairs[np.argsort(start_dists, kind="stable")]
+        knn_graph = Segments(
+            targets_2d[pairs[:, 0]],
+            targets_2d[pairs[:, 1]],
+            stroke_width=0.8,
+            stroke_color=EDGE_COLOR,
+            stroke_opacity=0.3
+        )
+        knn_graph.set_z_index(-1)
+
+        self.play(GrowSegments(knn_graph, lag_ratio=4.0 / len(pairs)), run_time=2.0)
+        self.wait(0.8)
+
         self.play(
             FadeOut(focal_dot),
             FadeOut(neighbor_halos),
             FadeOut(edges),
+            FadeOut(knn_graph),
             FadeOut(label_struct),
             FadeOut(label_knn),
             run_time=0.8,
@@ -260,96 +365,75 @@ class UMAPVisualizationScene(Scene):
     # --------------------------------------------------------
     def scene4_global_clusters(self):
         cloud = self._cloud_2d
+        umap = self._umap
+        labels = self._data.labels
 
-        dog_center = np.array([-1.2, 0.6])
-        cat_center = np.array([0.0, 0.6])
-        car_center = np.array([2.8, -1.0])
-
-        n_per = len(cloud) // 3
-
-        dog_pts = cluster_2d_points(n_per, dog_center, 0.55, seed=10)
-        cat_pts = cluster_2d_points(n_per, cat_center, 0.55, seed=20)
-        car_pts = cluster_2d_points(
-            len(cloud) - 2 * n_per,
-            car_center,
-            0.6,
-            seed=30
-        )
+        all_pts = umap.embedding
+        all_colors = label_colors(labels)
+        # Every class present gets a center; only the largest few get captions
+        centers = class_centers(all_pts, labels)
+        palette = class_palette(list(centers))
+        captioned = [] if labels is None else largest_classes(labels)
+        names = self._data.get_label_name
 
-        all_pts = np.vstack([dog_pts, cat_pts, car_pts])
-        all_colors = (
-            [DOG_COLOR] * n_per +
-            [CAT_COLOR] * n_per +
-            [CAR_COLOR] * (len(cloud) - 2 * n_per)
-        )
-
-        anims = []
-        for dot, (px, py), col in zip(cloud, all_pts, all_colors):
-            anims.append(
-                dot.animate
-                .move_to(np.array([px, py, 0]))
-                .set_color(col)
-                .set_opacity(0.85)
-            )
+        def replay_optimization(mob, alpha):
+            mob.set_points(points_3d(umap.layout_at(alpha)))
+            mob.set_point_opacities(interpolate(0.75, 0.85, alpha))
 
         cluster_title = title_text("UMAP: Semantic Clusters", scale=0.62)
         cluster_title.to_edge(UP, buff=0.35)
 
         self.play(FadeIn(cluster_title), run_time=0.5)
         self.play(
-            LaggedStart(*anims, lag_ratio=0.004),
+            UpdateFromAlphaFunc(cloud, replay_optimization),
             run_time=3.2,
             rate_func=smooth,
         )
 
-        lbl_dogs = caption_text("Dogs", scale=0.5, color=DOG_COLOR)
-        lbl_cats = caption_text("Cats", scale=0.5, color=CAT_COLOR)
-        lbl_cars = caption_text("Cars", scale=0.5, color=CAR_COLOR)
-
-        lbl_dogs.move_to(np.array([dog_center[0], dog_center[1] + 0.85, 0]))
-        lbl_cats.move_to(np.array([cat_center[0], cat_center[1] + 0.85, 0]))
-        lbl_cars.move_to(np.array([car_center[0], car_center[1] + 0.9, 0]))
-
-        caption = caption_text(
-            "Semantically related clusters remain close",
-            scale=0.40
-        )
-        caption.to_edge(DOWN, buff=0.38)
+        class_lbls = class_captions({c: centers[c] for c in captioned}, palette, names, scale=0.5)
+        annotation = VGroup()
+        # The "similar" brace is about dogs and cats, so only the three-class layout gets it
+        if is_three_class(centers) and 0 in centers and 1 in centers:
+            dog_center, cat_center = centers[0], centers[1]
+            caption = caption_text(
+                "Semantically related clusters remain close",
+                scale=0.40
+            )
+            caption.to_edge(DOWN, buff=0.38)
 
-        ref_line = Line(
-            np.array([dog_center[0], dog_center[1] + 0.55, 0]),
-            np.array([cat_center[0], cat_center[1] + 0.55, 0]),
-        )
-        brace = Brace(ref_line, direction=UP, color="#aaaaee", buff = 0.5)
-        brace.scale(0.8)
+            ref_line = Line(
+                np.array([dog_center[0], dog_center[1] + 0.55, 0]),
+                np.array([cat_center[0], cat_center[1] + 0.55, 0]),
+            )
+            brace = Brace(ref_line, direction=UP, color="#aaaaee", buff = 0.5)
+            brace.scale(0.8)
 
-        brace_txt = caption_text("similar", scale=0.35, color="#aaaaee")
-        brace_txt.next_to(brace, UP, buff=0.1)
+            brace_txt = caption_text("similar", scale=0.35, color="#aaaaee")
+            brace_txt.next_to(brace, UP, buff=0.1)
+            annotation.add(brace, brace_txt, caption)
 
-        self.play(
-            FadeIn(lbl_dogs),
-            FadeIn(lbl_cats),
-            FadeIn(lbl_cars),
-            run_time=0.7,
-        )
-        self.play(
-            FadeIn(brace),
-            FadeIn(brace_txt),
-            FadeIn(caption, shift=UP * 0.1),
-            run_time=0.8,
-        )
+        if len(class_lbls) > 0:
+            self.play(
+                *[FadeIn(lbl) for lbl in class_lbls],
+                run_time=0.7,
+            )
+        if len(annotation) > 0:
+            brace, brace_txt, caption = annotation
+            self.play(
+                FadeIn(brace),
+                FadeIn(brace_txt),
+                FadeIn(caption, shift=UP * 0.1),
+                run_time=0.8,
+            )
         self.wait(1.8)
 
         self._cluster_cloud = cloud
         self._cluster_pts = all_pts
         self._cluster_colors = all_colors
-        self._dog_center = dog_center
-        self._cat_center = cat_center
-        self._car_center = car_center
-        self._scene4_labels = VGroup(
-            cluster_title, lbl_dogs, lbl_cats, lbl_cars,
-            brace, brace_txt, caption
-        )
+        self._class_centers = centers
+        self._class_palette = palette
+        self._captioned_classes = captioned
+        self._scene4_labels = VGroup(cluster_title, class_lbls, annotation)
 
     # --------------------------------------------------------
     # Scene 5 — t-SNE vs UMAP
@@ -362,35 +446,22 @@ class UMAPVisualizationScene(Scene):
 
         offset = 2.6
 
-        tsne_dog_center = np.array([-offset - 1.2, 0.5])
-        tsne_cat_center = np.array([-offset - 1.2, -1.5])
-        tsne_car_center = np.array([-offset + 0.2, 0.5])
-
-        n_per = len(cloud) // 3
-
-        tsne_dog_pts = cluster_2d_points(n_per, tsne_dog_center, 0.48, seed=10)
-        tsne_cat_pts = cluster_2d_points(n_per, tsne_cat_center, 0.48, seed=20)
-        tsne_car_pts = cluster_2d_points(
-            len(cloud) - 2 * n_per,
-            tsne_car_center,
-            0.5,
-            seed=30
-        )
-        tsne_pts = np.vstack([tsne_dog_pts, tsne_cat_pts, tsne_car_pts])
-
-        umap_dog_center = self._dog_center + np.array([offset, 0])
-        umap_cat_center = self._cat_center + np.array([offset, 0])
-        umap_car_center = self._car_center + np.array([offset, 0])
-
-        umap_dog_pts = cluster_2d_points(n_per, umap_dog_center, 0.5, seed=10)
-        umap_cat_pts = cluster_2d_points(n_per, umap_cat_center, 0.5, seed=20)
-        umap_car_pts = cluster_2d_points(
-            len(cloud) - 2 * n_per,
-            umap_car_center,
-            0.55,
-            seed=30
-        )
-        umap_pts = np.vstack([umap_dog_pts, umap_cat_pts, umap_car_pts])
+        labels = self._data.labels
+        tsne_specs = tsne_stand_in_specs(list(self._class_centers), (-offset, 0))
+        if labels is None:
+            # Unlabelled data has no classes to separate: one t-SNE blob
+            tsne_pts = cluster_2d_points(len(self._cluster_pts), np.array([-offset, -0.3]), 0.9, seed=10)
+        else:
+            # Every class has a spec, so every point gets a t-SNE position
+            tsne_pts = np.empty((len(labels), 2))
+            for c, (center, spread, seed) in tsne_specs.items():
+                tsne_pts[labels == c] = cluster_2d_points(
+                    int(np.sum(labels == c)), center, spread, seed=seed
+                )
+        umap_pts = self._cluster_pts + np.array([offset, 0])
+        captioned = self._captioned_classes
+        tsne_centers = {c: tsne_specs[c][0] for c in captioned}
+        umap_centers = {c: self._class_centers[c] + np.array([offset, 0]) for c in captioned}
 
         tsne_header = title_text("t-SNE Projection", scale=0.55, color="#ddddee")
         umap_header = title_text("UMAP Projection", scale=0.55, color="#ddddee")
@@ -411,59 +482,37 @@ class UMAPVisualizationScene(Scene):
             run_time=0.7,
         )
 
-        anims = []
-        for i, dot in enumerate(cloud):
-            tx, ty = tsne_pts[i]
-            anims.append(dot.animate.move_to(np.array([tx, ty, 0])))
-
         self.play(
-            LaggedStart(*anims, lag_ratio=0.004),
+            TransitionPoints(cloud, points=tsne_pts, lag_ratio=0.004),
             run_time=2.5,
             rate_func=smooth,
         )
 
-        umap_dots = VGroup()
-        for i, col in enumerate(all_colors):
-            ux, uy = umap_pts[i]
-            d = Dot(point=np.array([ux, uy, 0]), radius=0.055, color=col)
-            d.set_color(col).set_opacity(0.85)
-            umap_dots.add(d)
+        umap_dots = PointCloud(umap_pts, colors=all_colors, radius=0.055, opacity=0.85)
 
         self.play(
-            LaggedStart(
-                *[FadeIn(d, scale=0.3) for d in umap_dots],
-                lag_ratio=0.006
-            ),
+            FadeInPoints(umap_dots, scale=0.3, lag_ratio=0.006),
             run_time=2.2,
         )
 
-        tl_dog = caption_text("Dogs", scale=0.42, color=DOG_COLOR)
-        tl_cat = caption_text("Cats", scale=0.42, color=CAT_COLOR)
-        tl_car = caption_text("Cars", scale=0.42, color=CAR_COLOR)
-        tl_dog.move_to(np.array([tsne_dog_center[0], tsne_dog_center[1] + 0.72, 0]))
-        tl_cat.move_to(np.array([tsne_cat_center[0], tsne_cat_center[1] + 0.72, 0]))
-        tl_car.move_to(np.array([tsne_car_center[0], tsne_car_center[1] + 0.72, 0]))
+        palette = self._class_palette
+        names = self._data.get_label_name
+        tsne_lbls = class_captions(tsne_centers, palette, names, scale=0.42, rise=0.72)
+        umap_lbls = class_captions(umap_centers, palette, names, scale=0.42, rise=0.72)
 
-        ul_dog = caption_text("Dogs", scale=0.42, color=DOG_COLOR)
-        ul_cat = caption_text("Cats", scale=0.42, color=CAT_COLOR)
-        ul_car = caption_text("Cars", scale=0.42, color=CAR_COLOR)
-        ul_dog.move_to(np.array([umap_dog_center[0], umap_dog_center[1] + 0.72, 0]))
-        ul_cat.move_to(np.array([umap_cat_center[0], umap_cat_center[1] + 0.72, 0]))
-        ul_car.move_to(np.array([umap_car_center[0], umap_car_center[1] + 0.72, 0]))
-
-        self.play(
-            FadeIn(VGroup(tl_dog, tl_cat, tl_car)),
-            FadeIn(VGroup(ul_dog, ul_cat, ul_car)),
-            run_time=0.8,
-        )
+        if len(tsne_lbls) > 0:
+            self.play(
+                FadeIn(tsne_lbls),
+                FadeIn(umap_lbls),
+                run_time=0.8,
+            )
         self.wait(2.5)
 
         self.play(
-            FadeOut(VGroup(
+            FadeOut(Group(
                 cloud, umap_dots,
                 tsne_header, umap_header, divider,
-                tl_dog, tl_cat, tl_car,
-                ul_dog, ul_cat, ul_car,
+                tsne_lbls, umap_lbls,
             )),
             run_time=0.9,
         )
@@ -472,16 +521,21 @@ class UMAPVisualizationScene(Scene):
     # Final Scene
     # --------------------------------------------------------
     def scene_final_landing(self):
-        dog_center = self._dog_center
-        cat_center = self._cat_center
-        car_center = self._car_center
+        # The captioned (largest) classes are the ones that get landing dots
+        classes = self._captioned_classes
+        centers = {c: self._class_centers[c] for c in classes}
+        color_map = {c: self._class_palette[c] for c in classes}
+        spread_map = {c: 0.55 if c == 2 and is_three_class(classes) else 0.5 for c in classes}
+        if not classes:
+            # Unlabelled data: everything lands on one dim cluster at the layout's center
+            classes = [None]
+            centers = {None: self._cluster_pts.mean(axis=0)}
+            color_map = {None: DIM_COLOR}
+            spread_map = {None: 0.8}
 
         n_flying = 36
         rng = np.random.default_rng(55)
-        categories = rng.choice(["dog", "cat", "car"], size=n_flying)
-
-        color_map = {"dog": DOG_COLOR, "cat": CAT_COLOR, "car": CAR_COLOR}
-        center_map = {"dog": dog_center, "cat": cat_center, "car": car_center}
+        categories = rng.choice(len(classes), size=n_flying)
 
         final_title = title_text("UMAP Projection of CLIP Embeddings", scale=0.65)
         final_title.to_edge(UP, buff=0.35)
@@ -489,30 +543,19 @@ class UMAPVisualizationScene(Scene):
         self.play(FadeIn(final_title, shift=UP * 0.15), run_time=0.7)
 
         n_bg = 220
-        n_per = n_bg // 3
-
-        bg_dog = cluster_2d_points(n_per, dog_center, 0.5, seed=10)
-        bg_cat = cluster_2d_points(n_per, cat_center, 0.5, seed=20)
-        bg_car = cluster_2d_points(n_bg - 2 * n_per, car_center, 0.55, seed=30)
+        n_per = n_bg // len(classes)
+        counts = [n_per] * (len(classes) - 1) + [n_bg - n_per * (len(classes) - 1)]
 
-        bg_pts = np.vstack([bg_dog, bg_cat, bg_car])
-        bg_colors = (
-            [DOG_COLOR] * n_per +
-            [CAT_COLOR] * n_per +
-            [CAR_COLOR] * (n_bg - 2 * n_per)
-        )
+        bg_pts = np.vstack([
+            cluster_2d_points(n, centers[c], spread_map[c], seed=10 * (k + 1))
+            for k, (c, n) in enumerate(zip(classes, counts))
+        ])
+        bg_colors = [color_map[c] for c, n in zip(classes, counts) for _ in range(n)]
 
-        bg_cloud = VGroup()
-        for (px, py), col in zip(bg_pts, bg_colors):
-            d = Dot(point=np.array([px, py, 0]), radius=0.055, color=col)
-            d.set_color(col).set_opacity(0.8)
-            bg_cloud.add(d)
+        bg_cloud = PointCloud(bg_pts, colors=bg_colors, radius=0.055, opacity=0.8)
 
         self.play(
-            LaggedStart(
-                *[FadeIn(d, scale=0.3) for d in bg_cloud],
-                lag_ratio=0.006
-            ),
+            FadeInPoints(bg_cloud, scale=0.3, lag_ratio=0.006),
             run_time=1.8,
         )
 
@@ -522,9 +565,9 @@ class UMAPVisualizationScene(Scene):
 
         rng2 = np.random.default_rng(1234)
 
-        for cat in categories:
-            col = color_map[cat]
-            ctr = center_map[cat]
+        for k in categories:
+            col = color_map[classes[k]]
+            ctr = centers[classes[k]]
 
             lx = ctr[0] + rng2.normal(scale=0.45)
             ly = ctr[1] + rng2.normal(scale=0.45)
@@ -552,18 +595,13 @@ class UMAPVisualizationScene(Scene):
             rate_func=smooth,
         )
 
-        lbl_d = caption_text("Dogs", scale=0.5, color=DOG_COLOR)
-        lbl_c = caption_text("Cats", scale=0.5, color=CAT_COLOR)
-        lbl_r = caption_text("Cars", scale=0.5, color=CAR_COLOR)
-
-        lbl_d.move_to(np.array([dog_center[0], dog_center[1] + 0.85, 0]))
-        lbl_c.move_to(np.array([cat_center[0], cat_center[1] + 0.85, 0]))
-        lbl_r.move_to(np.array([car_center[0], car_center[1] + 0.9, 0]))
-
-        self.play(
-            FadeIn(lbl_d),
-            FadeIn(lbl_c),
-            FadeIn(lbl_r),
-            run_time=0.8,
+        final_lbls = class_captions(
+            {c: centers[c] for c in self._captioned_classes},
+            color_map, self._data.get_label_name, scale=0.5
         )
+        if len(final_lbls) > 0:
+            self.play(
+                *[FadeIn(lbl) for lbl in final_lbls],
+                run_time=0.8,
+            )
         self.wait(2.5)
\ No newline at end of file
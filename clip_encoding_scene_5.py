@@ -1,5 +1,23 @@
 from manimlib import *
 import numpy as np
+import os
+import sys
+
+# manimgl loads scene files by path, so make the sibling helper modules importable
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from decision_boundary import contour_lines
+from decision_boundary import evaluate_grid
+from decision_boundary import logit_margin
+from decision_boundary import region_loops
+from inplace_updaters import always_set_cached_points
+from inplace_updaters import corner_subpaths_points
+from mlp import train_cached
+from number_label import NumberLabel
+from play_cache import PlayCacheMixin
+from play_profiler import PlayProfilerMixin
+from slerp import TrackerCache
+from tex_cache import CachedTex
 
 
 # ============================================================
@@ -10,18 +28,29 @@ CLASS_A_COLOR = "#4fc3f7"
 CLASS_B_COLOR = "#ef5350"
 NETWORK_COLOR = "#666688"
 
+# The network drawn in stage 2 is the one actually trained
+MLP_LAYER_SIZES = (2, 5, 5, 2)
+TRAIN_EPOCHS = 500
+PLANE_X_RANGE = (-1.5, 2.5)
+PLANE_Y_RANGE = (-1.5, 2.0)
+# Grid nodes per side on which the boundary and class regions are traced
+BOUNDARY_RESOLUTION = 256
+# Stage 5 replays every epoch, recontouring once per epoch shown on a coarser grid
+PLAYBACK_RESOLUTION = 128
+PLAYBACK_RUN_TIME = 8.0
+
 
 # ============================================================
 # Helpers
 # ============================================================
 def title_text(s, scale=0.72, color=WHITE):
-    t = Tex(r"\text{" + s + "}", color=color)
+    t = CachedTex(r"\text{" + s + "}", color=color)
     t.scale(scale)
     return t
 
 
 def caption_text(s, scale=0.42, color="#ccccdd"):
-    t = Tex(r"\text{" + s + "}", color=color)
+    t = CachedTex(r"\text{" + s + "}", color=color)
     t.scale(scale)
     return t
 
@@ -37,30 +66,71 @@ def make_moons(n=40, noise=0.08, seed=42):
     return np.column_stack([xa, ya]), np.column_stack([xb, yb])
 
 
-def boundary_curve(x):
-    """Sinusoidal decision boundary that separates the two moons."""
-    return 0.4 * np.sin(np.pi * x) + 0.25
-
-
-def make_shaded_region(plane, t_vals, bfn, side,
-                       x_lo, x_hi, y_lo, y_hi, color, opacity):
-    """Build a filled VMobject covering one side of a boundary curve."""
-    region = VMobject()
-    if side == "upper":
-        verts = [plane.c2p(x_lo, y_hi)]
-        verts.append(plane.c2p(x_lo, bfn(t_vals[0])))
-        verts += [plane.c2p(t, bfn(t)) for t in t_vals]
-        verts.append(plane.c2p(x_hi, bfn(t_vals[-1])))
-        verts.append(plane.c2p(x_hi, y_hi))
-        verts.append(plane.c2p(x_lo, y_hi))
-    else:
-        verts = [plane.c2p(x_hi, y_lo)]
-        verts.append(plane.c2p(x_hi, bfn(t_vals[-1])))
-        verts += [plane.c2p(t, bfn(t)) for t in t_vals[::-1]]
-        verts.append(plane.c2p(x_lo, bfn(t_vals[0])))
-        verts.append(plane.c2p(x_lo, y_lo))
-        verts.append(plane.c2p(x_hi, y_lo))
-    region.set_points_as_corners(verts)
+def train_moons_mlp(pts_a, pts_b):
+    """The MLP trained on the moons (class A = 0, B = 1), from the on-disk cache after the first render."""
+    x = np.vstack([pts_a, pts_b])
+    labels = np.repeat([0, 1], [len(pts_a), len(pts_b)])
+    return train_cached(
+        x, labels,
+        layer_sizes=MLP_LAYER_SIZES, epochs=TRAIN_EPOCHS,
+        optimizer="adam", lr=0.01, seed=0,
+    )
+
+
+def pca_2d(points):
+    """First two principal coordinates of (N, D) points (zero padded below 2 dimensions)."""
+    centered = points - points.mean(axis=0)
+    _, _, vt = np.linalg.svd(centered, full_matrices=False)
+    out = np.zeros((len(points), 2))
+    coords = centered @ vt[:2].T
+    out[:, :coords.shape[1]] = coords
+    return out
+
+
+def orient_like(points, reference):
+    """Flip each axis of ``points`` that runs against ``reference``, so layers morph without mirroring."""
+    signs = np.where(np.sum((points - points.mean(0)) * (reference - reference.mean(0)), axis=0) < 0, -1, 1)
+    return points * signs
+
+
+def fit_to_box(points, lo=(-1.2, -1.2), hi=(2.2, 1.7)):
+    """
+    Function mapping 2D coordinates into the plot box [lo, hi], with one
+    uniform scale chosen so that ``points`` fill it.
+    """
+    lo, hi = np.array(lo), np.array(hi)
+    mins, maxs = points.min(axis=0), points.max(axis=0)
+    scale = np.min((hi - lo) / np.maximum(maxs - mins, 1e-9))
+    return lambda p: (np.asarray(p) - (mins + maxs) / 2) * scale + (lo + hi) / 2
+
+
+def margin_field(run, epoch=-1, resolution=BOUNDARY_RESOLUTION):
+    """Class A's logit margin over the whole plane, positive where the network picks A."""
+    return evaluate_grid(
+        lambda points: logit_margin(run.logits(points, epoch)),
+        PLANE_X_RANGE, PLANE_Y_RANGE, resolution,
+    )
+
+
+def polylines_to_points(plane, polylines):
+    """VMobject points with a corner subpath through each polyline of plane coordinates."""
+    return corner_subpaths_points([plane.c2p(line[:, 0], line[:, 1]) for line in polylines])
+
+
+def polylines_to_vmobject(plane, polylines):
+    return VMobject().set_points(polylines_to_points(plane, polylines))
+
+
+def make_boundary(plane, field):
+    """The decision boundary, wherever and in however many pieces the zero margin runs."""
+    boundary = polylines_to_vmobject(plane, contour_lines(field))
+    boundary.set_stroke(WHITE, width=2.5)
+    return boundary
+
+
+def make_class_region(plane, field, above, color, opacity):
+    """Filled region of the plane where the margin is positive (``above``) or not, holes included."""
+    region = polylines_to_vmobject(plane, region_loops(field, above=above))
     region.set_fill(color, opacity)
     region.set_stroke(width=0)
     return region
@@ -69,7 +139,7 @@ def make_shaded_region(plane, t_vals, bfn, side,
 # ============================================================
 # Main Scene
 # ============================================================
-class MLPDecisionBoundaryScene(Scene):
+class MLPDecisionBoundaryScene(PlayProfilerMixin, PlayCacheMixin, Scene):
     def construct(self):
         self.camera.background_color = BG_COLOR
         self.camera.frame.set_width(14)
@@ -85,8 +155,8 @@ class MLPDecisionBoundaryScene(Scene):
     # --------------------------------------------------------
     def stage1_scatter_with_linear(self):
         plane = NumberPlane(
-            x_range=[-1.5, 2.5, 1],
-            y_range=[-1.5, 2.0, 1],
+            x_range=[*PLANE_X_RANGE, 1],
+            y_range=[*PLANE_Y_RANGE, 1],
             width=8,
             height=5.5,
             axis_config=dict(stroke_color=GREY_B, stroke_width=2),
@@ -132,7 +202,7 @@ class MLPDecisionBoundaryScene(Scene):
             "Linear classifier: insufficient", scale=0.4, color=YELLOW,
         )
         fail_label.next_to(linear_line.get_end(), UR, buff=0.15)
-        x_mark = Tex(r"\times", color=RED, font_size=36)
+        x_mark = CachedTex(r"\times", color=RED, font_size=36)
         x_mark.next_to(fail_label, LEFT, buff=0.1)
 
         self.play(ShowCreation(linear_line), run_time=1.0)
@@ -142,6 +212,7 @@ class MLPDecisionBoundaryScene(Scene):
         self._plane = plane
         self._dots_a, self._dots_b = dots_a, dots_b
         self._pts_a, self._pts_b = pts_a, pts_b
+        self._run = train_moons_mlp(pts_a, pts_b)
         self._title = title
         self._linear_stuff = VGroup(linear_line, fail_label, x_mark)
 
@@ -149,7 +220,7 @@ class MLPDecisionBoundaryScene(Scene):
     # Stage 2 — MLP diagram + ReLU on the side
     # --------------------------------------------------------
     def stage2_mlp_diagram(self):
-        layer_sizes = [2, 5, 5, 2]
+        layer_sizes = MLP_LAYER_SIZES
         layer_xs = [3.4, 4.2, 5.0, 5.8]
         gap_y = 0.36
 
@@ -236,47 +307,30 @@ class MLPDecisionBoundaryScene(Scene):
         pts_a, pts_b = self._pts_a.copy(), self._pts_b.copy()
         dots_a, dots_b = self._dots_a, self._dots_b
 
-        all_pts = np.vstack([pts_a, pts_b])
-        ctr = all_pts.mean(axis=0)
-
-        def layer1(pts):
-            c = pts - ctr
-            th = 0.4
-            R = np.array([
-                [np.cos(th), -np.sin(th)],
-                [np.sin(th),  np.cos(th)],
-            ])
-            S = np.diag([1.3, 0.8])
-            return (S @ R @ c.T).T + ctr
-
-        def layer2(pts):
-            out = pts.copy()
-            mask = out[:, 1] < ctr[1]
-            out[mask, 1] = ctr[1] + (out[mask, 1] - ctr[1]) * 0.08
-            out[:, 0] *= 1.1
-            return out
-
-        def layer3_split(pa, pb):
-            a, b = pa.copy(), pb.copy()
-            a[:, 1] += 0.55
-            b[:, 1] -= 0.55
-            return a, b
+        # Where the trained network actually sends the points: each hidden
+        # layer by its two principal axes, the output as (mean logit, margin)
+        n_a = len(pts_a)
+        hidden_1, hidden_2, logits = self._run.activations(np.vstack([pts_a, pts_b]))[1:]
+        layer_1 = orient_like(pca_2d(hidden_1), np.vstack([pts_a, pts_b]))
+        layer_2 = orient_like(pca_2d(hidden_2), layer_1)
+        output = np.stack([logits.mean(axis=1), logits[:, 0] - logits[:, 1]], axis=1)
+        output_to_plot = fit_to_box(output)
+        layers = [
+            fit_to_box(layer_1)(layer_1),
+            fit_to_box(layer_2)(layer_2),
+            output_to_plot(output),
+        ]
 
         steps = [
-            ("Layer 1: rotate + stretch", YELLOW_C),
-            ("Layer 2: ReLU non-linearity", YELLOW_C),
-            ("Layer 3: linearly separable", GREEN_C),
+            ("Layer 1: affine + ReLU", YELLOW_C),
+            ("Layer 2: affine + ReLU", YELLOW_C),
+            ("Output: linearly separable", GREEN_C),
         ]
 
         cur_a, cur_b = pts_a, pts_b
 
         for idx, (label, col) in enumerate(steps):
-            if idx == 0:
-                new_a, new_b = layer1(cur_a), layer1(cur_b)
-            elif idx == 1:
-                new_a, new_b = layer2(cur_a), layer2(cur_b)
-            else:
-                new_a, new_b = layer3_split(cur_a, cur_b)
+            new_a, new_b = layers[idx][:n_a], layers[idx][n_a:]
 
             eg = self._edge_groups[idx]
             self.play(
@@ -300,7 +354,8 @@ class MLPDecisionBoundaryScene(Scene):
             )
             cur_a, cur_b = new_a, new_b
 
-        sep_y = (cur_a[:, 1].min() + cur_b[:, 1].max()) / 2
+        # Zero margin, where the two logits tie
+        sep_y = output_to_plot([0, 0])[1]
         sep_line = Line(
             plane.c2p(-1.5, sep_y), plane.c2p(2.5, sep_y),
             stroke_color=GREEN_C, stroke_width=2.5,
@@ -340,21 +395,13 @@ class MLPDecisionBoundaryScene(Scene):
         ]
         self.play(*anims, run_time=2.0, rate_func=smooth)
 
-        t_vals = np.linspace(-1.0, 2.0, 100)
-        bnd_pts = [plane.c2p(t, boundary_curve(t)) for t in t_vals]
-        boundary = VMobject().set_points_smoothly(bnd_pts)
-        boundary.set_stroke(WHITE, width=2.5)
+        field = margin_field(self._run)
+        boundary = make_boundary(plane, field)
 
         self.play(ShowCreation(boundary), run_time=1.5)
 
-        upper_r = make_shaded_region(
-            plane, t_vals, boundary_curve, "upper",
-            -1.5, 2.5, -1.5, 2.0, CLASS_A_COLOR, 0.12,
-        )
-        lower_r = make_shaded_region(
-            plane, t_vals, boundary_curve, "lower",
-            -1.5, 2.5, -1.5, 2.0, CLASS_B_COLOR, 0.12,
-        )
+        upper_r = make_class_region(plane, field, True, CLASS_A_COLOR, 0.12)
+        lower_r = make_class_region(plane, field, False, CLASS_B_COLOR, 0.12)
 
         lbl_a = caption_text("Class A", scale=0.45, color=CLASS_A_COLOR)
         lbl_a.move_to(plane.c2p(0.5, 1.4))
@@ -388,58 +435,43 @@ class MLPDecisionBoundaryScene(Scene):
         self.play(plot_group.animate.shift(RIGHT * 1.8), run_time=0.8)
 
         epoch_tracker = ValueTracker(0)
-        epoch_label = Tex(
+        epoch_label = CachedTex(
             r"\text{Epoch:}", font_size=36, color=WHITE,
         )
         epoch_label.to_corner(UL, buff=0.6)
 
-        epoch_num = always_redraw(lambda: Tex(
-            r"\text{" + str(int(epoch_tracker.get_value())) + "}",
-            font_size=36, color=WHITE,
-        ).next_to(epoch_label, RIGHT, buff=0.2))
+        epoch_num = NumberLabel(0, num_decimal_places=0, font_size=36, color=WHITE)
+        epoch_num.next_to(epoch_label, RIGHT, buff=0.2)
+        epoch_num.add_updater(lambda m: m.set_value(int(epoch_tracker.get_value())))
 
         self.play(FadeIn(epoch_label), FadeIn(epoch_num), run_time=0.5)
 
-        rng = np.random.default_rng(42)
-        fixed_noise = rng.normal(0, 1, 80)
-        t_vals = np.linspace(-1.0, 2.0, 80)
-
-        def make_bnd(frac):
-            amp = 0.05 + 0.35 * frac
-            ns = 0.15 * (1.0 - frac)
-            pts = [
-                plane.c2p(
-                    t,
-                    amp * np.sin(np.pi * t) + 0.25 + ns * fixed_noise[k],
-                )
-                for k, t in enumerate(t_vals)
-            ]
-            m = VMobject().set_points_smoothly(pts)
-            m.set_stroke(WHITE, width=2.5)
-            return m
-
-        bnd = make_bnd(0)
+        # One persistent boundary, rewritten only when the epoch shown changes
+        run = self._run
+        boundary_points = TrackerCache(
+            epoch_tracker,
+            lambda epoch: polylines_to_points(
+                plane, contour_lines(margin_field(run, epoch, PLAYBACK_RESOLUTION)),
+            ),
+            key=int,
+        )
+        bnd = VMobject()
+        bnd.set_stroke(WHITE, width=2.5)
+        always_set_cached_points(bnd, boundary_points)
         self.play(ShowCreation(bnd), run_time=0.8)
 
-        for step in range(1, 11):
-            frac = step / 10
-            new_bnd = make_bnd(frac)
-            self.play(
-                Transform(bnd, new_bnd),
-                epoch_tracker.animate.set_value(int(100 * frac)),
-                run_time=0.5,
-            )
-
-        t_fine = np.linspace(-1.0, 2.0, 100)
-        upper_r = make_shaded_region(
-            plane, t_fine, boundary_curve, "upper",
-            -1.5, 2.5, -1.5, 2.0, CLASS_A_COLOR, 0.12,
-        )
-        lower_r = make_shaded_region(
-            plane, t_fine, boundary_curve, "lower",
-            -1.5, 2.5, -1.5, 2.0, CLASS_B_COLOR, 0.12,
+        self.play(
+            epoch_tracker.animate.set_value(run.n_epochs),
+            run_time=PLAYBACK_RUN_TIME,
+            rate_func=linear,
         )
 
+        field = margin_field(run)
+        bnd.clear_updaters()
+        bnd.set_points(polylines_to_points(plane, contour_lines(field)))
+        upper_r = make_class_region(plane, field, True, CLASS_A_COLOR, 0.12)
+        lower_r = make_class_region(plane, field, False, CLASS_B_COLOR, 0.12)
+
         lbl_a = caption_text("Class A", scale=0.45, color=CLASS_A_COLOR)
         lbl_a.move_to(plane.c2p(0.5, 1.4))
         lbl_b = caption_text("Class B", scale=0.45, color=CLASS_B_COLOR)
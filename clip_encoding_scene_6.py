@@ -1,5 +1,22 @@
 from manimlib import *
 import numpy as np
+import os
+import sys
+
+# manimgl loads scene files by path, so make the sibling helper modules importable
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bar_chart import BarChart
+from cluster_metrics import StreamingKNNConfusion
+from cluster_metrics import attractor_columns
+from cluster_metrics import column_inflow
+from cluster_metrics import victims_of
+from heatmap_matrix import HeatmapMatrix
+from play_cache import PlayCacheMixin
+from play_profiler import PlayProfilerMixin
+from point_cloud import FadeInPoints
+from point_cloud import PointCloud
+from tex_cache import CachedTex
 
 
 def cluster_gaussian(n, center, spread, seed=0):
@@ -8,59 +25,42 @@ def cluster_gaussian(n, center, spread, seed=0):
     return pts
 
 
-def make_confusion_cells(
-    matrix,
-    anchor,
-    cell,
-    gap,
-    font_scale=1.0,
-):
+def make_confusion_heatmap(matrix, anchor, cell, gap, font_scale=1.0):
     """
     matrix[i, j] = P(pred=j | true=i), row i true class, col j predicted.
-    Returns (cell_mobs VGroup, col_groups[j] = column j for highlighting).
+    Returns (heatmap, percentage labels); cell (0, 0) is centered on ``anchor``,
+    and labels are only made while the cells are large enough to read.
     """
-    n = int(matrix.shape[0])
-    mobs = VGroup()
-    col_groups = [VGroup() for _ in range(n)]
-
-    for i in range(n):
-        for j in range(n):
-            v = float(matrix[i, j])
-            is_diag = i == j
-            if is_diag:
-                col = GREEN_C
-                op = 0.22 + 0.62 * min(1.0, v * 1.15)
-            else:
-                col = RED_C if v > 0.12 else ORANGE
-                op = 0.12 + 0.78 * min(1.0, v * 1.2)
-
-            box = RoundedRectangle(
-                width=cell,
-                height=cell,
-                corner_radius=0.05,
-                stroke_color=GREY_B,
-                stroke_width=1.2,
-                fill_color=col,
-                fill_opacity=op,
-            )
-            cx = anchor[0] + j * (cell + gap)
-            cy = anchor[1] - i * (cell + gap)
-            box.move_to(np.array([cx, cy, 0]))
-
-            pct = int(round(v * 100))
-            num = Tex(rf"{pct}\%", font_size=int(20 * font_scale), color=WHITE)
-            num.move_to(box.get_center())
-            g = VGroup(box, num)
-            mobs.add(g)
-            col_groups[j].add(g)
-
-    return mobs, col_groups
+    matrix = np.asarray(matrix, dtype=float)
+    n = matrix.shape[0]
+    pitch = cell + gap
+    heatmap = HeatmapMatrix(matrix, width=n * pitch, vmin=0, vmax=1, cell_gap=gap / pitch)
+    heatmap.move_to(np.array(anchor) + 0.5 * pitch * (LEFT + UP), aligned_edge=UL)
+
+    diag = heatmap.get_diagonal_mask()
+    stolen = ~diag & (matrix > 0.12)
+    minor = ~diag & ~stolen
+    heatmap.set_cell_colors(GREEN_C, opacity=0.22 + 0.62 * np.minimum(1.0, matrix[diag] * 1.15), where=diag)
+    heatmap.set_cell_colors(RED_C, opacity=0.12 + 0.78 * np.minimum(1.0, matrix[stolen] * 1.2), where=stolen)
+    heatmap.set_cell_colors(ORANGE, opacity=0.12 + 0.78 * np.minimum(1.0, matrix[minor] * 1.2), where=minor)
+
+    labels = heatmap.get_value_labels(
+        num_decimal_places=0,
+        font_size=int(20 * font_scale),
+        values=100 * matrix,
+        unit="%",
+    )
+    return heatmap, labels
 
 
 CLASS_COLORS = [TEAL_C, BLUE_C, PURPLE_B, MAROON_B, GOLD_E]
+# Neighbors voting on each embedded point's name
+KNN_K = 9
+# New names stream into the metrics this many points at a time
+STREAM_BATCH = 12
 
 
-class BadSinksClustersScene(Scene):
+class BadSinksClustersScene(PlayProfilerMixin, PlayCacheMixin, Scene):
     """
     Scene 6 — bad sinks / clusters: tight vs crowded regions, sorted metrics as a
     descending curve, more classes → more infighting, confusion matrix + attractor column.
@@ -80,7 +80,7 @@ class BadSinksClustersScene(Scene):
         # ------------------------------------------------------------------
         # Stage 0 — title
         # ------------------------------------------------------------------
-        title = Tex(
+        title = CachedTex(
             R"\text{Bad sinks: name clusters \& confusion}",
             font_size=36,
             color=WHITE,
@@ -101,8 +101,8 @@ class BadSinksClustersScene(Scene):
         )
         emb_axes.to_edge(LEFT, buff=0.55).shift(DOWN * 0.15)
 
-        cap_tight = Tex(R"\text{tight, clean cluster}", font_size=22, color=TEAL_C)
-        cap_crowd = Tex(R"\text{crowded region (overlap)}", font_size=22, color=ORANGE)
+        cap_tight = CachedTex(R"\text{tight, clean cluster}", font_size=22, color=TEAL_C)
+        cap_crowd = CachedTex(R"\text{crowded region (overlap)}", font_size=22, color=ORANGE)
         cap_tight.next_to(emb_axes.c2p(-1.35, 1.15), UP, buff=0.08)
         cap_crowd.next_to(emb_axes.c2p(1.4, 1.15), UP, buff=0.08)
 
@@ -113,20 +113,24 @@ class BadSinksClustersScene(Scene):
         ]
 
         all_dot_groups = {}
+        emb_points, emb_labels = [], []
         for idx, ctr, sprd, n, sd in cluster_specs:
             P = cluster_gaussian(n, ctr, sprd, seed=sd)
-            grp = VGroup()
-            for p in P:
-                d = Dot(emb_axes.c2p(p[0], p[1]), radius=0.042)
-                d.set_fill(CLASS_COLORS[idx], 0.92).set_stroke(BLACK, 0)
-                d.set_z_index(-1)
-                grp.add(d)
+            emb_points.append(P)
+            emb_labels.append(np.full(n, idx))
+            grp = PointCloud(
+                emb_axes.c2p(P[:, 0], P[:, 1]),
+                colors=CLASS_COLORS[idx],
+                radius=0.042,
+                opacity=0.92,
+            )
+            grp.set_z_index(-1)
             all_dot_groups[idx] = grp
 
-        lbl_david = Tex(
+        lbl_david = CachedTex(
             R"\text{David}", font_size=24, color=TEAL_C
         ).next_to(cap_tight, UP, buff=0.06)
-        lbl_crowd = Tex(
+        lbl_crowd = CachedTex(
             R"\text{Daniel, Mike}", font_size=22, color=GREY_A
         ).next_to(cap_crowd, UP, buff=0.06)
 
@@ -144,7 +148,7 @@ class BadSinksClustersScene(Scene):
         self.play(FadeIn(cap_crowd), FadeIn(lbl_crowd), run_time=0.45)
         self.wait(0.55)
 
-        note_embed = Tex(
+        note_embed = CachedTex(
             R"\text{Some names sit in tight basins; others share a crowded sink.}",
             font_size=24,
             color=LABEL_COLOR,
@@ -157,8 +161,11 @@ class BadSinksClustersScene(Scene):
         # ------------------------------------------------------------------
         # Stage 2 — bar chart: unsorted → sorted (descending "curve")
         # ------------------------------------------------------------------
-        recall = np.array([0.84, 0.46, 0.61, 0.79, 0.34], dtype=float)
-        perm_display = np.array([2, 4, 0, 1, 3], dtype=int)
+        # Recall of the names embedded so far, each point classified by its neighbors
+        metrics = StreamingKNNConfusion(k=KNN_K, n_classes=N_CLS)
+        metrics.add_points(np.vstack(emb_points), np.concatenate(emb_labels))
+        recall = metrics.recall
+        perm_display = np.unique(metrics.labels)
 
         bar_axes = Axes(
             x_range=[0, 6, 1],
@@ -169,42 +176,51 @@ class BadSinksClustersScene(Scene):
         )
         bar_axes.next_to(emb_axes, RIGHT, buff=0.55).align_to(emb_axes, UP)
 
-        bar_w = 0.42
-        gap_x = 1.0
-
-        def bar_group_at_slots(slots, heights, labels, color_indices=None):
-            grp = VGroup()
-            for k, (sx, h, nm) in enumerate(zip(slots, heights, labels)):
-                bl = bar_axes.c2p(sx - bar_w / 2, 0)
-                tr = bar_axes.c2p(sx + bar_w / 2, h)
-                w = abs(tr[0] - bl[0])
-                hgt = abs(tr[1] - bl[1])
-                fill_c = CLASS_COLORS[color_indices[k]] if color_indices else BLUE_D
-                r = Rectangle(width=w, height=hgt, stroke_width=1.2)
-                r.set_stroke(GREY_B, 1.2)
-                r.set_fill(fill_c, 0.75)
-                r.move_to((bl + tr) / 2)
-                lab = Tex(rf"\text{{{nm}}}", font_size=18, color=GREY_A)
-                lab.next_to(r, DOWN, buff=0.12)
-                grp.add(VGroup(r, lab))
-            return grp
-
-        x_slots = 1.0 + gap_x * np.arange(N_CLS)
-        bars_unsorted = bar_group_at_slots(
-            x_slots,
-            recall[perm_display],
-            [names[i] for i in perm_display],
-            color_indices=list(perm_display),
+        # One bar per name in slots 1..N_CLS of the axes, hidden until its
+        # name has points; heights, slots and colors all live in the chart
+        chart_origin = bar_axes.c2p(0.5, 0)
+        chart = BarChart(
+            np.zeros(N_CLS),
+            width=bar_axes.c2p(0.5 + N_CLS, 0)[0] - chart_origin[0],
+            height=bar_axes.c2p(0.5, 1)[1] - chart_origin[1],
+            y_max=1,
+            colors=CLASS_COLORS[:N_CLS],
+            bar_opacity=0,
+            bar_width=0.42,
         )
-
-        chart_title = Tex(
+        chart.move_to(chart_origin, aligned_edge=DL)
+        chart.add_bar_labels([
+            CachedTex(rf"\text{{{nm}}}", font_size=18, color=GREY_A).set_opacity(0)
+            for nm in names[:N_CLS]
+        ])
+
+        def chart_showing(recall, shown, order):
+            """A copy of ``chart`` with the ``shown`` bars at ``recall``, in slots by ``order``."""
+            visible = np.isin(np.arange(N_CLS), shown)
+            target = chart.copy()
+            target.set_heights(np.where(visible, recall, 0))
+            target.set_bar_opacity(np.where(visible, 0.75, 0))
+            target.reorder(np.concatenate([order, np.flatnonzero(~visible)]))
+            for label, is_visible in zip(target.bar_labels, visible):
+                label.set_opacity(float(is_visible))
+            return target
+
+        def ranked_chart(recall, classes, curve_color):
+            """The chart with ``classes`` sorted by recall, and the curve over their tops."""
+            target = chart_showing(recall, classes, classes[np.argsort(-recall[classes], kind="stable")])
+            top_curve = VMobject()
+            top_curve.set_points_smoothly(target.get_tops_in_slot_order(classes))
+            top_curve.set_stroke(curve_color, width=3, opacity=0.85)
+            return target, top_curve
+
+        chart_title = CachedTex(
             R"\text{Per-name recall}",
             font_size=26,
             color=WHITE,
         )
         chart_title.next_to(bar_axes, UP, buff=0.35)
 
-        sort_lbl = Tex(
+        sort_lbl = CachedTex(
             R"\text{sort} \Rightarrow \text{descending curve}",
             font_size=24,
             color=YELLOW_C,
@@ -216,27 +232,17 @@ class BadSinksClustersScene(Scene):
             FadeIn(chart_title, shift=DOWN * 0.08),
             run_time=0.7,
         )
+        self.add(chart)
         self.play(
-            LaggedStart(*[FadeIn(b, scale=0.2) for b in bars_unsorted], lag_ratio=0.12),
+            Transform(chart, chart_showing(recall, perm_display, perm_display)),
             run_time=1.1,
         )
         self.wait(0.35)
 
-        sort_idx = np.argsort(-recall)
-        sorted_names = [names[i] for i in sort_idx]
-        sorted_heights = recall[sort_idx]
-        bars_sorted = bar_group_at_slots(
-            x_slots, sorted_heights, sorted_names,
-            color_indices=list(sort_idx),
-        )
-
-        curve_pts = [bar_axes.c2p(x_slots[i], sorted_heights[i]) for i in range(N_CLS)]
-        curve = VMobject()
-        curve.set_points_smoothly(curve_pts)
-        curve.set_stroke(YELLOW_A, width=3, opacity=0.85)
+        bars_sorted, curve = ranked_chart(recall, perm_display, YELLOW_A)
 
         self.play(
-            Transform(bars_unsorted, bars_sorted),
+            Transform(chart, bars_sorted),
             FadeIn(sort_lbl, shift=UP * 0.08),
             run_time=1.35,
             rate_func=smooth,
@@ -247,7 +253,7 @@ class BadSinksClustersScene(Scene):
         # ------------------------------------------------------------------
         # Stage 3 — more classes → more infighting (extra dots + recall drop)
         # ------------------------------------------------------------------
-        crowd_note = Tex(
+        crowd_note = CachedTex(
             R"\text{More names} \Rightarrow \text{more infighting in the same sinks}",
             font_size=24,
             color=LABEL_COLOR,
@@ -255,50 +261,42 @@ class BadSinksClustersScene(Scene):
         crowd_note.to_edge(DOWN, buff=0.26)
 
         extra_specs = [
-            (3, (2.05, 0.55), 0.25, 22, 10),   # Michael — right of Daniel
-            (4, (0.35, -1.15), 0.25, 22, 12),   # Matt — below-left of Mike
+            (3, (1.25, -0.2), 0.32, 70, 10),   # Michael — dense, between Daniel and Mike
+            (4, (0.7, -0.95), 0.25, 22, 12),   # Matt — below-left of Mike
         ]
-        extra_groups = VGroup()
-        for idx, ctr, sprd, n, sd in extra_specs:
-            P = cluster_gaussian(n, ctr, sprd, seed=sd)
-            for p in P:
-                d = Dot(emb_axes.c2p(p[0], p[1]), radius=0.038)
-                d.set_fill(CLASS_COLORS[idx], 0.88).set_stroke(BLACK, 0)
-                d.set_z_index(-1)
-                extra_groups.add(d)
-
-        extra_lbl = Tex(
+        extra_lbl = CachedTex(
             R"\text{+ Michael, Matt}",
             font_size=22, color=GREY_A,
         ).next_to(lbl_crowd, RIGHT, buff=0.05)
 
-        recall_after = np.array([0.82, 0.31, 0.42, 0.55, 0.22], dtype=float)
-        sort_idx2 = np.argsort(-recall_after)
-        sorted_h2 = recall_after[sort_idx2]
-        sorted_n2 = [names[i] for i in sort_idx2]
-        bars_after = bar_group_at_slots(
-            x_slots, sorted_h2, sorted_n2,
-            color_indices=list(sort_idx2),
-        )
-        curve_pts2 = [bar_axes.c2p(x_slots[i], sorted_h2[i]) for i in range(N_CLS)]
-        curve2 = VMobject()
-        curve2.set_points_smoothly(curve_pts2)
-        curve2.set_stroke(RED_C, width=3, opacity=0.85)
-
-        self.play(FadeIn(crowd_note, shift=UP * 0.1), run_time=0.45)
         self.play(
-            LaggedStart(*[FadeIn(d, scale=0.15) for d in extra_groups], lag_ratio=0.03),
+            FadeIn(crowd_note, shift=UP * 0.1),
             FadeIn(extra_lbl, shift=UP * 0.06),
-            run_time=1.4,
-        )
-        self.wait(0.3)
-
-        self.play(
-            Transform(bars_unsorted, bars_after),
-            Transform(curve, curve2),
-            run_time=1.2,
-            rate_func=smooth,
+            run_time=0.45,
         )
+        # Each new name arrives a batch at a time; only the points whose
+        # neighbors change are reclassified, and the bars follow every batch
+        for idx, ctr, sprd, n, sd in extra_specs:
+            P = cluster_gaussian(n, ctr, sprd, seed=sd)
+            for batch in np.array_split(P, -(-n // STREAM_BATCH)):
+                metrics.add_points(batch, np.full(len(batch), idx))
+                dots = PointCloud(
+                    emb_axes.c2p(batch[:, 0], batch[:, 1]),
+                    colors=CLASS_COLORS[idx],
+                    radius=0.038,
+                    opacity=0.88,
+                )
+                dots.set_z_index(-1)
+                bars_next, curve_next = ranked_chart(
+                    metrics.recall, np.unique(metrics.labels), RED_C
+                )
+                self.play(
+                    FadeInPoints(dots, scale=0.15, lag_ratio=0.03),
+                    Transform(chart, bars_next),
+                    Transform(curve, curve_next),
+                    run_time=0.4,
+                    rate_func=smooth,
+                )
         self.wait(0.75)
         self.play(FadeOut(crowd_note), run_time=0.35)
 
@@ -309,48 +307,38 @@ class BadSinksClustersScene(Scene):
             FadeOut(chart_title),
             FadeOut(sort_lbl),
             FadeOut(curve),
-            FadeOut(bars_unsorted),
+            FadeOut(chart),
             FadeOut(bar_axes),
             run_time=0.65,
         )
 
-        # Michael column steals from Daniel / Mike / Matt
-        C = np.array(
-            [
-                [0.78, 0.14, 0.03, 0.03, 0.02],  # David
-                [0.06, 0.46, 0.04, 0.38, 0.06],   # Daniel → Michael
-                [0.02, 0.05, 0.42, 0.36, 0.15],   # Mike → Michael, Matt
-                [0.03, 0.08, 0.06, 0.79, 0.04],   # Michael (strong self)
-                [0.02, 0.04, 0.18, 0.42, 0.34],   # Matt → Michael
-            ],
-            dtype=float,
-        )
+        C = metrics.rates
 
         cell_s = 0.58
         gap_m = 0.07
         grid_w = N_CLS * cell_s + (N_CLS - 1) * gap_m
         cm_anchor = np.array([2.05, 0.55, 0])
 
-        pred_hdr = Tex(R"\text{predicted}", font_size=22, color=LABEL_COLOR)
+        pred_hdr = CachedTex(R"\text{predicted}", font_size=22, color=LABEL_COLOR)
         pred_hdr.next_to(
             np.array([cm_anchor[0] + grid_w / 2 - cell_s / 2,
                        cm_anchor[1] + cell_s + 0.55, 0]),
             UP, buff=0.08,
         )
 
-        true_hdr = Tex(R"\text{true}", font_size=22, color=LABEL_COLOR)
+        true_hdr = CachedTex(R"\text{true}", font_size=22, color=LABEL_COLOR)
         true_hdr.next_to(
             np.array([cm_anchor[0] - 1.15,
                        cm_anchor[1] - grid_w / 2 + cell_s / 2, 0]),
             LEFT, buff=0.12,
         )
 
-        cells_mob, col_groups = make_confusion_cells(C, cm_anchor, cell_s, gap_m)
+        heatmap, cell_labels = make_confusion_heatmap(C, cm_anchor, cell_s, gap_m)
 
         row_labels = VGroup()
         col_labels = VGroup()
         for i, nm in enumerate(names):
-            t = Tex(rf"\text{{{nm}}}", font_size=18, color=GREY_A)
+            t = CachedTex(rf"\text{{{nm}}}", font_size=18, color=GREY_A)
             t.next_to(
                 np.array([cm_anchor[0] - 0.55,
                            cm_anchor[1] - i * (cell_s + gap_m), 0]),
@@ -358,7 +346,7 @@ class BadSinksClustersScene(Scene):
             )
             row_labels.add(t)
         for j, nm in enumerate(names):
-            t = Tex(rf"\text{{{nm}}}", font_size=18, color=GREY_A)
+            t = CachedTex(rf"\text{{{nm}}}", font_size=18, color=GREY_A)
             t.next_to(
                 np.array([cm_anchor[0] + j * (cell_s + gap_m),
                            cm_anchor[1] + 0.52, 0]),
@@ -366,15 +354,18 @@ class BadSinksClustersScene(Scene):
             )
             col_labels.add(t)
 
-        cm_title = Tex(
+        cm_title = CachedTex(
             R"\text{Confusion matrix: who steals whom?}",
             font_size=28, color=WHITE,
         )
         cm_title.next_to(pred_hdr, UP, buff=0.35)
 
-        attractor_col_idx = 3  # Michael
-        attractor_brace = Brace(col_groups[attractor_col_idx], DOWN, buff=0.06)
-        attractor_txt = Tex(
+        # The column absorbing the most of other names' points
+        attractors = attractor_columns(C)
+        attractor_col_idx = int(attractors[0]) if len(attractors) else int(np.argmax(column_inflow(C)))
+        attractor_cells = heatmap.get_cell_rectangle(cols=attractor_col_idx)
+        attractor_brace = Brace(attractor_cells, DOWN, buff=0.06)
+        attractor_txt = CachedTex(
             R"\text{strong attractor}", font_size=22, color=YELLOW_C,
         )
         attractor_txt.next_to(attractor_brace, DOWN, buff=0.12)
@@ -383,26 +374,30 @@ class BadSinksClustersScene(Scene):
         self.play(FadeIn(pred_hdr), FadeIn(true_hdr), run_time=0.45)
         self.play(FadeIn(row_labels), FadeIn(col_labels), run_time=0.55)
         self.play(
-            LaggedStart(*[FadeIn(c, scale=0.5) for c in cells_mob], lag_ratio=0.04),
+            FadeIn(heatmap, scale=0.9),
+            FadeIn(cell_labels, lag_ratio=0.04),
             run_time=1.5,
         )
         self.wait(0.4)
 
         col_highlight = SurroundingRectangle(
-            col_groups[attractor_col_idx],
+            attractor_cells,
             color=YELLOW_C,
             stroke_width=2.5,
             buff=0.04,
         )
+        others = ~heatmap.cell_mask(cols=attractor_col_idx)
         self.play(
+            heatmap.animate.set_cell_opacity(0.5 * heatmap.cell_rgba[others, 3], where=others),
             ShowCreation(col_highlight),
             GrowFromCenter(attractor_brace),
             FadeIn(attractor_txt, shift=UP * 0.08),
             run_time=0.85,
         )
 
-        steal_note = Tex(
-            R"\text{Daniel, Mike, Matt} \to \text{Michael}",
+        victims = ", ".join(names[i] for i in victims_of(C, attractor_col_idx))
+        steal_note = CachedTex(
+            rf"\text{{{victims}}} \to \text{{{names[attractor_col_idx]}}}",
             font_size=22,
             color=GREY_A,
         )
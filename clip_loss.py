@@ -0,0 +1,229 @@
+"""
+CLIP's contrastive objective on whole embedding matrices, in batched NumPy.
+
+For N image and N text embeddings (row i of each is a matched pair):
+
+    S = normalize(I) @ normalize(T).T           cosine similarities
+    logits = S / temperature
+    L_image = mean_i -log softmax(logits[i, :])[i]     (each image picks its text)
+    L_text  = mean_j -log softmax(logits[:, j])[j]     (each text picks its image)
+    L_CLIP  = (L_image + L_text) / 2
+
+    scores = contrastive_scores(img, txt, temperature=0.07)
+    scores.logits, scores.image_log_probs, scores.loss_clip
+    scores.pooled_logits(256), scores.pooled_image_probs(256)    # at most 256 x 256, any N
+
+Up to ``max_dense_rows`` pairs every matrix is returned.  Beyond that the
+logits are computed ``chunk_rows`` rows at a time in float32, with the row and
+column log-sum-exps and each row's argmax accumulated as they go, so a
+32k x 32k batch is summarized without ever holding the full matrix (let alone
+a float64 one).  Any block of it can still be recomputed with
+``logit_block``, and the pooled views average it down to a displayable size
+one row block at a time.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+DEFAULT_TEMPERATURE = 0.07
+DEFAULT_CHUNK_ROWS = 1024
+MAX_DENSE_ROWS = 4096
+
+
+def l2_normalize(x, axis: int = -1) -> np.ndarray:
+    x = np.asarray(x, dtype=float)
+    norms = np.linalg.norm(x, axis=axis, keepdims=True)
+    return x / np.maximum(norms, 1e-12)
+
+
+def logsumexp(x, axis: int = -1) -> np.ndarray:
+    x_max = np.max(x, axis=axis, keepdims=True)
+    result = np.log(np.exp(x - x_max).sum(axis=axis, keepdims=True)) + x_max
+    return np.squeeze(result, axis=axis)
+
+
+def log_softmax(x, axis: int = -1) -> np.ndarray:
+    x = np.asarray(x, dtype=float)
+    return x - np.expand_dims(logsumexp(x, axis), axis)
+
+
+def softmax(x, axis: int = -1) -> np.ndarray:
+    return np.exp(log_softmax(x, axis))
+
+
+@dataclass
+class ContrastiveScores:
+    """
+    Per-pair terms of the CLIP loss and their means.  The (N, N) matrices are
+    only filled in for batches small enough to be computed densely; the
+    ``*_block`` and ``pooled_*`` methods work for every batch.
+    """
+    temperature: float
+    image_embeddings: np.ndarray        # (N, D) L2-normalized
+    text_embeddings: np.ndarray         # (N, D) L2-normalized
+    matched_logits: np.ndarray          # (N,) logits[i, i]
+    row_logsumexp: np.ndarray           # (N,) over texts, for each image
+    col_logsumexp: np.ndarray           # (N,) over images, for each text
+    row_argmax: np.ndarray              # (N,) the text with the largest logit, for each image
+    similarities: np.ndarray | None = None
+    logits: np.ndarray | None = None
+
+    def __len__(self) -> int:
+        return len(self.matched_logits)
+
+    @property
+    def image_losses(self) -> np.ndarray:
+        """-log P(text i | image i) for every image."""
+        return self.row_logsumexp - self.matched_logits
+
+    @property
+    def text_losses(self) -> np.ndarray:
+        """-log P(image j | text j) for every text."""
+        return self.col_logsumexp - self.matched_logits
+
+    @property
+    def loss_image(self) -> float:
+        return float(self.image_losses.mean())
+
+    @property
+    def loss_text(self) -> float:
+        return float(self.text_losses.mean())
+
+    @property
+    def loss_clip(self) -> float:
+        return 0.5 * (self.loss_image + self.loss_text)
+
+    @property
+    def image_log_probs(self) -> np.ndarray:
+        """Row-wise log softmax: log P(text j | image i)."""
+        return self.image_log_probs_block()
+
+    @property
+    def text_log_probs(self) -> np.ndarray:
+        """Column-wise log softmax: log P(image i | text j)."""
+        return self.text_log_probs_block()
+
+    @property
+    def image_accuracy(self) -> float:
+        """Fraction of images whose own text has the largest logit."""
+        return float(np.mean(self.row_argmax == np.arange(len(self))))
+
+    def logit_block(self, rows=None, cols=None) -> np.ndarray:
+        """
+        logits[rows][:, cols], sliced from the dense matrix when there is one
+        and recomputed from the embeddings otherwise.  Asking a streamed batch
+        for the whole matrix is an error: pool it or take a block instead.
+        """
+        rows = np.arange(len(self)) if rows is None else np.asarray(rows)
+        cols = np.arange(len(self)) if cols is None else np.asarray(cols)
+        if self.logits is not None:
+            return self.logits[np.ix_(rows, cols)]
+        if rows.size * cols.size > MAX_DENSE_ROWS ** 2:
+            raise ValueError(
+                f"a {rows.size} x {cols.size} block of a streamed batch of {len(self)} pairs is too large "
+                f"to hold; take a smaller block or use pooled_logits / pooled_image_probs"
+            )
+        return (self.image_embeddings[rows] @ self.text_embeddings[cols].T) / self.temperature
+
+    def image_log_probs_block(self, rows=None, cols=None) -> np.ndarray:
+        """log P(text j | image i) for ``rows`` x ``cols``, normalized over all N texts."""
+        rows = np.arange(len(self)) if rows is None else np.asarray(rows)
+        return self.logit_block(rows, cols) - self.row_logsumexp[rows, None]
+
+    def text_log_probs_block(self, rows=None, cols=None) -> np.ndarray:
+        """log P(image i | text j) for ``rows`` x ``cols``, normalized over all N images."""
+        cols = np.arange(len(self)) if cols is None else np.asarray(cols)
+        return self.logit_block(rows, cols) - self.col_logsumexp[None, cols]
+
+    def pooled_logits(self, size: int, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> np.ndarray:
+        """
+        The logits averaged over a (size, size) grid of near-equal blocks of
+        consecutive rows and columns; exactly the logits when ``size >= N``.
+        """
+        return self.pool(size, chunk_rows, probs=False)
+
+    def pooled_image_probs(self, size: int, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> np.ndarray:
+        """
+        (size, size) P(text in column block | image), averaged over the images
+        in each row block, so every row still sums to 1; exactly
+        exp(image_log_probs) when ``size >= N``.
+        """
+        return self.pool(size, chunk_rows, probs=True)
+
+    def pool(self, size: int, chunk_rows: int, probs: bool) -> np.ndarray:
+        n = len(self)
+        size = min(size, n)
+        edges = np.linspace(0, n, size + 1).astype(int)
+        counts = np.diff(edges)
+        row_group = np.repeat(np.arange(size), counts)
+        img32 = (self.image_embeddings / self.temperature).astype(np.float32)
+        txt32 = self.text_embeddings.astype(np.float32)
+        result = np.zeros((size, size))
+        for start in range(0, n, chunk_rows):
+            block = img32[start:start + chunk_rows] @ txt32.T
+            if probs:
+                block = np.exp(block - self.row_logsumexp[start:start + len(block), None].astype(np.float32))
+            col_sums = np.add.reduceat(block, edges[:-1], axis=1, dtype=float)
+            if not probs:
+                col_sums /= counts
+            np.add.at(result, row_group[start:start + len(block)], col_sums)
+        return result / counts[:, None]
+
+
+def contrastive_scores(
+    image_embeddings,
+    text_embeddings,
+    temperature: float = DEFAULT_TEMPERATURE,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    max_dense_rows: int = MAX_DENSE_ROWS,
+) -> ContrastiveScores:
+    img = l2_normalize(image_embeddings)
+    txt = l2_normalize(text_embeddings)
+    if img.shape != txt.shape:
+        raise ValueError(f"image and text embeddings must match, got {img.shape} and {txt.shape}")
+    matched = np.einsum("ij,ij->i", img, txt) / temperature
+
+    if len(img) <= max_dense_rows:
+        similarities = img @ txt.T
+        logits = similarities / temperature
+        return ContrastiveScores(
+            temperature=temperature,
+            image_embeddings=img,
+            text_embeddings=txt,
+            matched_logits=matched,
+            row_logsumexp=logsumexp(logits, axis=1),
+            col_logsumexp=logsumexp(logits, axis=0),
+            row_argmax=logits.argmax(axis=1),
+            similarities=similarities,
+            logits=logits,
+        )
+
+    # Stream row blocks of logits, keeping a running max and rescaled sum per column
+    img32 = (img / temperature).astype(np.float32)
+    txt32 = txt.astype(np.float32)
+    n = len(img)
+    row_lse = np.empty(n)
+    row_argmax = np.empty(n, dtype=int)
+    col_max = np.full(n, -np.inf)
+    col_sum = np.zeros(n)
+    for start in range(0, n, chunk_rows):
+        block = img32[start:start + chunk_rows] @ txt32.T
+        row_lse[start:start + len(block)] = logsumexp(block, axis=1)
+        row_argmax[start:start + len(block)] = block.argmax(axis=1)
+        block_max = block.max(axis=0).astype(float)
+        new_max = np.maximum(col_max, block_max)
+        col_sum = col_sum * np.exp(col_max - new_max)
+        col_sum += np.exp(block - new_max.astype(np.float32)).sum(axis=0, dtype=float)
+        col_max = new_max
+    return ContrastiveScores(
+        temperature=temperature,
+        image_embeddings=img,
+        text_embeddings=txt,
+        matched_logits=matched,
+        row_logsumexp=row_lse,
+        col_logsumexp=np.log(col_sum) + col_max,
+        row_argmax=row_argmax,
+    )
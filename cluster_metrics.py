@@ -0,0 +1,297 @@
+"""
+Classification metrics for labeled embedding clusters.
+
+Points are classified by a vectorized nearest-centroid or k-nearest-neighbor
+rule, in chunks, so memory stays bounded by the chunk size rather than by
+points x classes (or points x points).  Confusion counts are accumulated
+chunk by chunk with one ``np.bincount`` each, and everything else derives
+from them:
+
+    counts = knn_confusion(points, labels, n_classes, k=9)   # (n, n) ints
+    rates = row_rates(counts)           # rates[i, j] = P(pred = j | true = i)
+    per_class_recall(counts)            # the diagonal of ``rates``
+    attractor_columns(rates)            # classes that absorb other classes' points
+
+``StreamingKNNConfusion`` keeps the same kNN counts up to date while points
+and classes keep arriving, at a cost proportional to each batch:
+
+    metrics = StreamingKNNConfusion(k=9)
+    metrics.add_points(points, labels)
+    changed = metrics.add_points(new_points, new_labels)   # classes whose rows moved
+    metrics.recall
+
+The kNN rule is leave-one-out when classifying the labeled points
+themselves, which is what exposes a dense class crowding out its
+neighbors' points.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from spatial_index import SpatialIndex
+
+
+# Upper bound on the elements of any per-chunk distance or vote array
+CHUNK_ELEMENTS = 2 ** 22
+
+
+def class_centroids(points, labels, n_classes: int) -> np.ndarray:
+    """(n_classes, dim) mean of each class's points (zero for empty classes)."""
+    points = np.asarray(points, dtype=float)
+    sizes = np.bincount(labels, minlength=n_classes)
+    sums = np.stack([
+        np.bincount(labels, weights=points[:, d], minlength=n_classes)
+        for d in range(points.shape[1])
+    ], axis=1)
+    return sums / np.maximum(sizes, 1)[:, None]
+
+
+def nearest_centroid_predict(points, centroids, chunk_size: int | None = None) -> np.ndarray:
+    """Index of the nearest centroid to every point."""
+    points = np.asarray(points, dtype=float)
+    centroids = np.asarray(centroids, dtype=float)
+    if centroids.shape[1] in (2, 3) and chunk_size is None:
+        # Low-dimensional layouts: one tree query instead of every distance
+        ids, _ = SpatialIndex(centroids).knn(points, 1)
+        return ids.reshape(-1)
+    if chunk_size is None:
+        chunk_size = max(1, CHUNK_ELEMENTS // len(centroids))
+    # |p - c|^2 up to the |p|^2 term, which does not change the argmin
+    centroid_norms = (centroids ** 2).sum(axis=1)
+    result = np.empty(len(points), dtype=int)
+    for start in range(0, len(points), chunk_size):
+        chunk = points[start:start + chunk_size]
+        result[start:start + chunk_size] = np.argmin(centroid_norms - 2 * chunk @ centroids.T, axis=1)
+    return result
+
+
+def majority_vote(votes: np.ndarray) -> np.ndarray:
+    """
+    Most common label in each row of (N, k) votes, nearest first; ties go to
+    the nearest.  Negative votes are missing neighbors and never win.
+    """
+    counts = (votes[:, :, None] == votes[:, None, :]).sum(axis=2)
+    counts[votes < 0] = 0
+    return votes[np.arange(len(votes)), counts.argmax(axis=1)]
+
+
+def knn_predict(
+    points,
+    labels,
+    k: int = 9,
+    queries=None,
+    index: SpatialIndex | None = None,
+    chunk_size: int | None = None,
+) -> np.ndarray:
+    """
+    Majority label among the ``k`` nearest labeled ``points`` of each query.
+    Without ``queries``, every labeled point is classified by its ``k``
+    nearest others.
+    """
+    labels = np.asarray(labels)
+    index = index or SpatialIndex(points)
+    n_queries = len(index) if queries is None else len(queries)
+    if chunk_size is None:
+        chunk_size = max(1, CHUNK_ELEMENTS // (k * k))
+    result = np.empty(n_queries, dtype=labels.dtype)
+    for start in range(0, n_queries, chunk_size):
+        stop = min(start + chunk_size, n_queries)
+        if queries is None:
+            ids = index.neighbors_of(np.arange(start, stop), k)
+        else:
+            ids, _ = index.knn(queries[start:stop], k)
+        result[start:stop] = majority_vote(labels[ids.reshape(stop - start, -1)])
+    return result
+
+
+def confusion_counts(true_labels, pred_labels, n_classes: int) -> np.ndarray:
+    """(n_classes, n_classes) counts of (true, predicted) pairs."""
+    pairs = np.asarray(true_labels) * n_classes + np.asarray(pred_labels)
+    return np.bincount(pairs, minlength=n_classes * n_classes).reshape(n_classes, n_classes)
+
+
+def nearest_centroid_confusion(points, labels, n_classes: int, chunk_size: int | None = None) -> np.ndarray:
+    """Confusion counts of classifying ``points`` by their classes' centroids."""
+    centroids = class_centroids(points, labels, n_classes)
+    present = np.flatnonzero(np.bincount(labels, minlength=n_classes))
+    pred = present[nearest_centroid_predict(points, centroids[present], chunk_size)]
+    return confusion_counts(labels, pred, n_classes)
+
+
+def knn_confusion(points, labels, n_classes: int, k: int = 9, chunk_size: int | None = None) -> np.ndarray:
+    """Confusion counts of leave-one-out kNN over the labeled ``points``."""
+    return confusion_counts(labels, knn_predict(points, labels, k, chunk_size=chunk_size), n_classes)
+
+
+def row_rates(counts) -> np.ndarray:
+    """``counts`` normalized per true class: P(pred = j | true = i), zero for empty rows."""
+    counts = np.asarray(counts, dtype=float)
+    return counts / np.maximum(counts.sum(axis=1, keepdims=True), 1)
+
+
+def per_class_recall(counts) -> np.ndarray:
+    return np.diagonal(row_rates(counts)).copy()
+
+
+def column_inflow(rates) -> np.ndarray:
+    """Total share of other classes' points that each class absorbs."""
+    rates = np.asarray(rates, dtype=float)
+    return rates.sum(axis=0) - np.diagonal(rates)
+
+
+def attractor_columns(rates, factor: float = 3.0) -> np.ndarray:
+    """
+    Classes whose inflow is over ``factor`` times the median class's,
+    strongest first.
+    """
+    inflow = column_inflow(rates)
+    threshold = factor * np.median(inflow)
+    candidates = np.flatnonzero((inflow > threshold) & (inflow > 0))
+    return candidates[np.argsort(-inflow[candidates])]
+
+
+def victims_of(rates, column: int) -> np.ndarray:
+    """Classes that lose more of their points to ``column`` than to any other wrong class."""
+    rates = np.array(rates, dtype=float)
+    np.fill_diagonal(rates, -1)
+    worst = rates.argmax(axis=1)
+    return np.flatnonzero((worst == column) & (rates[:, column] > 0))
+
+
+class StreamingKNNConfusion(object):
+    """
+    Leave-one-out kNN confusion counts over labeled points that keep
+    arriving.  ``add_points`` classifies the new points and reclassifies
+    only the old ones that gain a new point among their ``k`` nearest, so
+    an update costs time in proportion to the batch and the points around
+    it, not to everything added before.  Labels beyond ``n_classes`` add
+    classes as they appear.
+
+    The points live in a few KD-trees of doubling sizes (a new batch gets
+    its own tree, merged with the previous one once it is as large), so
+    rebuilding is amortized to O(log N) per point.
+    """
+
+    def __init__(self, k: int = 9, n_classes: int = 0, dim: int = 2):
+        self.k = k
+        self.size = 0
+        self._points = np.zeros((0, dim))
+        self._labels = np.zeros(0, dtype=int)
+        self._predictions = np.zeros(0, dtype=int)
+        self._radii = np.zeros(0)
+        self.blocks: list[tuple[int, SpatialIndex]] = []
+        self.counts = np.zeros((n_classes, n_classes), dtype=int)
+
+    @property
+    def n_classes(self) -> int:
+        return len(self.counts)
+
+    @property
+    def points(self) -> np.ndarray:
+        return self._points[:self.size]
+
+    @property
+    def labels(self) -> np.ndarray:
+        return self._labels[:self.size]
+
+    @property
+    def predictions(self) -> np.ndarray:
+        """Each point's kNN prediction, -1 while it has no neighbors."""
+        return self._predictions[:self.size]
+
+    @property
+    def rates(self) -> np.ndarray:
+        return row_rates(self.counts)
+
+    @property
+    def recall(self) -> np.ndarray:
+        return per_class_recall(self.counts)
+
+    def add_points(self, points, labels) -> np.ndarray:
+        """Add a labeled batch and update the counts; returns the classes whose rows changed."""
+        points = np.asarray(points, dtype=float).reshape(-1, self._points.shape[1])
+        labels = np.asarray(labels, dtype=int).reshape(-1)
+        if len(points) == 0:
+            return np.zeros(0, dtype=int)
+        n_old = self.size
+        self.grow_classes(labels.max() + 1)
+        affected = self.find_affected(points)
+        self.append(points, labels)
+
+        # Reclassify the old points a new one displaced, then classify the batch
+        indices = np.concatenate([affected, np.arange(n_old, self.size)])
+        self.count(indices, -1)
+        neighbor_ids, neighbor_dists = self.knn(indices)
+        votes = np.where(np.isfinite(neighbor_dists), self._labels[neighbor_ids], -1)
+        self._predictions[indices] = majority_vote(votes) if votes.shape[1] else -1
+        self._radii[indices] = neighbor_dists[:, -1] if neighbor_dists.shape[1] == self.k else np.inf
+        self.count(indices, +1)
+        return np.unique(self._labels[indices])
+
+    def grow_classes(self, n_classes: int) -> None:
+        if n_classes > self.n_classes:
+            counts = np.zeros((n_classes, n_classes), dtype=int)
+            counts[:self.n_classes, :self.n_classes] = self.counts
+            self.counts = counts
+
+    def count(self, indices: np.ndarray, sign: int) -> None:
+        """Add (or remove) the (true, predicted) pairs of the given points."""
+        preds = self._predictions[indices]
+        known = preds >= 0
+        pairs = self._labels[indices][known] * self.n_classes + preds[known]
+        self.counts += sign * np.bincount(pairs, minlength=self.n_classes ** 2).reshape(self.counts.shape)
+
+    def find_affected(self, new_points: np.ndarray) -> np.ndarray:
+        """Old points with one of ``new_points`` closer than their current k-th neighbor."""
+        if self.size == 0:
+            return np.zeros(0, dtype=int)
+        affected = []
+        for offset, index in self.blocks:
+            radii = self._radii[offset:offset + len(index)]
+            unbounded = ~np.isfinite(radii)
+            affected.append(np.flatnonzero(unbounded) + offset)
+            if unbounded.all():
+                continue
+            # Everything in reach of the widest radius, then each point's own
+            balls = index.within_radius(new_points, radii[~unbounded].max())
+            ids = np.concatenate(balls) + offset
+            sources = np.repeat(np.arange(len(new_points)), [len(ball) for ball in balls])
+            dists = np.linalg.norm(self._points[ids] - new_points[sources], axis=1)
+            affected.append(ids[dists < self._radii[ids]])
+        return np.unique(np.concatenate(affected).astype(int))
+
+    def append(self, points: np.ndarray, labels: np.ndarray) -> None:
+        n_new = len(points)
+        if self.size + n_new > len(self._points):
+            capacity = max(2 * len(self._points), self.size + n_new)
+            for name in ("_points", "_labels", "_predictions", "_radii"):
+                old = getattr(self, name)
+                new = np.empty((capacity, *old.shape[1:]), dtype=old.dtype)
+                new[:self.size] = old[:self.size]
+                setattr(self, name, new)
+        self._points[self.size:self.size + n_new] = points
+        self._labels[self.size:self.size + n_new] = labels
+        self._predictions[self.size:self.size + n_new] = -1
+        self._radii[self.size:self.size + n_new] = np.inf
+        offset = self.size
+        self.size += n_new
+
+        # Merge trailing trees until each is smaller than the one before it
+        while self.blocks and len(self.blocks[-1][1]) <= self.size - offset:
+            offset = self.blocks.pop()[0]
+        self.blocks.append((offset, SpatialIndex(self._points[offset:self.size])))
+
+    def knn(self, indices: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """(M, <= k) ids and distances of each indexed point's nearest others, nearest first."""
+        queries = self._points[indices]
+        ids, dists = [], []
+        for offset, index in self.blocks:
+            block_ids, block_dists = index.knn(queries, self.k + 1)
+            ids.append(block_ids.reshape(len(queries), -1) + offset)
+            dists.append(block_dists.reshape(len(queries), -1))
+        ids = np.hstack(ids)
+        dists = np.where(ids == indices[:, None], np.inf, np.hstack(dists))
+        n_neighbors = min(self.k, self.size - 1)
+        order = np.argsort(dists, axis=1, kind="stable")[:, :n_neighbors]
+        return np.take_along_axis(ids, order, axis=1), np.take_along_axis(dists, order, axis=1)
+
@@ -0,0 +1,196 @@
+"""
+Decision boundaries of any classifier, extracted from a dense grid.
+
+The classifier is evaluated once, on every node of the grid, as a single
+batched call; a vectorized marching-squares pass then finds where the
+decision value crosses its level, and the crossings are linked into
+polylines.  Nothing assumes the boundary is a function of x: it can fold
+back, split into pieces or enclose islands.
+
+    field = evaluate_grid(lambda p: logit_margin(run.logits(p)), (-1.5, 2.5), (-1.5, 2.0), 512)
+    contour_lines(field)                  # the boundary, as (k, 2) polylines
+    region_loops(field)                   # closed loops around where the margin is positive
+    region_loops(field, above=False)      # ... and around the rest
+
+Every segment is oriented with the higher values on its left, so region
+loops run counterclockwise around their region and clockwise around its
+holes; filled as the subpaths of one ``VMobject`` they shade the region
+exactly.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from itertools import chain
+from typing import Callable
+
+import numpy as np
+
+
+# Cell corners counterclockwise from the bottom left, as (row, column) offsets
+CORNER_ROWS = np.array([0, 0, 1, 1])
+CORNER_COLS = np.array([0, 1, 1, 0])
+# Edge e runs from corner e to corner e + 1; saddle cells with a high
+# center get their own case numbers
+SADDLE_HIGH_CASES = {5: 16, 10: 17}
+
+
+def _segment_table() -> tuple[np.ndarray, np.ndarray]:
+    """(start edge, end edge) of up to two segments per cell case, -1 where unused."""
+    starts = np.full((18, 2), -1)
+    ends = np.full((18, 2), -1)
+    for case in range(16):
+        high = [(case >> k) & 1 for k in range(4)]
+        # Going counterclockwise, a segment starts where the corners go high
+        # to low, which keeps the high side on its left
+        out_edges = [e for e in range(4) if high[e] and not high[(e + 1) % 4]]
+        in_edges = [e for e in range(4) if not high[e] and high[(e + 1) % 4]]
+        if len(out_edges) == 1:
+            starts[case, 0], ends[case, 0] = out_edges[0], in_edges[0]
+    # Saddles: a low center cuts off the high corners, a high one the low corners
+    starts[5], ends[5] = (0, 2), (3, 1)
+    starts[16], ends[16] = (0, 2), (1, 3)
+    starts[10], ends[10] = (1, 3), (0, 2)
+    starts[17], ends[17] = (1, 3), (2, 0)
+    return starts, ends
+
+
+SEGMENT_STARTS, SEGMENT_ENDS = _segment_table()
+
+
+@dataclass
+class GridField:
+    xs: np.ndarray      # (nx,)
+    ys: np.ndarray      # (ny,)
+    values: np.ndarray  # (ny, nx), values[i, j] at (xs[j], ys[i])
+
+
+def evaluate_grid(
+    func: Callable[[np.ndarray], np.ndarray],
+    x_range: tuple[float, float],
+    y_range: tuple[float, float],
+    resolution: int | tuple[int, int] = 256,
+) -> GridField:
+    """``func`` of an (N, 2) array of points, evaluated on every grid node in one call."""
+    nx, ny = (resolution, resolution) if np.isscalar(resolution) else resolution
+    xs = np.linspace(*x_range, nx)
+    ys = np.linspace(*y_range, ny)
+    xx, yy = np.meshgrid(xs, ys)
+    values = np.asarray(func(np.stack([xx.ravel(), yy.ravel()], axis=1)), dtype=float)
+    return GridField(xs, ys, values.reshape(ny, nx))
+
+
+def logit_margin(logits: np.ndarray, positive: int = 0) -> np.ndarray:
+    """How far class ``positive``'s logit leads the best other class; zero on its boundary."""
+    others = np.delete(logits, positive, axis=1)
+    return logits[:, positive] - others.max(axis=1)
+
+
+def marching_squares(field: GridField, level: float = 0.0):
+    """
+    Every contour segment of ``field`` at ``level``: its start and end
+    points, (M, 2) each, and the ids of the grid edges they lie on, which
+    neighbouring segments share.
+    """
+    xs, ys, values = field.xs, field.ys, field.values
+    ny, nx = values.shape
+    high = (values > level).astype(np.uint8)
+    cases = high[:-1, :-1] | (high[:-1, 1:] << 1) | (high[1:, 1:] << 2) | (high[1:, :-1] << 3)
+    center_high = (values[:-1, :-1] + values[:-1, 1:] + values[1:, 1:] + values[1:, :-1]) > 4 * level
+    for case, high_case in SADDLE_HIGH_CASES.items():
+        cases[(cases == case) & center_high] = high_case
+
+    rows, cols = np.nonzero((cases != 0) & (cases != 15))
+    cell_cases = cases[rows, cols]
+    start_edges = SEGMENT_STARTS[cell_cases].ravel()
+    end_edges = SEGMENT_ENDS[cell_cases].ravel()
+    rows = np.repeat(rows, 2)
+    cols = np.repeat(cols, 2)
+    used = start_edges >= 0
+    rows, cols, start_edges, end_edges = rows[used], cols[used], start_edges[used], end_edges[used]
+
+    def crossings(edges):
+        r0 = rows + CORNER_ROWS[edges]
+        c0 = cols + CORNER_COLS[edges]
+        r1 = rows + CORNER_ROWS[(edges + 1) % 4]
+        c1 = cols + CORNER_COLS[(edges + 1) % 4]
+        v0, v1 = values[r0, c0], values[r1, c1]
+        t = (level - v0) / (v1 - v0)
+        points = np.stack([
+            xs[c0] + t * (xs[c1] - xs[c0]),
+            ys[r0] + t * (ys[r1] - ys[r0]),
+        ], axis=1)
+        # Horizontal edges first, then vertical ones
+        ids = np.where(
+            r0 == r1,
+            r0 * (nx - 1) + np.minimum(c0, c1),
+            ny * (nx - 1) + np.minimum(r0, r1) * nx + c0,
+        )
+        return points, ids
+
+    starts, start_ids = crossings(start_edges)
+    ends, end_ids = crossings(end_edges)
+    return starts, ends, start_ids, end_ids
+
+
+def link_segments(starts, ends, start_ids, end_ids, min_step: float = 0.0) -> list[np.ndarray]:
+    """
+    Chain oriented segments into polylines; closed ones repeat their first
+    point at the end.  Interior points within ``min_step`` of the one before
+    are dropped.
+    """
+    n = len(start_ids)
+    if n == 0:
+        return []
+    order = np.argsort(start_ids)
+    pos = np.minimum(np.searchsorted(start_ids[order], end_ids), n - 1)
+    following = np.where(start_ids[order[pos]] == end_ids, order[pos], -1)
+    has_previous = np.zeros(n, dtype=bool)
+    has_previous[following[following >= 0]] = True
+
+    following = following.tolist()
+    visited = [False] * n
+    polylines = []
+    # Open chains from their first segment, then whatever loops are left
+    for first in chain(np.flatnonzero(~has_previous).tolist(), range(n)):
+        if visited[first]:
+            continue
+        indices = []
+        seg = first
+        while seg >= 0 and not visited[seg]:
+            visited[seg] = True
+            indices.append(seg)
+            seg = following[seg]
+        path = np.vstack([starts[indices], ends[indices[-1]]])
+        # Near-zero steps, from contours grazing a grid node (or the
+        # coincident corners of a padded border), only make kinks
+        steps = np.linalg.norm(path[1:] - path[:-1], axis=1)
+        keep = np.ones(len(path), dtype=bool)
+        keep[1:-1] = steps[:-1] > min_step
+        if len(path) > 1 and steps[-1] == 0:
+            keep[-1] = False
+        if keep.sum() > 1:
+            polylines.append(path[keep])
+    return polylines
+
+
+def contour_lines(field: GridField, level: float = 0.0) -> list[np.ndarray]:
+    """Polylines, (k, 2) each, along which ``field`` equals ``level``."""
+    cell_size = min(np.abs(np.diff(field.xs)).max(), np.abs(np.diff(field.ys)).max())
+    return link_segments(*marching_squares(field, level), min_step=0.05 * cell_size)
+
+
+def region_loops(field: GridField, level: float = 0.0, above: bool = True) -> list[np.ndarray]:
+    """
+    Closed polylines bounding the part of the grid where ``field`` is above
+    ``level`` (or at most ``level``), clipped to the grid's extent.
+    """
+    values = field.values if above else -field.values
+    level = level if above else -level
+    # A border of low nodes at the grid's own edge coordinates closes every
+    # contour along the edge of the grid
+    padded = GridField(
+        xs=np.pad(field.xs, 1, mode="edge"),
+        ys=np.pad(field.ys, 1, mode="edge"),
+        values=np.pad(values, 1, constant_values=min(values.min(), level) - 1),
+    )
+    return contour_lines(padded, level)
@@ -0,0 +1,288 @@
+"""
+Memory-mapped embedding datasets shared by the embedding scenes.
+
+An embedding set is an (N, D) matrix plus optional per-row metadata: integer
+``labels`` (named by ``label_names``) and ``image_paths``.  Either layout
+works:
+
+    clip_val.npz        one uncompressed archive (np.savez) with "embeddings"
+                        and any of "labels", "label_names", "image_paths"
+    clip_val.npy        just the matrix, with the metadata optionally in
+    clip_val.meta.npz   a sidecar archive next to it
+
+Every array is memory mapped, so opening 100k x 768 float32 rows reads
+nothing until rows are used, subsets are index views rather than copies,
+and ``iter_chunks`` streams rows a block at a time.
+
+    data = EmbeddingDataset.open("data/clip_val.npz")
+    sub = data.sample(5000, seed=0)           # no rows read yet
+    for start, rows in sub.iter_chunks():
+        ...
+
+Scenes call ``load_scene_embeddings(fallback)``: it opens ``$CLIP_EMBEDDINGS``
+when set and otherwise builds the scene's synthetic stand-in.
+"""
+from __future__ import annotations
+
+import os
+import struct
+import zipfile
+from pathlib import Path
+
+import numpy as np
+
+from manimlib.logger import log
+
+
+DEFAULT_CHUNK_ROWS = 8192
+META_SUFFIX = ".meta.npz"
+META_KEYS = ("labels", "label_names", "image_paths")
+
+
+def memmap_npy(path, offset: int = 0) -> np.ndarray:
+    """Memory map a .npy payload starting at ``offset`` bytes into ``path``."""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        data_offset = f.tell()
+    if dtype.hasobject:
+        raise ValueError(f"{path} holds Python objects and cannot be memory mapped")
+    return np.memmap(
+        path, dtype=dtype, mode="r", shape=shape,
+        order="F" if fortran_order else "C", offset=data_offset,
+    )
+
+
+def open_npz(path) -> dict[str, np.ndarray]:
+    """
+    Memory map every stored (uncompressed) member of an .npz archive;
+    compressed members are loaded into memory with a warning.
+    """
+    arrays = dict()
+    with zipfile.ZipFile(path) as zf:
+        infos = zf.infolist()
+    with open(path, "rb") as f:
+        for info in infos:
+            name = info.filename.removesuffix(".npy")
+            if info.compress_type == zipfile.ZIP_STORED:
+                # Member data follows its 30 byte local header, file name and extra field
+                f.seek(info.header_offset + 26)
+                name_len, extra_len = struct.unpack("<HH", f.read(4))
+                offset = info.header_offset + 30 + name_len + extra_len
+                try:
+                    arrays[name] = memmap_npy(path, offset)
+                    continue
+                except ValueError:
+                    pass
+            else:
+                log.warning("%s: %s is compressed, loading it into memory", path, name)
+            with np.load(path, allow_pickle=False) as npz:
+                arrays[name] = npz[name]
+    return arrays
+
+
+class EmbeddingDataset(object):
+    """
+    Rows of an embedding matrix and their metadata, possibly restricted to a
+    subset.  The subset is kept as a slice (a true view of the map) or an
+    index array, and rows are only read by ``get_embeddings``,
+    ``iter_chunks`` or ``to_array``.
+    """
+
+    def __init__(
+        self,
+        embeddings: np.ndarray,
+        labels: np.ndarray | None = None,
+        label_names=None,
+        image_paths: np.ndarray | None = None,
+        indices: slice | np.ndarray | None = None,
+        source: str | None = None,
+    ):
+        self.base_embeddings = embeddings
+        self.base_labels = labels
+        self.base_image_paths = image_paths
+        self.label_names = [str(name) for name in label_names] if label_names is not None else None
+        self.indices = slice(None) if indices is None else indices
+        self.source = source
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+    @classmethod
+    def open(cls, path) -> EmbeddingDataset:
+        path = Path(path)
+        if path.suffix == ".npz":
+            arrays = open_npz(path)
+            embeddings = arrays.pop("embeddings")
+        else:
+            embeddings = memmap_npy(path)
+            meta_path = path.with_suffix(META_SUFFIX)
+            arrays = open_npz(meta_path) if meta_path.exists() else dict()
+        if embeddings.ndim != 2:
+            raise ValueError(f"{path}: expected an (N, D) embedding matrix, got shape {embeddings.shape}")
+        for key in ("labels", "image_paths"):
+            if key in arrays and len(arrays[key]) != len(embeddings):
+                raise ValueError(f"{path}: {key} has {len(arrays[key])} rows, embeddings have {len(embeddings)}")
+        return cls(
+            embeddings,
+            labels=arrays.get("labels"),
+            label_names=arrays.get("label_names"),
+            image_paths=arrays.get("image_paths"),
+            source=str(path),
+        )
+
+    @classmethod
+    def from_arrays(cls, embeddings, labels=None, label_names=None, image_paths=None) -> EmbeddingDataset:
+        return cls(
+            np.asarray(embeddings),
+            labels=None if labels is None else np.asarray(labels),
+            label_names=label_names,
+            image_paths=None if image_paths is None else np.asarray(image_paths, dtype=str),
+        )
+
+    def save(self, path) -> None:
+        """Write this (subset of the) dataset as an uncompressed, mappable .npz."""
+        arrays = dict(embeddings=self.to_array(dtype=self.base_embeddings.dtype))
+        if self.base_labels is not None:
+            arrays["labels"] = self.labels
+        if self.label_names is not None:
+            arrays["label_names"] = np.array(self.label_names, dtype=str)
+        if self.base_image_paths is not None:
+            arrays["image_paths"] = np.asarray(self.image_paths, dtype=str)
+        np.savez(path, **arrays)
+
+    # ------------------------------------------------------------------
+    # Shape and metadata
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        if isinstance(self.indices, slice):
+            return len(range(len(self.base_embeddings))[self.indices])
+        return len(self.indices)
+
+    def __repr__(self) -> str:
+        return f"EmbeddingDataset({len(self)} x {self.dim}, source={self.source})"
+
+    @property
+    def dim(self) -> int:
+        return self.base_embeddings.shape[1]
+
+    @property
+    def labels(self) -> np.ndarray | None:
+        if self.base_labels is None:
+            return None
+        return np.asarray(self.base_labels[self.indices])
+
+    @property
+    def image_paths(self) -> list[str] | None:
+        if self.base_image_paths is None:
+            return None
+        return [str(p) for p in self.base_image_paths[self.indices]]
+
+    def get_label_name(self, label: int) -> str:
+        return self.label_names[label] if self.label_names else str(label)
+
+    # ------------------------------------------------------------------
+    # Subsets (no rows are read)
+    # ------------------------------------------------------------------
+    def get_base_indices(self) -> np.ndarray:
+        return np.arange(len(self.base_embeddings))[self.indices]
+
+    def subset(self, indices) -> EmbeddingDataset:
+        """Rows ``indices`` of this dataset (a slice, index array or boolean mask)."""
+        if isinstance(indices, slice) and isinstance(self.indices, slice):
+            rows = range(len(self.base_embeddings))[self.indices][indices]
+            # A negative stop from range slicing means "run to the start"
+            new_indices = slice(rows.start, rows.stop if rows.stop >= 0 else None, rows.step)
+        else:
+            indices = np.asarray(indices)
+            if indices.dtype == bool:
+                indices = np.flatnonzero(indices)
+            new_indices = self.get_base_indices()[indices]
+        return EmbeddingDataset(
+            self.base_embeddings,
+            labels=self.base_labels,
+            label_names=self.label_names,
+            image_paths=self.base_image_paths,
+            indices=new_indices,
+            source=self.source,
+        )
+
+    def sample(self, n: int, seed: int = 0) -> EmbeddingDataset:
+        """n random rows, kept in file order so reads stay sequential."""
+        if n >= len(self):
+            return self
+        rng = np.random.default_rng(seed)
+        return self.subset(np.sort(rng.choice(len(self), size=n, replace=False)))
+
+    def where_label(self, *labels: int) -> EmbeddingDataset:
+        return self.subset(np.isin(self.labels, labels))
+
+    # ------------------------------------------------------------------
+    # Reading rows
+    # ------------------------------------------------------------------
+    def get_embeddings(self) -> np.ndarray:
+        """
+        The selected rows; a read-only view of the map for slice subsets,
+        a copy of just those rows for index subsets.
+        """
+        return self.base_embeddings[self.indices]
+
+    def iter_chunks(self, chunk_rows: int = DEFAULT_CHUNK_ROWS, dtype=np.float32):
+        """Yield (start_row, rows) blocks of at most ``chunk_rows`` rows."""
+        if isinstance(self.indices, slice):
+            view = self.base_embeddings[self.indices]
+            for start in range(0, len(view), chunk_rows):
+                yield start, np.asarray(view[start:start + chunk_rows], dtype=dtype)
+        else:
+            for start in range(0, len(self.indices), chunk_rows):
+                rows = self.indices[start:start + chunk_rows]
+                yield start, np.asarray(self.base_embeddings[rows], dtype=dtype)
+
+    def to_array(self, dtype=np.float32) -> np.ndarray:
+        out = np.empty((len(self), self.dim), dtype=dtype)
+        for start, rows in self.iter_chunks(dtype=dtype):
+            out[start:start + len(rows)] = rows
+        return out
+
+    def project(self, n_components: int, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> np.ndarray:
+        """
+        (N, n_components) PCA coordinates, computed with a streamed covariance
+        so only one chunk of rows is in memory at a time.  Data with at most
+        ``n_components`` dimensions is returned as is (zero padded).
+        """
+        if self.dim <= n_components:
+            out = np.zeros((len(self), n_components))
+            out[:, :self.dim] = self.to_array(dtype=float)
+            return out
+
+        total = np.zeros(self.dim)
+        gram = np.zeros((self.dim, self.dim))
+        for _, rows in self.iter_chunks(chunk_rows, dtype=np.float64):
+            total += rows.sum(axis=0)
+            gram += rows.T @ rows
+        mean = total / len(self)
+        cov = gram / len(self) - np.outer(mean, mean)
+        eigvals, eigvecs = np.linalg.eigh(cov)
+        components = eigvecs[:, ::-1][:, :n_components]
+
+        out = np.empty((len(self), n_components))
+        for start, rows in self.iter_chunks(chunk_rows, dtype=np.float64):
+            out[start:start + len(rows)] = (rows - mean) @ components
+        return out
+
+
+def load_scene_embeddings(fallback) -> EmbeddingDataset:
+    """
+    The dataset named by ``$CLIP_EMBEDDINGS``, or ``fallback()`` (the scene's
+    synthetic data) when it is not set.
+    """
+    path = os.environ.get("CLIP_EMBEDDINGS")
+    if not path:
+        return fallback()
+    data = EmbeddingDataset.open(path)
+    log.info("Using %s", data)
+    return data
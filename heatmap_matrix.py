@@ -0,0 +1,330 @@
+"""
+Matrix heatmaps drawn from a NumPy texture.
+
+A grid of ``RoundedRectangle`` cells with a ``Tex`` in each is O(N^2) mobjects,
+so anything past a handful of rows is unusable.  ``HeatmapMatrix`` is a single
+quad textured with an (N, M) RGBA array, one texel block per cell: recoloring
+any number of cells is an array write plus one texture upload, and
+``.animate`` interpolates the cell colors, so a whole row, column or the whole
+matrix changes in one animation.
+
+    heatmap = HeatmapMatrix(logits, width=5, colors=[BLUE_E, YELLOW_C])
+    self.play(FadeIn(heatmap))
+    self.play(heatmap.animate.set_values(probs, vmin=0, vmax=1))        # whole matrix
+    self.play(heatmap.animate.set_cell_opacity(0.2, rows=[3]))          # one row
+    self.play(heatmap.animate.set_cell_colors(YELLOW, cols=[5]))        # one column
+    labels = heatmap.get_value_labels()    # empty unless the cells are big enough to read
+"""
+from __future__ import annotations
+
+import moderngl
+import numpy as np
+
+from manimlib import BLUE_E
+from manimlib import DL
+from manimlib import DR
+from manimlib import UL
+from manimlib import UR
+from manimlib import Mobject
+from manimlib import Rectangle
+from manimlib import VGroup
+from manimlib import WHITE
+from manimlib import YELLOW_C
+from manimlib.shader_wrapper import ShaderWrapper
+from manimlib.utils.color import color_to_rgb
+from manimlib.utils.iterables import listify
+from manimlib.utils.iterables import resize_with_interpolation
+
+from point_cloud import colors_to_rgb
+from number_label import NumberLabel
+
+
+MAX_PIXELS_PER_CELL = 16
+MIN_LABEL_CELL_SIZE = 0.32
+
+
+def values_to_rgb(values, vmin: float, vmax: float, colors) -> np.ndarray:
+    """Map an array of values onto a piecewise linear gradient through ``colors``."""
+    stops = np.array([color_to_rgb(color) for color in colors])
+    span = vmax - vmin if vmax > vmin else 1.0
+    t = np.clip((np.asarray(values, dtype=float) - vmin) / span, 0, 1) * (len(stops) - 1)
+    low = np.minimum(t.astype(int), len(stops) - 2)
+    frac = (t - low)[..., None]
+    return (1 - frac) * stops[low] + frac * stops[low + 1]
+
+
+class ArrayTextureShaderWrapper(ShaderWrapper):
+    """A ShaderWrapper whose "Texture" comes from an RGBA uint8 array rather than an image file."""
+
+    def __init__(self, ctx: moderngl.Context, pixels: np.ndarray, **kwargs):
+        self.pixels = pixels
+        super().__init__(ctx, **kwargs)
+
+    def init_textures(self):
+        super().init_textures()
+        self.add_texture("Texture", self.create_texture(self.pixels))
+
+    def create_texture(self, pixels: np.ndarray) -> moderngl.Texture:
+        height, width = pixels.shape[:2]
+        texture = self.ctx.texture(size=(width, height), components=4, data=pixels.tobytes())
+        texture.filter = (moderngl.NEAREST, moderngl.NEAREST)
+        return texture
+
+    def refresh_id(self) -> None:
+        super().refresh_id()
+        # Each wrapper owns its texture, so two heatmaps must never be batched together
+        self.id = hash((self.id, id(self)))
+
+    def write_pixels(self, pixels: np.ndarray) -> None:
+        texture = self.textures[self.texture_names_to_ids["Texture"]]
+        if texture.size == pixels.shape[1::-1]:
+            texture.write(pixels.tobytes())
+        else:
+            texture.release()
+            self.textures[self.texture_names_to_ids["Texture"]] = self.create_texture(pixels)
+        self.pixels = pixels
+
+
+class HeatmapMatrix(Mobject):
+    """
+    An (N, M) matrix of colored cells, row 0 at the top.  Cell colors come
+    from ``values`` through a gradient over ``colors`` (or are set directly),
+    each cell also has its own opacity, and ``cell_gap`` (a fraction of the
+    cell size) separates cells while they are large enough to show it.
+    """
+    shader_folder: str = "image"
+    data_dtype = [
+        ('point', np.float32, (3,)),
+        ('im_coords', np.float32, (2,)),
+        ('opacity', np.float32, (1,)),
+    ]
+    render_primitive: int = moderngl.TRIANGLES
+
+    def __init__(
+        self,
+        values,
+        width: float = 4.0,
+        height: float | None = None,
+        colors=(BLUE_E, YELLOW_C),
+        vmin: float | None = None,
+        vmax: float | None = None,
+        cell_gap: float = 0.08,
+        max_texture_size: int = 1024,
+        **kwargs
+    ):
+        values = np.asarray(values, dtype=float)
+        if values.ndim != 2:
+            raise ValueError(f"expected a 2D matrix of values, got shape {values.shape}")
+        self.values = values.copy()
+        self.colors = list(colors)
+        self.vmin = values.min() if vmin is None else vmin
+        self.vmax = values.max() if vmax is None else vmax
+        self.cell_rgba = np.ones((*values.shape, 4))
+        self.cell_rgba[..., :3] = values_to_rgb(values, self.vmin, self.vmax, self.colors)
+
+        n_rows, n_cols = values.shape
+        self.pixels_per_cell = 1
+        self.gap_pixels = 0
+        if cell_gap > 0:
+            self.pixels_per_cell = int(np.clip(max_texture_size // max(n_rows, n_cols), 1, MAX_PIXELS_PER_CELL))
+            if self.pixels_per_cell >= 4:
+                self.gap_pixels = int(round(cell_gap * self.pixels_per_cell))
+
+        self.matrix_width = width
+        self.matrix_height = width * n_rows / n_cols if height is None else height
+        self.texture_needs_update = True
+        super().__init__(**kwargs)
+
+    def init_data(self) -> None:
+        super().init_data(length=6)
+        self.data["point"][:] = [UL, DL, UR, DR, UR, DL]
+        self.data["im_coords"][:] = [(0, 0), (0, 1), (1, 0), (1, 1), (1, 0), (0, 1)]
+        self.data["opacity"][:] = self.opacity
+
+    def init_points(self) -> None:
+        self.set_width(self.matrix_width, stretch=True)
+        self.set_height(self.matrix_height, stretch=True)
+
+    # ------------------------------------------------------------------
+    # Texture
+    # ------------------------------------------------------------------
+    def get_texture_pixels(self) -> np.ndarray:
+        """The cell colors as an RGBA uint8 image, ``pixels_per_cell`` texels per cell side."""
+        rgba = (255 * np.clip(self.cell_rgba, 0, 1)).astype(np.uint8)
+        p = self.pixels_per_cell
+        if p > 1:
+            rgba = rgba.repeat(p, axis=0).repeat(p, axis=1)
+        if self.gap_pixels:
+            k = np.arange(p)
+            lo = self.gap_pixels // 2
+            is_gap = (k < lo) | (k >= p - (self.gap_pixels - lo))
+            gap_rows = np.tile(is_gap, self.values.shape[0])
+            gap_cols = np.tile(is_gap, self.values.shape[1])
+            rgba[gap_rows, :, 3] = 0
+            rgba[:, gap_cols, 3] = 0
+        return np.ascontiguousarray(rgba)
+
+    def refresh_texture(self):
+        self.texture_needs_update = True
+        self.note_changed_data()
+        return self
+
+    def init_shader_wrapper(self, ctx: moderngl.Context):
+        self.shader_wrapper = ArrayTextureShaderWrapper(
+            ctx=ctx,
+            pixels=self.get_texture_pixels(),
+            vert_data=self.data,
+            shader_folder=self.shader_folder,
+            mobject_uniforms=self.uniforms,
+            depth_test=self.depth_test,
+            render_primitive=self.render_primitive,
+            code_replacements=self.shader_code_replacements,
+        )
+        self.texture_needs_update = False
+
+    def get_shader_wrapper(self, ctx: moderngl.Context) -> ShaderWrapper:
+        wrapper = super().get_shader_wrapper(ctx)
+        if self.texture_needs_update:
+            wrapper.write_pixels(self.get_texture_pixels())
+            self.texture_needs_update = False
+        return wrapper
+
+    # ------------------------------------------------------------------
+    # Cells
+    # ------------------------------------------------------------------
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.values.shape
+
+    def cell_mask(self, rows=None, cols=None) -> np.ndarray:
+        """Boolean (N, M) mask of the cells in ``rows`` x ``cols`` (all when None)."""
+        mask = np.zeros(self.shape, dtype=bool)
+        mask[
+            slice(None) if rows is None else np.asarray(listify(rows))[:, None],
+            slice(None) if cols is None else np.asarray(listify(cols)),
+        ] = True
+        return mask
+
+    def get_diagonal_mask(self) -> np.ndarray:
+        return np.eye(*self.shape, dtype=bool)
+
+    def set_values(self, values, vmin=None, vmax=None, rows=None, cols=None, where=None):
+        """
+        Set the values of the selected cells (``rows`` x ``cols``, or the
+        boolean mask ``where``) and recolor just those cells, with the color
+        range changed to ``vmin``/``vmax`` when given.  ``values`` is a full
+        matrix, or anything that broadcasts onto the selection.
+        """
+        if vmin is not None:
+            self.vmin = vmin
+        if vmax is not None:
+            self.vmax = vmax
+        mask = self.cell_mask(rows, cols) if where is None else where
+        values = np.asarray(values, dtype=float)
+        self.values[mask] = values[mask] if values.shape == self.shape else values
+        self.cell_rgba[mask, :3] = values_to_rgb(self.values[mask], self.vmin, self.vmax, self.colors)
+        return self.refresh_texture()
+
+    def set_cell_colors(self, colors, opacity=None, rows=None, cols=None, where=None):
+        mask = self.cell_mask(rows, cols) if where is None else where
+        self.cell_rgba[mask, :3] = colors_to_rgb(colors, int(mask.sum()))
+        if opacity is not None:
+            self.cell_rgba[mask, 3] = opacity
+        return self.refresh_texture()
+
+    def set_cell_opacity(self, opacity, rows=None, cols=None, where=None):
+        mask = self.cell_mask(rows, cols) if where is None else where
+        self.cell_rgba[mask, 3] = opacity
+        return self.refresh_texture()
+
+    @Mobject.affects_data
+    def set_opacity(self, opacity, recurse: bool = True):
+        self.data["opacity"][:, 0] = resize_with_interpolation(
+            np.array(listify(opacity)),
+            self.get_num_points()
+        )
+        return self
+
+    def set_color(self, color, opacity=None, recurse=None):
+        return self
+
+    def interpolate(self, mobject1, mobject2, alpha, *args, **kwargs):
+        super().interpolate(mobject1, mobject2, alpha, *args, **kwargs)
+        if isinstance(mobject1, HeatmapMatrix) and isinstance(mobject2, HeatmapMatrix) \
+                and mobject1.shape == mobject2.shape == self.shape:
+            self.cell_rgba[:] = (1 - alpha) * mobject1.cell_rgba + alpha * mobject2.cell_rgba
+            self.values[:] = (1 - alpha) * mobject1.values + alpha * mobject2.values
+            # The color range is not interpolated; later set_values calls use the target's
+            self.vmin, self.vmax = mobject2.vmin, mobject2.vmax
+            self.refresh_texture()
+        return self
+
+    # ------------------------------------------------------------------
+    # Geometry
+    # ------------------------------------------------------------------
+    def get_cell_size(self) -> tuple[float, float]:
+        n_rows, n_cols = self.shape
+        return self.get_width() / n_cols, self.get_height() / n_rows
+
+    def get_cell_center(self, row: int, col: int) -> np.ndarray:
+        cell_w, cell_h = self.get_cell_size()
+        return self.get_corner(UL) + np.array([(col + 0.5) * cell_w, -(row + 0.5) * cell_h, 0])
+
+    def get_cell_centers(self) -> np.ndarray:
+        """(N, M, 3) centers of every cell."""
+        cell_w, cell_h = self.get_cell_size()
+        n_rows, n_cols = self.shape
+        centers = np.zeros((n_rows, n_cols, 3))
+        centers[..., 0] = (np.arange(n_cols) + 0.5) * cell_w
+        centers[..., 1] = -(np.arange(n_rows)[:, None] + 0.5) * cell_h
+        return centers + self.get_corner(UL)
+
+    def get_cell_rectangle(self, rows=None, cols=None, **style) -> Rectangle:
+        """A Rectangle framing the block of cells ``rows`` x ``cols``, e.g. one row."""
+        n_rows, n_cols = self.shape
+        rows = np.arange(n_rows) if rows is None else np.asarray(listify(rows))
+        cols = np.arange(n_cols) if cols is None else np.asarray(listify(cols))
+        cell_w, cell_h = self.get_cell_size()
+        style.setdefault("stroke_color", WHITE)
+        style.setdefault("stroke_width", 2)
+        rect = Rectangle(
+            width=(cols.max() - cols.min() + 1) * cell_w,
+            height=(rows.max() - rows.min() + 1) * cell_h,
+            **style
+        )
+        corner = self.get_corner(UL) + np.array([cols.min() * cell_w, -rows.min() * cell_h, 0])
+        rect.move_to(corner, aligned_edge=UL)
+        return rect
+
+    def get_value_labels(
+        self,
+        num_decimal_places: int = 1,
+        font_size: int | None = None,
+        color=WHITE,
+        min_cell_size: float = MIN_LABEL_CELL_SIZE,
+        values=None,
+        unit: str = "",
+    ) -> VGroup:
+        """
+        One number per cell (its value, or the matching entry of ``values``,
+        e.g. percentages with ``unit="%"``), or an empty VGroup when the
+        cells are smaller than ``min_cell_size`` and the numbers would not
+        be readable anyway.
+        """
+        cell_size = min(self.get_cell_size())
+        labels = VGroup()
+        if cell_size < min_cell_size:
+            return labels
+        if font_size is None:
+            font_size = int(28 * cell_size)
+        centers = self.get_cell_centers()
+        values = self.values if values is None else np.asarray(values, dtype=float)
+        for (i, j), value in np.ndenumerate(values):
+            label = NumberLabel(
+                value, num_decimal_places=num_decimal_places, unit=unit,
+                font_size=font_size, color=color,
+            )
+            label.set_max_width(0.85 * cell_size)
+            label.move_to(centers[i, j])
+            labels.add(label)
+        return labels
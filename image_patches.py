@@ -0,0 +1,174 @@
+"""
+ViT-style image patches straight from the decoded pixels.
+
+The image is decoded (center-cropped and resized, e.g. to 224 x 224) once and
+kept as one uint8 array.  ``patch_views`` slices it into a (rows, cols, P, P, C)
+grid of non-overlapping P x P patches by striding over that same buffer, so
+no patch is ever copied or decoded again.  Each patch view can be shown as a
+``PixelImage`` (a quad textured with exactly those pixels), and
+``embed_patches`` flattens the whole grid and projects it with one matrix
+product, as a ViT's patch embedding does.
+
+    pixels = load_image("example_photos/dog_photo.jpg", size=224)
+    patches = patch_views(pixels, 16)               # (14, 14, 16, 16, 3), a view of pixels
+    image = PixelImage(pixels, height=2.0)
+    tiles = patch_mobjects(patches, image)          # one PixelImage per patch, laid over image
+    tokens = embed_patches(patches, patch_projection(16, dim=6))   # (14, 14, 6)
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+
+import moderngl
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+from PIL import Image
+
+from manimlib import DL
+from manimlib import DR
+from manimlib import UL
+from manimlib import UR
+from manimlib import Group
+from manimlib import Mobject
+from manimlib.utils.iterables import listify
+from manimlib.utils.iterables import resize_with_interpolation
+
+from heatmap_matrix import ArrayTextureShaderWrapper
+
+
+@lru_cache()
+def load_image(path: str, size: int | None = None) -> np.ndarray:
+    """
+    (H, W, 3) uint8 pixels of the image at ``path``, center-cropped to a
+    square and resized to ``size`` when given.  Decoded once per path and
+    size; the array is read-only since every patch view shares it.
+    """
+    with Image.open(path) as image:
+        image = image.convert("RGB")
+        if size is not None:
+            side = min(image.size)
+            left = (image.width - side) // 2
+            top = (image.height - side) // 2
+            image = image.crop((left, top, left + side, top + side))
+            image = image.resize((size, size), Image.BICUBIC)
+        pixels = np.asarray(image, dtype=np.uint8).copy()
+    pixels.flags.writeable = False
+    return pixels
+
+
+def patch_views(pixels: np.ndarray, patch_size: int) -> np.ndarray:
+    """
+    (rows, cols, P, P, C) non-overlapping P x P patches of (H, W, C)
+    ``pixels``, row 0 at the top, as a read-only view of the same memory.
+    Pixels past the last whole patch are left out.
+    """
+    p = patch_size
+    rows, cols = pixels.shape[0] // p, pixels.shape[1] // p
+    row_stride, col_stride, *channel_strides = pixels.strides
+    return as_strided(
+        pixels,
+        shape=(rows, cols, p, p, *pixels.shape[2:]),
+        strides=(p * row_stride, p * col_stride, row_stride, col_stride, *channel_strides),
+        writeable=False,
+    )
+
+
+def patch_projection(patch_size: int, channels: int = 3, dim: int = 6, seed: int = 0) -> np.ndarray:
+    """A (P * P * C, dim) random linear patch embedding, scaled to keep unit variance."""
+    fan_in = patch_size * patch_size * channels
+    return np.random.default_rng(seed).normal(0, 1 / np.sqrt(fan_in), size=(fan_in, dim))
+
+
+def embed_patches(patches: np.ndarray, projection: np.ndarray, bias=None) -> np.ndarray:
+    """
+    (rows, cols, dim) tokens: every patch flattened, scaled to [-1, 1] and
+    multiplied by ``projection`` in a single matrix product.
+    """
+    rows, cols = patches.shape[:2]
+    # The flatten is the one copy: the matrix product needs each patch as a contiguous row
+    flat = patches.reshape(rows * cols, -1).astype(np.float32)
+    tokens = (flat / 127.5 - 1) @ projection
+    if bias is not None:
+        tokens += bias
+    return tokens.reshape(rows, cols, -1)
+
+
+def to_rgba(pixels: np.ndarray) -> np.ndarray:
+    """Contiguous (H, W, 4) uint8 copy of RGB or RGBA ``pixels``, as a texture upload needs."""
+    if pixels.shape[2] == 4:
+        return np.ascontiguousarray(pixels)
+    rgba = np.empty((*pixels.shape[:2], 4), dtype=np.uint8)
+    rgba[..., :3] = pixels
+    rgba[..., 3] = 255
+    return rgba
+
+
+class PixelImage(Mobject):
+    """
+    A quad showing an (H, W, 3 or 4) uint8 array, e.g. one patch view,
+    pixel for pixel.  Unlike ``ImageMobject`` nothing is read from disk.
+    """
+    shader_folder: str = "image"
+    data_dtype = [
+        ('point', np.float32, (3,)),
+        ('im_coords', np.float32, (2,)),
+        ('opacity', np.float32, (1,)),
+    ]
+    render_primitive: int = moderngl.TRIANGLES
+
+    def __init__(self, pixels: np.ndarray, height: float = 2.0, **kwargs):
+        self.pixels = pixels
+        self.image_height = height
+        super().__init__(**kwargs)
+
+    def init_data(self) -> None:
+        super().init_data(length=6)
+        self.data["point"][:] = [UL, DL, UR, DR, UR, DL]
+        self.data["im_coords"][:] = [(0, 0), (0, 1), (1, 0), (1, 1), (1, 0), (0, 1)]
+        self.data["opacity"][:] = self.opacity
+
+    def init_points(self) -> None:
+        rows, cols = self.pixels.shape[:2]
+        self.set_height(self.image_height, stretch=True)
+        self.set_width(self.image_height * cols / rows, stretch=True)
+
+    def init_shader_wrapper(self, ctx: moderngl.Context):
+        self.shader_wrapper = ArrayTextureShaderWrapper(
+            ctx=ctx,
+            pixels=to_rgba(self.pixels),
+            vert_data=self.data,
+            shader_folder=self.shader_folder,
+            mobject_uniforms=self.uniforms,
+            depth_test=self.depth_test,
+            render_primitive=self.render_primitive,
+            code_replacements=self.shader_code_replacements,
+        )
+
+    @Mobject.affects_data
+    def set_opacity(self, opacity, recurse: bool = True):
+        self.data["opacity"][:, 0] = resize_with_interpolation(
+            np.array(listify(opacity)),
+            self.get_num_points()
+        )
+        return self
+
+    def set_color(self, color, opacity=None, recurse=None):
+        return self
+
+
+def patch_mobjects(patches: np.ndarray, image: Mobject, scale: float = 1.0) -> Group:
+    """
+    One ``PixelImage`` per patch, row by row, each over its own cell of
+    ``image`` (shrunk by ``scale`` to leave gaps between them).
+    """
+    rows, cols = patches.shape[:2]
+    cell_w = image.get_width() / cols
+    cell_h = image.get_height() / rows
+    corner = image.get_corner(UL)
+    tiles = Group()
+    for i in range(rows):
+        for j in range(cols):
+            tile = PixelImage(patches[i, j], height=scale * cell_h)
+            tile.move_to(corner + np.array([(j + 0.5) * cell_w, -(i + 0.5) * cell_h, 0]))
+            tiles.add(tile)
+    return tiles
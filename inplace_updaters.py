@@ -0,0 +1,111 @@
+"""
+Updaters that rewrite an existing mobject's points instead of rebuilding it.
+
+``always_redraw(func)`` builds a whole new mobject every frame and throws the
+old one away, along with its GPU buffers.  When only the geometry changes,
+the same result is had by recomputing the points and writing them into the
+mobject's existing data array: style, z-index, fix_in_frame and the shader
+wrapper all carry over, and nothing but a few small arrays is allocated.
+
+    arc = VMobject(stroke_color=WHITE, stroke_width=4)
+    always_set_points(arc, lambda: arc_anchors(t_tracker.get_value()), smooth=True)
+
+    line.add_updater(lambda m: m.set_points(segment_points(start, get_end())))
+
+``VMobject.set_points`` only reallocates the mobject's data when the number
+of points changes.  The helpers still return fresh point arrays each frame
+(``segment_points``, ``solid_arrow_points`` and the tip's matrix product all
+allocate), so only those small arrays are reallocated, never the mobject.
+"""
+from __future__ import annotations
+
+from typing import Callable
+
+import numpy as np
+
+from manimlib.utils.bezier import approx_smooth_quadratic_bezier_handles
+
+
+def segment_points(start, end) -> np.ndarray:
+    """Points of a straight ``Line`` from ``start`` to ``end``."""
+    start = np.asarray(start, dtype=float)
+    end = np.asarray(end, dtype=float)
+    return np.array([start, 0.5 * (start + end), end])
+
+
+def corner_path_points(anchors, out: np.ndarray | None = None) -> np.ndarray:
+    """Points of ``set_points_as_corners(anchors)``, written into ``out`` if given."""
+    anchors = np.asarray(anchors, dtype=float)
+    if out is None:
+        out = np.empty((2 * len(anchors) - 1, 3))
+    out[0::2] = anchors
+    out[1::2] = 0.5 * (anchors[:-1] + anchors[1:])
+    return out
+
+
+def smooth_path_points(anchors, out: np.ndarray | None = None) -> np.ndarray:
+    """Points of ``set_points_smoothly(anchors)`` (one open path), written into ``out`` if given."""
+    anchors = np.asarray(anchors, dtype=float)
+    if out is None:
+        out = np.empty((2 * len(anchors) - 1, 3))
+    out[0::2] = anchors
+    out[1::2] = approx_smooth_quadratic_bezier_handles(anchors)
+    return out
+
+
+def corner_subpaths_points(paths) -> np.ndarray:
+    """Points of one VMobject made of a separate corner path through each of ``paths``."""
+    paths = [np.asarray(path, dtype=float) for path in paths if len(path) > 1]
+    if not paths:
+        return np.zeros((0, 3))
+    sizes = [2 * len(path) - 1 for path in paths]
+    out = np.empty((sum(sizes) + len(paths) - 1, 3))
+    index = 0
+    for path, size in zip(paths, sizes):
+        if index > 0:
+            # A handle sitting on the previous anchor ends that subpath
+            out[index] = out[index - 1]
+            index += 1
+        corner_path_points(path, out=out[index:index + size])
+        index += size
+    return out
+
+
+def always_set_points(mobject, anchors_func: Callable[[], np.ndarray], smooth: bool = False):
+    """
+    Keep ``mobject`` a path through ``anchors_func()`` (smooth or with
+    corners), rewriting its points in place every frame.
+    """
+    path_points = smooth_path_points if smooth else corner_path_points
+    buffer = np.empty((0, 3))
+
+    def update(mob):
+        nonlocal buffer
+        anchors = anchors_func()
+        if len(buffer) != 2 * len(anchors) - 1:
+            buffer = np.empty((2 * len(anchors) - 1, 3))
+        mob.set_points(path_points(anchors, out=buffer))
+
+    update(mobject)
+    mobject.add_updater(update)
+    return mobject
+
+
+def always_set_cached_points(mobject, points_func: Callable[[], np.ndarray]):
+    """
+    Keep ``mobject``'s points equal to ``points_func()``, writing them only
+    when it returns a different array, as a ``TrackerCache`` does when its
+    key changes.  Frames in between leave the mobject untouched.
+    """
+    last_points = None
+
+    def update(mob):
+        nonlocal last_points
+        points = points_func()
+        if points is not last_points:
+            mob.set_points(points)
+            last_points = points
+
+    update(mobject)
+    mobject.add_updater(update)
+    return mobject
@@ -0,0 +1,236 @@
+"""
+A small fully connected ReLU network trained in NumPy, with every epoch's
+weights kept so a scene can replay training.
+
+Training is full batch and vectorized over samples (one matrix product per
+layer and pass), with softmax cross-entropy and SGD or Adam.  ``train_cached``
+stores the per-epoch weight snapshots on disk, keyed by the data, the layer
+sizes and the hyperparameters, so re-rendering a scene never retrains:
+
+    run = train_cached(x, labels, layer_sizes=(2, 5, 5, 2), epochs=500)
+    run.n_epochs, run.losses[-1], run.accuracies[-1]
+    hidden = run.activations(x, epoch=120)     # [input, hidden 1, hidden 2, logits]
+    probs = run.predict_proba(grid, epoch=-1)  # any epoch, any batch of points
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from manimlib.logger import log
+from manimlib.utils.directories import get_cache_dir
+
+
+# Bump when training or the stored layout changes so stale runs are never reused
+MLP_CACHE_VERSION = 1
+MLP_CACHE_DIR = Path(get_cache_dir(), "clip_mlp_runs")
+
+
+def relu(x: np.ndarray) -> np.ndarray:
+    return np.maximum(x, 0)
+
+
+def softmax_cross_entropy(logits: np.ndarray, labels: np.ndarray) -> tuple[float, np.ndarray]:
+    """Mean loss, and its gradient with respect to the logits."""
+    shifted = logits - logits.max(axis=1, keepdims=True)
+    log_probs = shifted - np.log(np.exp(shifted).sum(axis=1, keepdims=True))
+    n = len(labels)
+    loss = -log_probs[np.arange(n), labels].mean()
+    grad = np.exp(log_probs)
+    grad[np.arange(n), labels] -= 1
+    return float(loss), grad / n
+
+
+def forward(weights, biases, x) -> list[np.ndarray]:
+    """Activations of every layer: the input, each hidden ReLU layer, then the logits."""
+    activations = [np.asarray(x, dtype=float)]
+    for layer, (w, b) in enumerate(zip(weights, biases)):
+        z = activations[-1] @ w + b
+        activations.append(z if layer == len(weights) - 1 else relu(z))
+    return activations
+
+
+def backward(weights, activations, grad_logits) -> tuple[list[np.ndarray], list[np.ndarray]]:
+    """Gradients of the loss with respect to every weight matrix and bias."""
+    grad_w = [None] * len(weights)
+    grad_b = [None] * len(weights)
+    grad = grad_logits
+    for layer in reversed(range(len(weights))):
+        grad_w[layer] = activations[layer].T @ grad
+        grad_b[layer] = grad.sum(axis=0)
+        if layer > 0:
+            grad = (grad @ weights[layer].T) * (activations[layer] > 0)
+    return grad_w, grad_b
+
+
+class SGD(object):
+    def __init__(self, lr: float = 0.1, momentum: float = 0.9):
+        self.lr = lr
+        self.momentum = momentum
+        self.velocity = None
+
+    def step(self, params: list[np.ndarray], grads: list[np.ndarray]) -> None:
+        if self.velocity is None:
+            self.velocity = [np.zeros_like(p) for p in params]
+        for p, g, v in zip(params, grads, self.velocity):
+            v *= self.momentum
+            v -= self.lr * g
+            p += v
+
+
+class Adam(object):
+    def __init__(self, lr: float = 0.02, beta1: float = 0.9, beta2: float = 0.999, eps: float = 1e-8):
+        self.lr = lr
+        self.beta1 = beta1
+        self.beta2 = beta2
+        self.eps = eps
+        self.t = 0
+        self.m = None
+        self.v = None
+
+    def step(self, params: list[np.ndarray], grads: list[np.ndarray]) -> None:
+        if self.m is None:
+            self.m = [np.zeros_like(p) for p in params]
+            self.v = [np.zeros_like(p) for p in params]
+        self.t += 1
+        correction1 = 1 - self.beta1 ** self.t
+        correction2 = 1 - self.beta2 ** self.t
+        for p, g, m, v in zip(params, grads, self.m, self.v):
+            m *= self.beta1
+            m += (1 - self.beta1) * g
+            v *= self.beta2
+            v += (1 - self.beta2) * g * g
+            p -= self.lr * (m / correction1) / (np.sqrt(v / correction2) + self.eps)
+
+
+OPTIMIZERS = {"sgd": SGD, "adam": Adam}
+
+
+@dataclass
+class TrainingRun:
+    """
+    Weights after every epoch: ``weights[l][e]`` is layer ``l``'s matrix after
+    ``e`` epochs (``e = 0`` is the initialization), and likewise ``biases``.
+    """
+    weights: list[np.ndarray]      # per layer, (epochs + 1, fan_in, fan_out)
+    biases: list[np.ndarray]       # per layer, (epochs + 1, fan_out)
+    losses: np.ndarray             # (epochs + 1,) training loss at each snapshot
+    accuracies: np.ndarray         # (epochs + 1,)
+
+    @property
+    def n_epochs(self) -> int:
+        return len(self.losses) - 1
+
+    @property
+    def layer_sizes(self) -> tuple[int, ...]:
+        return (self.weights[0].shape[1], *(w.shape[2] for w in self.weights))
+
+    def params_at(self, epoch: int = -1) -> tuple[list[np.ndarray], list[np.ndarray]]:
+        return [w[epoch] for w in self.weights], [b[epoch] for b in self.biases]
+
+    def activations(self, x, epoch: int = -1) -> list[np.ndarray]:
+        return forward(*self.params_at(epoch), x)
+
+    def logits(self, x, epoch: int = -1) -> np.ndarray:
+        return self.activations(x, epoch)[-1]
+
+    def predict_proba(self, x, epoch: int = -1) -> np.ndarray:
+        logits = self.logits(x, epoch)
+        exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def predict(self, x, epoch: int = -1) -> np.ndarray:
+        return self.logits(x, epoch).argmax(axis=1)
+
+
+def init_params(layer_sizes, seed: int = 0) -> tuple[list[np.ndarray], list[np.ndarray]]:
+    """He-initialized weights and zero biases."""
+    rng = np.random.default_rng(seed)
+    weights = [
+        rng.normal(0, np.sqrt(2 / fan_in), size=(fan_in, fan_out))
+        for fan_in, fan_out in zip(layer_sizes[:-1], layer_sizes[1:])
+    ]
+    biases = [np.zeros(fan_out) for fan_out in layer_sizes[1:]]
+    return weights, biases
+
+
+def train(
+    x,
+    labels,
+    layer_sizes=(2, 5, 5, 2),
+    epochs: int = 500,
+    optimizer: str = "adam",
+    lr: float = 0.02,
+    seed: int = 0,
+) -> TrainingRun:
+    """Full-batch training, recording the weights, loss and accuracy after every epoch."""
+    x = np.asarray(x, dtype=float)
+    labels = np.asarray(labels, dtype=int)
+    weights, biases = init_params(layer_sizes, seed)
+    opt = OPTIMIZERS[optimizer](lr=lr)
+
+    weight_snaps = [np.empty((epochs + 1, *w.shape)) for w in weights]
+    bias_snaps = [np.empty((epochs + 1, *b.shape)) for b in biases]
+    losses = np.empty(epochs + 1)
+    accuracies = np.empty(epochs + 1)
+    for epoch in range(epochs + 1):
+        for snaps, params in ((weight_snaps, weights), (bias_snaps, biases)):
+            for snap, p in zip(snaps, params):
+                snap[epoch] = p
+        activations = forward(weights, biases, x)
+        losses[epoch], grad_logits = softmax_cross_entropy(activations[-1], labels)
+        accuracies[epoch] = np.mean(activations[-1].argmax(axis=1) == labels)
+        if epoch == epochs:
+            break
+        grad_w, grad_b = backward(weights, activations, grad_logits)
+        opt.step([*weights, *biases], [*grad_w, *grad_b])
+    return TrainingRun(weight_snaps, bias_snaps, losses, accuracies)
+
+
+def run_cache_key(x, labels, **config) -> str:
+    digest = hashlib.sha256(str(MLP_CACHE_VERSION).encode())
+    for array in (x, labels):
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.dtype}{array.shape}".encode())
+        digest.update(array.tobytes())
+    digest.update(repr(sorted(config.items())).encode())
+    return digest.hexdigest()
+
+
+def train_cached(x, labels, cache_dir=MLP_CACHE_DIR, **config) -> TrainingRun:
+    """``train(x, labels, **config)``, loaded from ``cache_dir`` when this exact run was trained before."""
+    x = np.asarray(x, dtype=float)
+    labels = np.asarray(labels, dtype=int)
+    path = Path(cache_dir) / f"{run_cache_key(x, labels, **config)}.npz"
+    try:
+        with np.load(path) as npz:
+            n_layers = int(npz["n_layers"])
+            run = TrainingRun(
+                weights=[npz[f"w{i}"] for i in range(n_layers)],
+                biases=[npz[f"b{i}"] for i in range(n_layers)],
+                losses=npz["losses"],
+                accuracies=npz["accuracies"],
+            )
+        log.info("Loaded %d-epoch MLP run from %s", run.n_epochs, path)
+        return run
+    except (OSError, KeyError, ValueError):
+        pass
+
+    run = train(x, labels, **config)
+    arrays = dict(n_layers=len(run.weights), losses=run.losses, accuracies=run.accuracies)
+    for i, (w, b) in enumerate(zip(run.weights, run.biases)):
+        arrays[f"w{i}"] = w
+        arrays[f"b{i}"] = b
+    buff = io.BytesIO()
+    np.savez(buff, **arrays)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_bytes(buff.getvalue())
+    os.replace(tmp_path, path)  # Atomic, so parallel renders can share the cache
+    log.info("Trained %d-epoch MLP run (loss %.3f), cached at %s", run.n_epochs, run.losses[-1], path)
+    return run
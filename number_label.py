@@ -0,0 +1,206 @@
+"""
+Numbers laid out from a pool of pre-rendered digit glyphs.
+
+Building a ``Tex`` (or ``DecimalNumber``) per displayed value costs a LaTeX
+compile, or at best an SVG/cache load, every time a number changes.  The
+glyphs a number needs are few, so ``GlyphPool`` renders them all once, in a
+single ``CachedTex``, and keeps each glyph's path data relative to the common
+baseline.  ``NumberLabel`` then lays out any value by copying those arrays
+into its submobjects and offsetting them, so ``set_value`` costs a few array
+copies per character:
+
+    num = NumberLabel(0.42, num_decimal_places=2, font_size=28)
+    num.add_updater(lambda m: m.set_value(tracker.get_value()))
+    NumberLabel(0.003, floor=0.01)          # reads "<0.01"
+    NumberLabel(42, num_decimal_places=0, unit="%")
+
+Digits sit in equal-width cells (tabular figures), so a counter's width
+does not jitter while its value changes.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from manimlib import LEFT
+from manimlib import WHITE
+from manimlib import VMobject
+from manimlib.utils.bezier import interpolate
+
+from tex_cache import CachedTex
+
+
+GLYPH_CHARS = "0123456789.,-+<%"
+# Braces make the punctuation and operators ordinary atoms, without math spacing
+GLYPH_TEX = r"0123456789.{,}{-}{+}{<}\%"
+GLYPH_FONT_SIZE = 48
+# Style is kept per label, so only these columns come from the glyph
+STYLE_FIELDS = ("stroke_rgba", "stroke_width", "fill_rgba", "fill_border_width")
+
+
+@dataclass
+class Glyph:
+    data: np.ndarray  # VMobject data with the ink's left edge and the baseline at the origin
+    width: float
+
+
+class GlyphPool(object):
+    """
+    Path data for every character in ``GLYPH_CHARS`` at ``GLYPH_FONT_SIZE``,
+    rendered on first use.
+    """
+
+    def __init__(self, font_size: float = GLYPH_FONT_SIZE):
+        self.font_size = font_size
+        self.glyphs: dict[str, Glyph] = {}
+        self.digit_width = 0.0
+
+    def load(self) -> None:
+        tex = CachedTex(GLYPH_TEX, font_size=self.font_size)
+        if len(tex.submobjects) != len(GLYPH_CHARS):
+            raise ValueError(
+                f"expected {len(GLYPH_CHARS)} glyphs from {GLYPH_TEX!r}, got {len(tex.submobjects)}"
+            )
+        baseline = tex.submobjects[0].get_bottom()[1]
+        for char, sm in zip(GLYPH_CHARS, tex.submobjects):
+            left = sm.get_left()[0]
+            data = sm.data.copy()
+            data["point"] -= np.array([left, baseline, 0])
+            self.glyphs[char] = Glyph(data, sm.get_right()[0] - left)
+        self.digit_width = max(self.glyphs[d].width for d in "0123456789")
+
+    def layout(self, string: str, buff: float) -> list[tuple[Glyph, float]]:
+        """Each glyph of ``string`` with its x offset, at the pool's font size."""
+        if not self.glyphs:
+            self.load()
+        result = []
+        x = 0.0
+        for char in string:
+            glyph = self.glyphs.get(char)
+            if glyph is None:
+                raise ValueError(f"no glyph for {char!r} in {string!r}; available: {GLYPH_CHARS}")
+            cell = self.digit_width if char.isdigit() else glyph.width
+            result.append((glyph, x + (cell - glyph.width) / 2))
+            x += cell + buff
+        return result
+
+
+NUMBER_GLYPHS = GlyphPool()
+
+
+class NumberLabel(VMobject):
+    """
+    A fast stand-in for ``DecimalNumber``: one submobject per character,
+    refilled from ``NUMBER_GLYPHS`` (created only when the string grows).
+    Values below ``floor`` are shown as e.g. ``<0.01``, and ``unit`` (made of
+    ``GLYPH_CHARS``, e.g. ``"%"``) follows the number.
+    """
+
+    def __init__(
+        self,
+        number: float = 0,
+        color=WHITE,
+        stroke_width: float = 0,
+        fill_opacity: float = 1.0,
+        fill_border_width: float = 0.5,
+        num_decimal_places: int = 2,
+        include_sign: bool = False,
+        group_with_commas: bool = False,
+        floor: float | None = None,
+        unit: str = "",
+        digit_buff_per_font_unit: float = 0.001,
+        edge_to_fix=LEFT,
+        font_size: float = 48,
+        glyphs: GlyphPool = NUMBER_GLYPHS,
+        **kwargs
+    ):
+        self.num_decimal_places = num_decimal_places
+        self.include_sign = include_sign
+        self.group_with_commas = group_with_commas
+        self.floor = floor
+        self.unit = unit
+        self.digit_buff_per_font_unit = digit_buff_per_font_unit
+        self.edge_to_fix = edge_to_fix
+        self.font_size = font_size
+        self.glyphs = glyphs
+
+        super().__init__(
+            color=color,
+            stroke_width=stroke_width,
+            fill_opacity=fill_opacity,
+            fill_border_width=fill_border_width,
+            **kwargs
+        )
+
+        self.number = number
+        self.set_string(self.get_num_string(number))
+        self.init_colors()
+
+    def get_num_string(self, number: float) -> str:
+        if self.floor is not None and number < self.floor:
+            return "<" + self.format_number(self.floor) + self.unit
+        return self.format_number(number) + self.unit
+
+    def format_number(self, number: float) -> str:
+        sign = "+" if self.include_sign else ""
+        comma = "," if self.group_with_commas else ""
+        num_string = f"{number:{sign}{comma}.{self.num_decimal_places}f}"
+        if num_string.startswith("-") and round(number, self.num_decimal_places) == 0:
+            # No "-0.00"
+            num_string = ("+" if self.include_sign else "") + num_string[1:]
+        return num_string
+
+    def set_string(self, string: str):
+        """Lay out ``string`` (characters from ``GLYPH_CHARS``), keeping the current style and fixed edge."""
+        has_points = len(self.submobjects) > 0
+        if has_points:
+            move_to_point = self.get_edge_center(self.edge_to_fix)
+        scale = self.font_size / self.glyphs.font_size
+        placed = self.glyphs.layout(string, self.digit_buff_per_font_unit * self.glyphs.font_size)
+
+        slots = self.submobjects[:len(placed)]
+        while len(slots) < len(placed):
+            slots.append(slots[-1].copy() if slots else VMobject())
+        for slot, (glyph, x) in zip(slots, placed):
+            data = glyph.data.copy()
+            data["point"] *= scale
+            data["point"][:, 0] += scale * x
+            if slot.has_points():
+                for field in STYLE_FIELDS:
+                    data[field] = slot.data[field][0]
+            slot.set_data(data)
+        self.set_submobjects(slots)
+        self.num_string = string
+
+        if has_points:
+            self.move_to(move_to_point, self.edge_to_fix)
+        for submob in self.get_family():
+            submob.uniforms.update(self.uniforms)
+        return self
+
+    def set_value(self, number: float):
+        self.number = number
+        num_string = self.get_num_string(number)
+        if num_string != self.num_string:
+            self.set_string(num_string)
+        return self
+
+    def get_value(self) -> float:
+        return self.number
+
+    def increment_value(self, delta: float = 1):
+        return self.set_value(self.get_value() + delta)
+
+    def get_font_size(self) -> float:
+        return self.font_size
+
+    def _handle_scale_side_effects(self, scale_factor: float):
+        self.font_size *= scale_factor
+        return self
+
+    def interpolate(self, mobject1, mobject2, alpha: float, *args, **kwargs):
+        super().interpolate(mobject1, mobject2, alpha, *args, **kwargs)
+        if hasattr(mobject1, "font_size") and hasattr(mobject2, "font_size"):
+            self.font_size = interpolate(mobject1.font_size, mobject2.font_size, alpha)
+        return self
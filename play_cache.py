@@ -0,0 +1,303 @@
+"""
+Play-level render cache: re-encode only the part of a scene that changed.
+
+Every ``self.play`` / ``self.wait`` call becomes one movie segment named by a
+fingerprint of (previous fingerprint, scene state going in, call arguments).
+Because each fingerprint chains the previous one, a segment is reused only
+when the whole timeline up to and including it is unchanged; those segments
+are replayed with animations skipped (no frames drawn or encoded) and the
+final movie is spliced together from the cached files.
+
+    class UMAPVisualizationScene(PlayCacheMixin, Scene):
+        ...
+
+Caching only kicks in when writing a single movie (``-w``), so interactive
+previews and ``--subdivide`` renders behave exactly as before.  Set
+``CLIP_PLAY_CACHE=0`` to turn it off for one render.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import subprocess as sp
+import types
+from pathlib import Path
+
+import numpy as np
+
+from manimlib import Animation
+from manimlib import Mobject
+from manimlib import Scene
+from manimlib.animation.animation import prepare_animation
+from manimlib.logger import log
+from manimlib.scene.scene_file_writer import SceneFileWriter
+
+
+PLAY_CACHE_VERSION = 1
+PLAY_CACHE_SUBDIR = ".play_cache"
+# Closures can reference arbitrarily deep object graphs; stop somewhere sane
+MAX_FINGERPRINT_DEPTH = 12
+
+
+def play_cache_enabled() -> bool:
+    return os.environ.get("CLIP_PLAY_CACHE", "1") not in ("0", "false", "no")
+
+
+class Fingerprinter(object):
+    """
+    Feeds a stable description of Python objects into a hash.
+
+    Mobjects contribute their point/color data and uniforms, functions their
+    bytecode, constants and closure contents (but not line numbers, so edits
+    elsewhere in the file do not invalidate them).
+    """
+
+    def __init__(self):
+        self.hasher = hashlib.blake2b(digest_size=16)
+        self.seen = dict()
+        # Keep visited objects alive so their ids cannot be recycled mid-hash
+        self.visited = []
+
+    def hexdigest(self) -> str:
+        return self.hasher.hexdigest()
+
+    def update(self, *items) -> Fingerprinter:
+        for item in items:
+            self.add(item)
+        return self
+
+    def tag(self, s: str) -> None:
+        self.hasher.update(s.encode("utf-8"))
+        self.hasher.update(b"\x00")
+
+    def add(self, obj, depth: int = 0) -> None:
+        if obj is None or isinstance(obj, (bool, int, float, complex, str, bytes)):
+            self.tag(f"{type(obj).__name__}:{obj!r}")
+            return
+        if isinstance(obj, np.generic):
+            self.tag(f"{obj.dtype}:{obj!r}")
+            return
+        if depth > MAX_FINGERPRINT_DEPTH:
+            self.tag(f"deep:{type(obj).__qualname__}")
+            return
+        if id(obj) in self.seen:
+            self.tag(f"ref:{self.seen[id(obj)]}")
+            return
+        self.seen[id(obj)] = len(self.seen)
+        self.visited.append(obj)
+
+        if isinstance(obj, np.ndarray):
+            self.tag(f"array:{obj.dtype}:{obj.shape}")
+            self.hasher.update(np.ascontiguousarray(obj).tobytes())
+        elif isinstance(obj, Mobject):
+            self.add_mobject(obj, depth)
+        elif isinstance(obj, Animation):
+            self.tag(f"anim:{type(obj).__qualname__}")
+            self.add(vars(obj), depth + 1)
+        elif isinstance(obj, Scene):
+            # Closures in construct() capture self; the scene is identified by
+            # its class, its state is covered by the mobjects themselves
+            self.tag(f"scene:{type(obj).__qualname__}")
+        elif isinstance(obj, dict):
+            self.tag(f"dict:{len(obj)}")
+            for key in sorted(obj, key=repr):
+                self.add(key, depth + 1)
+                self.add(obj[key], depth + 1)
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            items = sorted(obj, key=repr) if isinstance(obj, (set, frozenset)) else obj
+            self.tag(f"{type(obj).__name__}:{len(items)}")
+            for item in items:
+                self.add(item, depth + 1)
+        elif isinstance(obj, types.MethodType):
+            self.add(obj.__func__, depth + 1)
+            self.add(obj.__self__, depth + 1)
+        elif isinstance(obj, types.FunctionType):
+            self.add_function(obj, depth)
+        elif isinstance(obj, types.CodeType):
+            self.add_code(obj, depth)
+        elif callable(obj):
+            # Builtins, ufuncs, partials and other opaque callables
+            self.tag(f"callable:{getattr(obj, '__module__', '')}.{getattr(obj, '__qualname__', repr(type(obj)))}")
+            if hasattr(obj, "func"):
+                self.update(obj.func, getattr(obj, "args", ()), getattr(obj, "keywords", {}))
+        else:
+            self.tag(f"object:{type(obj).__qualname__}")
+
+    def add_mobject(self, mobject: Mobject, depth: int) -> None:
+        for mob in mobject.get_family():
+            self.tag(f"mob:{type(mob).__qualname__}:{len(mob.submobjects)}")
+            self.hasher.update(np.ascontiguousarray(mob.data).tobytes())
+            # State kept outside mob.data, e.g. a HeatmapMatrix's cell colors
+            for key, value in vars(mob).items():
+                if isinstance(value, np.ndarray) and value is not mob.data:
+                    self.tag(key)
+                    self.add(value, depth + 1)
+            self.add(mob.uniforms, depth + 1)
+            self.add(mob.texture_paths, depth + 1)
+            self.add(mob.z_index, depth + 1)
+            for updater in mob.get_updaters():
+                self.add(updater, depth + 1)
+
+    def add_function(self, func: types.FunctionType, depth: int) -> None:
+        self.tag(f"func:{func.__qualname__}")
+        self.add_code(func.__code__, depth)
+        self.add(func.__defaults__, depth + 1)
+        self.add(func.__kwdefaults__, depth + 1)
+        for cell in func.__closure__ or ():
+            try:
+                self.add(cell.cell_contents, depth + 1)
+            except ValueError:  # Empty cell
+                self.tag("empty-cell")
+        # Helpers defined in the same file are part of the scene's source too
+        for name in func.__code__.co_names:
+            value = func.__globals__.get(name)
+            if isinstance(value, types.FunctionType) and value.__module__ == func.__module__:
+                self.add(value, depth + 1)
+
+    def add_code(self, code: types.CodeType, depth: int) -> None:
+        self.hasher.update(code.co_code)
+        self.tag(repr(code.co_names))
+        for const in code.co_consts:
+            self.add(const, depth + 1)
+
+
+class SegmentFileWriter(SceneFileWriter):
+    """
+    Writes each play/wait into its own cached segment file, then splices the
+    segments into the usual movie path when the scene finishes.
+    """
+
+    def __init__(self, scene: Scene, **kwargs):
+        super().__init__(scene, **kwargs)
+        self.segment_dir = Path(self.output_directory, PLAY_CACHE_SUBDIR)
+        self.segment_paths: list[Path] = []
+        self.next_segment_path: Path | None = None
+
+    def get_segment_path(self, key: str) -> Path:
+        return Path(self.segment_dir, key).with_suffix(self.movie_file_extension)
+
+    def begin(self) -> None:
+        if self.write_to_movie:
+            self.segment_dir.mkdir(parents=True, exist_ok=True)
+
+    def begin_animation(self) -> None:
+        if self.write_to_movie and self.next_segment_path is not None:
+            self.open_movie_pipe(str(self.next_segment_path))
+
+    def end_animation(self) -> None:
+        if self.write_to_movie and self.next_segment_path is not None:
+            self.close_movie_pipe()
+            self.segment_paths.append(self.next_segment_path)
+            self.next_segment_path = None
+
+    def add_cached_segment(self, path: Path) -> None:
+        self.segment_paths.append(path)
+
+    def combine_segments(self) -> None:
+        movie_path = Path(self.get_movie_file_path())
+        list_file = movie_path.with_suffix(".segments.txt")
+        list_file.write_text("".join(
+            f"file '{path.resolve()}'\n" for path in self.segment_paths
+        ))
+        sp.run([
+            self.ffmpeg_bin, "-y",
+            "-f", "concat", "-safe", "0",
+            "-i", str(list_file),
+            "-c", "copy",
+            "-loglevel", "error",
+            str(movie_path),
+        ], check=True)
+        list_file.unlink()
+
+    def finish(self) -> None:
+        if self.write_to_movie and self.segment_paths and not self.ended_with_interrupt:
+            self.combine_segments()
+            if self.includes_sound:
+                self.add_sound_to_video()
+            self.print_file_ready_message(self.get_movie_file_path())
+        if self.save_last_frame:
+            self.scene.update_frame(force_draw=True)
+            self.save_final_image(self.scene.get_image())
+        if self.should_open_file():
+            self.open_file()
+
+
+class PlayCacheMixin(object):
+    """
+    Mix into a Scene (before ``Scene`` in the bases) to cache each play/wait
+    as an encoded segment and splice unchanged prefixes on re-render.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        writer = self.file_writer
+        self.play_caching = (
+            play_cache_enabled()
+            and writer.write_to_movie
+            and not writer.subdivide_output
+        )
+        self.segment_chain = ""
+        self.segment_hits = 0
+        self.segment_misses = 0
+        if self.play_caching:
+            self.file_writer = SegmentFileWriter(self, **self.file_writer_config)
+            self.segment_chain = self.get_render_settings_fingerprint()
+
+    def get_render_settings_fingerprint(self) -> str:
+        writer = self.file_writer
+        return Fingerprinter().update(
+            PLAY_CACHE_VERSION,
+            tuple(self.camera.get_pixel_shape()),
+            self.camera.fps,
+            writer.video_codec,
+            writer.pixel_format,
+            writer.saturation,
+            writer.gamma,
+        ).hexdigest()
+
+    def get_segment_fingerprint(self, method_name: str, args: tuple, kwargs: dict) -> str:
+        camera = self.camera
+        return Fingerprinter().update(
+            self.segment_chain,
+            method_name,
+            np.array(camera.background_rgba),
+            repr(getattr(camera, "background_color", None)),
+            self.mobjects,
+            args,
+            kwargs,
+        ).hexdigest()
+
+    def run_segment(self, method, method_name: str, args: tuple, kwargs: dict):
+        if not self.play_caching or self.skip_animations:
+            return method(*args, **kwargs)
+
+        key = self.get_segment_fingerprint(method_name, args, kwargs)
+        self.segment_chain = key
+        path = self.file_writer.get_segment_path(key)
+        if path.exists():
+            # Advance the scene state without drawing or encoding a frame
+            with self.temp_skip():
+                result = method(*args, **kwargs)
+            self.file_writer.add_cached_segment(path)
+            self.segment_hits += 1
+        else:
+            self.file_writer.next_segment_path = path
+            result = method(*args, **kwargs)
+            self.segment_misses += 1
+        return result
+
+    def play(self, *proto_animations, **kwargs):
+        # Build `.animate` chains first so their targets are part of the key
+        animations = tuple(map(prepare_animation, proto_animations))
+        return self.run_segment(super().play, "play", animations, kwargs)
+
+    def wait(self, *args, **kwargs):
+        return self.run_segment(super().wait, "wait", args, kwargs)
+
+    def tear_down(self):
+        super().tear_down()
+        if self.play_caching:
+            log.info(
+                "Play cache: %d segments reused, %d rendered",
+                self.segment_hits, self.segment_misses,
+            )
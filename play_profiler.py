@@ -0,0 +1,218 @@
+"""
+Opt-in per-play instrumentation for finding which ``self.play`` is slow.
+
+    CLIP_PROFILE_PLAYS=1 manimgl clip_encoding_scene_4.py UMAPVisualizationScene -w
+
+or set ``profile_plays = True`` on a scene class using ``PlayProfilerMixin``.
+Every play/wait is logged with its source line, number of animations and
+leaf submobjects, frames rendered, and the time split between interpolating
+animations, running updaters, drawing and writing frames.  A table of all
+calls ranked by total time is printed when the scene ends.
+
+With ``CLIP_PROFILE_ALLOCS=1`` (or ``profile_allocations = True``), which
+implies the above, each call also reports the memory allocated per frame by
+updaters (peak, via ``tracemalloc``) and how many garbage collections ran
+during it, to catch updaters that rebuild mobjects every frame.
+"""
+from __future__ import annotations
+
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+
+import manimlib
+from manimlib.animation.animation import prepare_animation
+from manimlib.logger import log
+
+
+# Frames from these files are tooling, not the scene code that called play()
+TOOLING_FILES = {"play_profiler.py", "play_cache.py", "benchmark.py"}
+MANIMLIB_DIR = str(Path(manimlib.__file__).parent)
+
+
+def play_profiling_enabled() -> bool:
+    return os.environ.get("CLIP_PROFILE_PLAYS", "0") not in ("0", "false", "no", "")
+
+
+def allocation_tracking_enabled() -> bool:
+    return os.environ.get("CLIP_PROFILE_ALLOCS", "0") not in ("0", "false", "no", "")
+
+
+def caller_location() -> str:
+    frame = sys._getframe(1)
+    while frame is not None:
+        file_name = frame.f_code.co_filename
+        if not file_name.startswith(MANIMLIB_DIR) and Path(file_name).name not in TOOLING_FILES:
+            return f"{Path(file_name).name}:{frame.f_lineno} ({frame.f_code.co_name})"
+        frame = frame.f_back
+    return "?"
+
+
+@dataclass
+class PlayRecord:
+    index: int
+    kind: str
+    source: str
+    n_animations: int = 0
+    n_leaves: int = 0
+    frames: int = 0
+    total: float = 0.0
+    interpolate: float = 0.0
+    updaters: float = 0.0
+    draw: float = 0.0
+    write: float = 0.0
+    # Only filled in when allocations are tracked
+    updater_passes: int = 0
+    updater_bytes: int = 0
+    gc_runs: int = 0
+
+    def summary(self) -> str:
+        summary = (
+            f"#{self.index:<3} {self.kind:<4} {self.source:<46} "
+            f"anims={self.n_animations:<4} leaves={self.n_leaves:<6} frames={self.frames:<4} "
+            f"total={self.total:6.2f}s interp={self.interpolate:6.2f}s "
+            f"updaters={self.updaters:6.2f}s draw={self.draw:6.2f}s write={self.write:6.2f}s"
+        )
+        if self.updater_passes:
+            per_frame = self.updater_bytes / self.updater_passes / 1024
+            summary += f" updater_alloc={per_frame:7.1f}kB/frame gc={self.gc_runs}"
+        return summary
+
+
+class PlayProfilerMixin(object):
+    """
+    Mix into a Scene (first in the bases) to time every play/wait call.
+    Does nothing unless ``profile_plays`` or ``CLIP_PROFILE_PLAYS`` is set
+    (or ``profile_allocations`` / ``CLIP_PROFILE_ALLOCS``).
+    """
+    profile_plays: bool = False
+    profile_allocations: bool = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.allocation_tracking = self.profile_allocations or allocation_tracking_enabled()
+        self.play_profiling = self.profile_plays or play_profiling_enabled() or self.allocation_tracking
+        self.play_records: list[PlayRecord] = []
+        self.current_play_record: PlayRecord | None = None
+        if self.play_profiling:
+            capture = self.camera.capture
+
+            def timed_capture(*mobjects):
+                start = time.perf_counter()
+                capture(*mobjects)
+                self.add_play_time("draw", start)
+
+            self.camera.capture = timed_capture
+        self.started_tracemalloc = False
+        if self.allocation_tracking:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self.started_tracemalloc = True
+            gc.callbacks.append(self.count_gc_run)
+
+    def count_gc_run(self, phase: str, info: dict) -> None:
+        record = self.current_play_record
+        if record is not None and phase == "start":
+            record.gc_runs += 1
+
+    def add_play_time(self, field: str, start: float) -> None:
+        record = self.current_play_record
+        if record is not None:
+            setattr(record, field, getattr(record, field) + time.perf_counter() - start)
+
+    def run_profiled(self, record: PlayRecord, method, *args, **kwargs):
+        self.current_play_record = record
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            record.total = time.perf_counter() - start
+            self.current_play_record = None
+            self.play_records.append(record)
+            log.info(record.summary())
+
+    def play(self, *proto_animations, **kwargs):
+        if not self.play_profiling or self.current_play_record is not None:
+            return super().play(*proto_animations, **kwargs)
+        animations = [prepare_animation(anim) for anim in proto_animations]
+        record = PlayRecord(
+            index=len(self.play_records),
+            kind="play",
+            source=caller_location(),
+            n_animations=len(animations),
+            n_leaves=sum(
+                len(anim.mobject.family_members_with_points())
+                for anim in animations
+            ),
+        )
+        return self.run_profiled(record, super().play, *animations, **kwargs)
+
+    def wait(self, *args, **kwargs):
+        if not self.play_profiling or self.current_play_record is not None:
+            return super().wait(*args, **kwargs)
+        record = PlayRecord(
+            index=len(self.play_records),
+            kind="wait",
+            source=caller_location(),
+            n_leaves=sum(
+                len(mob.family_members_with_points())
+                for mob in self.mobjects
+            ),
+        )
+        return self.run_profiled(record, super().wait, *args, **kwargs)
+
+    def progress_through_animations(self, animations) -> None:
+        record = self.current_play_record
+        if record is None:
+            return super().progress_through_animations(animations)
+        # Interpolation is whatever the frame loop spends outside updaters,
+        # drawing and writing, which are timed separately
+        others = record.updaters + record.draw + record.write
+        start = time.perf_counter()
+        super().progress_through_animations(animations)
+        elapsed = time.perf_counter() - start
+        others = record.updaters + record.draw + record.write - others
+        record.interpolate += elapsed - others
+
+    def update_mobjects(self, dt: float) -> None:
+        record = self.current_play_record
+        if record is None or not self.allocation_tracking:
+            start = time.perf_counter()
+            super().update_mobjects(dt)
+            self.add_play_time("updaters", start)
+            return
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        super().update_mobjects(dt)
+        self.add_play_time("updaters", start)
+        record.updater_bytes += tracemalloc.get_traced_memory()[1] - before
+        record.updater_passes += 1
+
+    def emit_frame(self) -> None:
+        start = time.perf_counter()
+        super().emit_frame()
+        self.add_play_time("write", start)
+        if self.current_play_record is not None and not self.skip_animations:
+            self.current_play_record.frames += 1
+
+    def tear_down(self):
+        super().tear_down()
+        if self.allocation_tracking:
+            gc.callbacks.remove(self.count_gc_run)
+            if self.started_tracemalloc:
+                tracemalloc.stop()
+        if self.play_profiling and self.play_records:
+            self.print_play_summary()
+
+    def print_play_summary(self, limit: int = 20) -> None:
+        records = sorted(self.play_records, key=lambda r: r.total, reverse=True)
+        total = sum(r.total for r in records)
+        print(f"\n{self} — slowest play/wait calls ({len(records)} total, {total:.2f}s)")
+        for rank, record in enumerate(records[:limit], start=1):
+            share = 100 * record.total / total if total else 0
+            print(f"{rank:>3}. {share:5.1f}%  {record.summary()}")
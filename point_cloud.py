@@ -0,0 +1,290 @@
+"""
+Array-backed point clouds for the embedding scatter plots.
+
+A ``VGroup`` of ``Dot``s costs one VMobject (points, triangulation, shader
+data) per dot, so frame time grows with the number of Python objects.
+``PointCloud`` keeps every position, radius and RGBA in one contiguous
+structured array (manimlib's ``DotCloud`` layout) and renders the whole cloud
+in a single draw call, so tens of thousands of points stay cheap.
+
+    cloud = PointCloud(pts_2d, colors=labels_to_colors, radius=0.055, opacity=0.8)
+    self.play(FadeInPoints(cloud, scale=0.4, lag_ratio=0.008), run_time=2.8)
+    self.play(TransitionPoints(cloud, points=targets, colors=labels, lag_ratio=0.004))
+    cloud.highlight([3, 17, 42], YELLOW, radius_scale=2.0)
+
+Edges between points (e.g. a kNN graph) are a single ``Segments`` VMobject
+rather than one ``Line`` per edge, and ``GrowSegments`` draws them all out
+from their start points at once.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from manimlib import Animation
+from manimlib import DotCloud
+from manimlib import GREY_C
+from manimlib import VMobject
+from manimlib.utils.bezier import interpolate
+from manimlib.utils.color import color_to_rgb
+from manimlib.utils.rate_functions import smooth
+
+
+DEFAULT_POINT_RADIUS = 0.055
+
+
+def points_3d(points) -> np.ndarray:
+    """Pad an (N, 2) array of plane coordinates with z = 0."""
+    points = np.asarray(points, dtype=float)
+    if points.ndim == 2 and points.shape[1] == 2:
+        points = np.column_stack([points, np.zeros(len(points))])
+    return points
+
+
+def colors_to_rgb(colors, n: int) -> np.ndarray:
+    """
+    (n, 3) rgb array from one color, a sequence of colors, or an existing
+    numeric (n, 3) / (n, 4) array.  Each distinct color is converted once.
+    """
+    if isinstance(colors, np.ndarray) and colors.dtype.kind == "f":
+        return np.broadcast_to(colors[..., :3], (n, 3))
+    if isinstance(colors, str) or not hasattr(colors, "__len__"):
+        return np.tile(color_to_rgb(colors), (n, 1))
+    lookup = dict()
+    for color in colors:
+        key = str(color)
+        if key not in lookup:
+            lookup[key] = color_to_rgb(color)
+    return np.array([lookup[str(color)] for color in colors])
+
+
+def lag_offsets(n: int, lag_ratio: float) -> np.ndarray:
+    """Start of each point's transition, in units of one point's duration."""
+    return lag_ratio * np.arange(n)
+
+
+def lagged_alphas(alpha: float, offsets: np.ndarray, rate_func=smooth) -> np.ndarray:
+    """
+    Per-point progress for a staggered animation; with ``lag_offsets`` this is
+    the same schedule ``Animation.get_sub_alpha`` gives n submobjects.
+    """
+    full_length = offsets.max(initial=0) + 1
+    raw = np.clip(alpha * full_length - offsets, 0, 1)
+    try:
+        result = rate_func(raw)
+    except ValueError:
+        # Rate functions with branches (e.g. there_and_back) are scalar only
+        result = np.vectorize(rate_func)(raw)
+    return np.broadcast_to(result, offsets.shape)
+
+
+class PointCloud(DotCloud):
+    """
+    A DotCloud built from per-point positions, colors, radii and opacities,
+    with helpers to restyle any subset of points by index.
+    """
+
+    def __init__(
+        self,
+        points,
+        colors=GREY_C,
+        radius=DEFAULT_POINT_RADIUS,
+        opacity=1.0,
+        **kwargs
+    ):
+        points = points_3d(points)
+        super().__init__(points=points, **kwargs)
+        self.set_point_colors(colors, opacity)
+        self.set_point_radii(radius)
+
+    def get_point_indices(self, indices=None) -> np.ndarray | slice:
+        return slice(None) if indices is None else np.asarray(indices)
+
+    @DotCloud.affects_data
+    def set_point_colors(self, colors, opacities=None, indices=None):
+        idx = self.get_point_indices(indices)
+        rgba = self.data["rgba"]
+        n = len(rgba[idx])
+        rgba[idx, :3] = colors_to_rgb(colors, n)
+        if opacities is not None:
+            rgba[idx, 3] = opacities
+        return self
+
+    @DotCloud.affects_data
+    def set_point_opacities(self, opacities, indices=None):
+        self.data["rgba"][self.get_point_indices(indices), 3] = opacities
+        return self
+
+    @DotCloud.affects_data
+    def set_point_radii(self, radii, indices=None):
+        self.data["radius"][self.get_point_indices(indices), 0] = radii
+        self.refresh_bounding_box()
+        return self
+
+    def get_point_colors(self) -> np.ndarray:
+        return self.data["rgba"]
+
+    def highlight(self, indices, color=None, opacity=None, radius_scale=1.0):
+        """Restyle the given points in place, e.g. to mark a query's neighbors."""
+        if color is not None or opacity is not None:
+            if color is None:
+                self.set_point_opacities(opacity, indices)
+            else:
+                self.set_point_colors(color, opacity, indices)
+        if radius_scale != 1.0:
+            idx = self.get_point_indices(indices)
+            self.set_point_radii(radius_scale * self.data["radius"][idx, 0], idx)
+        return self
+
+    def subset(self, indices) -> PointCloud:
+        """New cloud holding copies of the given points."""
+        result = self.copy()
+        result.set_data(self.data[self.get_point_indices(indices)])
+        return result
+
+
+class FadeInPoints(Animation):
+    """
+    Fade a PointCloud in point by point, growing each from ``scale`` times
+    its radius; the vectorized form of
+    ``LaggedStart(*[FadeIn(dot, scale=scale) for dot in dots], lag_ratio=...)``.
+    """
+
+    def __init__(self, cloud: PointCloud, scale: float = 1.0, lag_ratio: float = 0.0, **kwargs):
+        self.scale_factor = scale
+        super().__init__(cloud, lag_ratio=lag_ratio, **kwargs)
+
+    def begin(self) -> None:
+        self.target_data = self.mobject.data.copy()
+        self.offsets = lag_offsets(len(self.target_data), self.lag_ratio)
+        super().begin()
+
+    def interpolate_mobject(self, alpha: float) -> None:
+        target = self.target_data
+        alphas = lagged_alphas(self.time_spanned_alpha(alpha), self.offsets, self.rate_func)
+        data = self.mobject.data
+        data["rgba"][:, 3] = target["rgba"][:, 3] * alphas
+        data["radius"][:, 0] = target["radius"][:, 0] * interpolate(self.scale_factor, 1, alphas)
+        self.mobject.note_changed_data()
+
+
+class TransitionPoints(Animation):
+    """
+    Move and restyle every point of a PointCloud at once, with an optional
+    per-point stagger; the vectorized form of a ``LaggedStart`` of per-dot
+    ``dot.animate.move_to(...).set_color(...)`` animations.
+
+    Targets are (N, 3) or (N, 2) ``points``, (N, 4) ``rgbas`` or
+    ``colors``/``opacities``, and ``radii``; anything left out keeps its
+    current value.  The stagger is ``lag_ratio`` in point order, or an
+    explicit ``lag_schedule`` giving each point's start offset in units of
+    one point's duration (e.g. ordered by distance from a focus).
+    """
+
+    def __init__(
+        self,
+        cloud: PointCloud,
+        points=None,
+        rgbas=None,
+        colors=None,
+        opacities=None,
+        radii=None,
+        lag_ratio: float = 0.0,
+        lag_schedule=None,
+        **kwargs
+    ):
+        self.target_points = points
+        self.target_rgbas = rgbas
+        self.target_colors = colors
+        self.target_opacities = opacities
+        self.target_radii = radii
+        self.lag_schedule = lag_schedule
+        super().__init__(cloud, lag_ratio=lag_ratio, **kwargs)
+
+    def begin(self) -> None:
+        mob = self.mobject
+        n = mob.get_num_points()
+        target = mob.data.copy()
+        if self.target_points is not None:
+            target["point"][:] = points_3d(self.target_points)
+        if self.target_rgbas is not None:
+            target["rgba"][:] = self.target_rgbas
+        if self.target_colors is not None:
+            target["rgba"][:, :3] = colors_to_rgb(self.target_colors, n)
+        if self.target_opacities is not None:
+            target["rgba"][:, 3] = self.target_opacities
+        if self.target_radii is not None:
+            target["radius"][:, 0] = self.target_radii
+
+        # Every DotCloud field is float32, so the whole record array can be
+        # interpolated as one (N, 8) block
+        self.start_block = self.as_block(mob.data).copy()
+        self.delta_block = self.as_block(target) - self.start_block
+        if self.lag_schedule is not None:
+            self.offsets = np.asarray(self.lag_schedule, dtype=float)
+        else:
+            self.offsets = lag_offsets(n, self.lag_ratio)
+        super().begin()
+
+    @staticmethod
+    def as_block(data: np.ndarray) -> np.ndarray:
+        return data.view(np.float32).reshape(len(data), -1)
+
+    def interpolate_mobject(self, alpha: float) -> None:
+        alphas = lagged_alphas(self.time_spanned_alpha(alpha), self.offsets, self.rate_func)
+        block = self.as_block(self.mobject.data)
+        np.multiply(self.delta_block, alphas[:, None], out=block)
+        block += self.start_block
+        self.mobject.note_changed_data()
+
+
+class Segments(VMobject):
+    """
+    Many straight line segments as the subpaths of one VMobject, so a graph
+    with thousands of edges is one stroke draw instead of thousands of Lines.
+    """
+
+    def __init__(self, starts, ends, **kwargs):
+        super().__init__(**kwargs)
+        self.set_segments(starts, ends)
+
+    def set_segments(self, starts, ends):
+        starts = points_3d(starts)
+        ends = points_3d(ends)
+        if len(starts) == 0:
+            self.clear_points()
+            return self
+        # Each segment is one straight quadratic curve (start, midpoint, end);
+        # a handle sitting on the previous end starts the next subpath
+        points = np.empty((len(starts), 4, 3))
+        points[:, 0] = starts
+        points[:, 1] = 0.5 * (starts + ends)
+        points[:, 2] = ends
+        points[:, 3] = ends
+        self.set_points(points.reshape(-1, 3)[:-1])
+        return self
+
+    def get_segment_starts(self) -> np.ndarray:
+        return self.get_points()[0::4]
+
+    def get_segment_ends(self) -> np.ndarray:
+        return self.get_points()[2::4]
+
+
+class GrowSegments(Animation):
+    """
+    Draw every segment out from its start point, with an optional stagger;
+    the vectorized form of ``LaggedStart(*[ShowCreation(line) for line in lines])``.
+    """
+
+    def __init__(self, segments: Segments, lag_ratio: float = 0.0, **kwargs):
+        super().__init__(segments, lag_ratio=lag_ratio, **kwargs)
+
+    def begin(self) -> None:
+        self.starts = self.mobject.get_segment_starts().copy()
+        self.deltas = self.mobject.get_segment_ends() - self.starts
+        self.offsets = lag_offsets(len(self.starts), self.lag_ratio)
+        super().begin()
+
+    def interpolate_mobject(self, alpha: float) -> None:
+        alphas = lagged_alphas(self.time_spanned_alpha(alpha), self.offsets, self.rate_func)
+        self.mobject.set_segments(self.starts, self.starts + alphas[:, None] * self.deltas)
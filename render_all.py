@@ -0,0 +1,181 @@
+"""
+Render every CLIP scene in parallel and stitch them into one master video.
+
+    python render_all.py --hd
+    python render_all.py -l --workers 4 --out videos/batch
+
+Scene classes are discovered from the ``clip_encoding*.py`` files (file order,
+then source order), each one is rendered by its own ``manimgl`` process, and
+the per-scene movies are concatenated in that same fixed order.
+"""
+from __future__ import annotations
+
+import argparse
+import ast
+import os
+import subprocess as sp
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+
+REPO_DIR = Path(__file__).resolve().parent
+SCENE_GLOB = "clip_encoding*.py"
+# Base classes from manimlib that mark a class as a renderable scene
+SCENE_BASES = {"Scene", "ThreeDScene", "InteractiveScene"}
+QUALITY_FLAGS = {"low": "-l", "med": "-m", "hd": "--hd", "uhd": "--uhd"}
+
+
+def discover_scenes(repo_dir=REPO_DIR, pattern=SCENE_GLOB):
+    """
+    Return [(file_name, scene_name), ...] for every Scene subclass, without
+    importing manimlib (which parses sys.argv on import).
+    """
+    files = sorted(repo_dir.glob(pattern))
+    trees = [(f, ast.parse(f.read_text(encoding="utf-8"))) for f in files]
+
+    # Walk class definitions until the set of scene-like names stops growing,
+    # so local subclasses of our own scenes are picked up too.
+    scene_names = set(SCENE_BASES)
+    changed = True
+    while changed:
+        changed = False
+        for _, tree in trees:
+            for node in tree.body:
+                if not isinstance(node, ast.ClassDef) or node.name in scene_names:
+                    continue
+                bases = {b.id for b in node.bases if isinstance(b, ast.Name)}
+                if bases & scene_names:
+                    scene_names.add(node.name)
+                    changed = True
+
+    found = []
+    for f, tree in trees:
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef) and node.name in scene_names - SCENE_BASES:
+                found.append((f.name, node.name))
+    return found
+
+
+def render_scene(job):
+    """Worker: render one scene with its own manimgl process."""
+    file_name, scene_name, quality, scene_dir = job
+    cmd = [
+        sys.executable, "-m", "manimlib",
+        file_name, scene_name,
+        "-w", QUALITY_FLAGS[quality],
+        "--video_dir", str(scene_dir),
+        "--file_name", scene_name,
+        "--quiet",
+    ]
+    start = time.perf_counter()
+    proc = sp.run(cmd, cwd=REPO_DIR, stdout=sp.PIPE, stderr=sp.STDOUT, text=True)
+    elapsed = time.perf_counter() - start
+    movie = Path(scene_dir, scene_name).with_suffix(".mp4")
+    ok = proc.returncode == 0 and movie.exists()
+    return scene_name, str(movie), elapsed, ok, proc.stdout
+
+
+def concat_movies(movies, output, ffmpeg_bin="ffmpeg"):
+    """Losslessly join movies (same codec/resolution) in the given order."""
+    list_file = Path(output).with_suffix(".txt")
+    list_file.write_text(
+        "".join(f"file '{Path(m).resolve()}'\n" for m in movies),
+        encoding="utf-8",
+    )
+    cmd = [
+        ffmpeg_bin, "-y",
+        "-f", "concat", "-safe", "0",
+        "-i", str(list_file),
+        "-c", "copy",
+        "-loglevel", "error",
+        str(output),
+    ]
+    sp.run(cmd, check=True)
+    list_file.unlink()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    quality = parser.add_mutually_exclusive_group()
+    for name, flag in QUALITY_FLAGS.items():
+        quality.add_argument(
+            flag, dest="quality", action="store_const", const=name,
+            help=f"render at {name} quality",
+        )
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count(),
+        help="process pool size (default: number of cores)",
+    )
+    parser.add_argument(
+        "--out", default="videos/batch",
+        help="output directory for per-scene movies and the master video",
+    )
+    parser.add_argument(
+        "--master", default="CLIPMaster.mp4",
+        help="file name of the concatenated video",
+    )
+    parser.add_argument(
+        "--no-concat", action="store_true",
+        help="only render the per-scene movies",
+    )
+    parser.add_argument(
+        "scenes", nargs="*",
+        help="restrict to these scene names (default: all discovered)",
+    )
+    args = parser.parse_args()
+    quality = args.quality or "hd"
+
+    scenes = discover_scenes()
+    if args.scenes:
+        scenes = [s for s in scenes if s[1] in args.scenes]
+    if not scenes:
+        print("No scenes found.")
+        return 1
+
+    out_dir = Path(REPO_DIR, args.out)
+    scene_dir = out_dir / "scenes"
+    scene_dir.mkdir(parents=True, exist_ok=True)
+
+    jobs = [(f, name, quality, scene_dir) for f, name in scenes]
+    n_workers = max(1, min(args.workers or 1, len(jobs)))
+    print(f"Rendering {len(jobs)} scenes at {quality} with {n_workers} workers")
+
+    results = {}
+    wall_start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        futures = [pool.submit(render_scene, job) for job in jobs]
+        for fut in as_completed(futures):
+            name, movie, elapsed, ok, output = fut.result()
+            results[name] = (movie, elapsed, ok)
+            status = "ok" if ok else "FAILED"
+            print(f"  {name:<36} {elapsed:8.1f}s  {status}")
+            if not ok:
+                print(output)
+    wall = time.perf_counter() - wall_start
+
+    print()
+    print(f"{'scene':<36} {'wall time':>10}")
+    for _, name in scenes:
+        movie, elapsed, ok = results[name]
+        print(f"{name:<36} {elapsed:9.1f}s{'' if ok else '  (failed)'}")
+    slowest = max(elapsed for _, elapsed, _ in results.values())
+    serial = sum(elapsed for _, elapsed, _ in results.values())
+    print(f"{'total (parallel)':<36} {wall:9.1f}s")
+    print(f"{'slowest scene':<36} {slowest:9.1f}s")
+    print(f"{'sum of scenes (serial)':<36} {serial:9.1f}s")
+
+    failed = [name for name, (_, _, ok) in results.items() if not ok]
+    if failed:
+        print(f"Skipping concatenation, failed scenes: {', '.join(failed)}")
+        return 1
+    if not args.no_concat:
+        master = out_dir / args.master
+        concat_movies([results[name][0] for _, name in scenes], master)
+        print(f"Master video ready at {master}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""
+Batched spherical linear interpolation, and a per-frame cache for values
+derived from a tracker.
+
+``slerp(a, b, t)`` evaluates every parameter in ``t`` for every pair of rows
+of ``a`` and ``b`` in one broadcast expression, instead of a Python loop with
+a normalization per sample:
+
+    slerp(a, b, 0.3)                      # (3,)
+    slerp(a, b, np.linspace(0, 1, 60))    # (60, 3) points along the great circle
+    slerp(A, B, ts)                       # (M, N, 3) for (M, 3) pairs and N parameters
+
+Several updaters often read the same geometry each frame (an arc, a label
+at its midpoint, a readout of the angle).  ``TrackerCache`` computes it once
+per tracker value and hands the same result to all of them:
+
+    arc_points = TrackerCache(t_tracker, lambda t: great_circle_points(u, tip_at(t), 60))
+    always_set_points(arc, arc_points, smooth=True)            # computed here ...
+    label.add_updater(lambda m: m.move_to(arc_points()[30]))   # ... and reused here
+"""
+from __future__ import annotations
+
+from typing import Callable
+
+import numpy as np
+
+
+def normalize_rows(vectors) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=float)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def slerp(a, b, t, eps: float = 1e-5) -> np.ndarray:
+    """
+    Unit vectors at fraction ``t`` of the great-circle arc from ``a`` to ``b``
+    (normalized first), shaped ``a.shape[:-1] + np.shape(t) + (dim,)``.
+    Nearly parallel pairs fall back to normalized linear interpolation.
+    """
+    a = normalize_rows(a)
+    b = normalize_rows(b)
+    t = np.asarray(t, dtype=float)
+    pairs_shape = np.broadcast_shapes(a.shape, b.shape)
+    a2 = np.broadcast_to(a, pairs_shape).reshape(-1, pairs_shape[-1])
+    b2 = np.broadcast_to(b, pairs_shape).reshape(-1, pairs_shape[-1])
+    ts = t.reshape(1, -1)
+
+    omega = np.arccos(np.clip(np.einsum("ij,ij->i", a2, b2), -1, 1))[:, None]
+    small = omega < eps
+    sin_omega = np.where(small, 1.0, np.sin(omega))
+    wa = np.where(small, 1 - ts, np.sin((1 - ts) * omega) / sin_omega)
+    wb = np.where(small, ts, np.sin(ts * omega) / sin_omega)
+    points = normalize_rows(wa[..., None] * a2[:, None, :] + wb[..., None] * b2[:, None, :])
+    return points.reshape(*pairs_shape[:-1], *t.shape, pairs_shape[-1])
+
+
+def great_circle_points(a, b, n: int) -> np.ndarray:
+    """(n, dim) points from ``a`` to ``b`` (or (M, n, dim) for rows of pairs)."""
+    return slerp(a, b, np.linspace(0, 1, n))
+
+
+def angle_between(a, b) -> np.ndarray:
+    """Angle between (rows of) ``a`` and ``b``, in radians."""
+    cosines = np.einsum("...i,...i->...", normalize_rows(a), normalize_rows(b))
+    return np.arccos(np.clip(cosines, -1, 1))
+
+
+class TrackerCache(object):
+    """
+    ``func(tracker.get_value())``, recomputed only when the value changes, so
+    every updater reading it in a frame shares one evaluation.  With
+    ``key`` (e.g. ``int`` for an epoch counter), ``func`` gets
+    ``key(value)`` and reruns only when that changes.
+    """
+
+    def __init__(
+        self,
+        tracker,
+        func: Callable[[float], object],
+        key: Callable[[float], object] | None = None,
+    ):
+        self.tracker = tracker
+        self.func = func
+        self.key_func = key
+        self.key = None
+        self.result = None
+        self.evaluations = 0
+
+    def __call__(self):
+        value = self.tracker.get_value()
+        if self.key_func is not None:
+            value = self.key_func(value)
+        if self.key is None or value != self.key:
+            self.result = self.func(value)
+            self.key = value
+            self.evaluations += 1
+        return self.result
@@ -0,0 +1,89 @@
+"""
+Spatial index over a 2D/3D layout for batched neighbor queries.
+
+Built once per layout (a KD-tree over the point coordinates), then any number
+of focal points can be queried at once instead of sorting every distance per
+query:
+
+    index = SpatialIndex(targets_2d)
+    ids, dists = index.knn(queries, k=6)            # (M, 6) each
+    ids = index.neighbors_of(focal_indices, k=6)    # excludes the focal point
+    balls = index.within_radius(queries, 0.5)       # one index array per query
+    pairs = index.knn_edges(k=6)                    # undirected kNN graph
+
+Indices refer to rows of the points the index was built from, so they can be
+passed straight to ``PointCloud.highlight``/``subset``.
+"""
+from __future__ import annotations
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+
+class SpatialIndex(object):
+    def __init__(self, points, leafsize: int = 16):
+        points = np.asarray(points, dtype=float)
+        if points.ndim != 2 or points.shape[1] not in (2, 3):
+            raise ValueError(f"expected (N, 2) or (N, 3) points, got shape {points.shape}")
+        self.points = points
+        self.tree = cKDTree(points, leafsize=leafsize)
+
+    @classmethod
+    def from_mobject(cls, mobject, dims: int = 2) -> SpatialIndex:
+        """Index the points of a mobject (e.g. a PointCloud) in its first ``dims`` coordinates."""
+        return cls(mobject.get_points()[:, :dims])
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def as_queries(self, queries) -> np.ndarray:
+        queries = np.asarray(queries, dtype=float)
+        return np.atleast_2d(queries)[:, :self.points.shape[1]]
+
+    def knn(self, queries, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        (M, k) indices and distances of the k nearest points to each of the
+        M query positions, nearest first.
+        """
+        k = min(k, len(self))
+        dists, ids = self.tree.query(self.as_queries(queries), k=[*range(1, k + 1)], workers=-1)
+        return ids, dists
+
+    def neighbors_of(self, indices, k: int) -> np.ndarray:
+        """(M, k) nearest neighbors of indexed points, leaving out each point itself."""
+        indices = np.atleast_1d(np.asarray(indices))
+        k = min(k, len(self) - 1)
+        ids, _ = self.knn(self.points[indices], k + 1)
+        keep = ids != indices[:, None]
+        # A point with exact duplicates may not come back first; drop the farthest instead
+        keep[keep.all(axis=1), -1] = False
+        return ids[keep].reshape(len(indices), k)
+
+    def within_radius(self, queries, radius) -> list[np.ndarray]:
+        """Sorted indices of the points within ``radius`` (scalar or per query) of each query."""
+        balls = self.tree.query_ball_point(
+            self.as_queries(queries), radius, return_sorted=True, workers=-1
+        )
+        return [np.array(ball, dtype=int) for ball in balls]
+
+    def count_within_radius(self, queries, radius) -> np.ndarray:
+        return self.tree.query_ball_point(
+            self.as_queries(queries), radius, return_length=True, workers=-1
+        )
+
+    def knn_edges(self, indices=None, k: int = 6, symmetric: bool = True) -> np.ndarray:
+        """
+        (E, 2) pairs (focal, neighbor) joining each focal point (all points by
+        default) to its k nearest neighbors.  With ``symmetric``, an edge found
+        from both ends is kept once.
+        """
+        if indices is None:
+            indices = np.arange(len(self))
+        indices = np.atleast_1d(np.asarray(indices))
+        ids = self.neighbors_of(indices, k)
+        pairs = np.column_stack([np.repeat(indices, ids.shape[1]), ids.ravel()])
+        if symmetric:
+            key = np.sort(pairs, axis=1)
+            _, first = np.unique(key, axis=0, return_index=True)
+            pairs = pairs[np.sort(first)]
+        return pairs
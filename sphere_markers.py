@@ -0,0 +1,138 @@
+"""
+Instanced low-poly sphere markers for many points in 3D.
+
+A ``Sphere`` is a full parametric surface (101 x 51 samples by default), so
+each embedding drawn as one costs ~10k triangles and its own mobject.
+``SphereMarkers`` stores only per-marker centers, radii and colors (the
+``PointCloud`` layout, so ``set_point_colors``, ``highlight``,
+``FadeInPoints`` etc. all apply) and, when drawn, stamps one shared unit
+sphere mesh at every center in a single vectorized expression and a single
+draw call.
+
+The mesh's level of detail follows the markers' size on screen: a few
+pixels across gets 36 triangles, a close-up gets 576.
+
+    markers = SphereMarkers(unit_vectors * 1.02, colors=colors, radius=0.02)
+    markers.track_camera(self.camera)        # re-pick the level of detail as the camera zooms
+    self.play(FadeInPoints(markers, lag_ratio=0.001))
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+
+import moderngl
+import numpy as np
+
+from manimlib import PI
+from manimlib import TAU
+from manimlib import Surface
+from manimlib.shader_wrapper import ShaderWrapper
+from manimlib.utils.space_ops import normalize_along_axis
+
+from point_cloud import DEFAULT_POINT_RADIUS
+from point_cloud import PointCloud
+
+
+# (samples around, bands from pole to pole) per level of detail
+LOD_RESOLUTIONS = ((6, 3), (10, 5), (16, 8), (24, 12))
+# On-screen marker radius, in pixels, above which the next level is used
+LOD_PIXEL_RADII = (3, 8, 20)
+
+
+@lru_cache()
+def unit_sphere_mesh(n_around: int, n_bands: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Triangle vertices of a unit UV sphere (three per triangle), with two unit
+    tangents per vertex whose cross product is the outward normal, as the
+    surface shader's ``du_point``/``dv_point`` offsets expect.
+    """
+    u = np.linspace(0, TAU, n_around + 1)
+    v = np.linspace(0, PI, n_bands + 1)
+    uu, vv = np.meshgrid(u, v, indexing="ij")
+    grid = np.stack([
+        np.cos(uu) * np.sin(vv),
+        np.sin(uu) * np.sin(vv),
+        -np.cos(vv),
+    ], axis=-1).reshape(-1, 3)
+
+    index_grid = np.arange(len(grid)).reshape(n_around + 1, n_bands + 1)
+    quads = [
+        index_grid[:-1, :-1], index_grid[1:, :-1], index_grid[:-1, 1:],
+        index_grid[:-1, 1:], index_grid[1:, :-1], index_grid[1:, 1:],
+    ]
+    indices = np.stack([q.ravel() for q in quads], axis=1).ravel()
+    normals = grid[indices]
+
+    # Any axis not parallel to the normal gives a tangent; the poles use x
+    axis = np.zeros_like(normals)
+    near_pole = np.abs(normals[:, 2]) > 0.9
+    axis[near_pole, 0] = 1
+    axis[~near_pole, 2] = 1
+    tangent_u = normalize_along_axis(np.cross(axis, normals), 1)
+    tangent_v = np.cross(normals, tangent_u)
+    return normals, tangent_u, tangent_v
+
+
+class SphereMarkers(PointCloud):
+    """
+    A PointCloud drawn as shaded 3D spheres.  ``lod`` fixes the level of
+    detail (an index into ``LOD_RESOLUTIONS``); otherwise it starts at the
+    coarsest and ``update_lod``/``track_camera`` pick it from screen size.
+    """
+    shader_folder: str = "surface"
+    render_primitive: int = moderngl.TRIANGLES
+
+    def __init__(
+        self,
+        points,
+        radius=DEFAULT_POINT_RADIUS,
+        shading=(0.3, 0.2, 0.4),
+        depth_test: bool = True,
+        lod: int | None = None,
+        **kwargs
+    ):
+        self.lod = 0 if lod is None else lod
+        super().__init__(points, radius=radius, shading=shading, depth_test=depth_test, **kwargs)
+
+    def get_lod_for_pixel_size(self, pixel_size: float) -> int:
+        if len(self.data) == 0:
+            return self.lod
+        pixel_radius = self.data["radius"].max() / pixel_size
+        return int(np.searchsorted(LOD_PIXEL_RADII, pixel_radius))
+
+    def update_lod(self, pixel_size: float):
+        """Use the level of detail suited to ``pixel_size`` scene units per pixel."""
+        lod = self.get_lod_for_pixel_size(pixel_size)
+        if lod != self.lod:
+            self.lod = lod
+            self.note_changed_data()
+        return self
+
+    def track_camera(self, camera):
+        """Keep the level of detail matched to ``camera``'s zoom while the scene runs."""
+        self.update_lod(camera.get_pixel_size())
+        self.add_updater(lambda m: m.update_lod(camera.get_pixel_size()))
+        return self
+
+    def init_shader_wrapper(self, ctx: moderngl.Context):
+        self.shader_wrapper = ShaderWrapper(
+            ctx=ctx,
+            vert_data=np.zeros(0, dtype=Surface.data_dtype),
+            shader_folder=self.shader_folder,
+            mobject_uniforms=self.uniforms,
+            depth_test=self.depth_test,
+            render_primitive=self.render_primitive,
+            code_replacements=self.shader_code_replacements,
+        )
+
+    def get_shader_data(self) -> np.ndarray:
+        normals, tangent_u, tangent_v = unit_sphere_mesh(*LOD_RESOLUTIONS[self.lod])
+        centers = self.data["point"][:, None, :]
+        radii = self.data["radius"][:, :, None]
+        points = centers + radii * normals
+        result = np.empty(points.shape[0] * points.shape[1], dtype=Surface.data_dtype)
+        result["point"] = points.reshape(-1, 3)
+        result["du_point"] = (points + radii * tangent_u).reshape(-1, 3)
+        result["dv_point"] = (points + radii * tangent_v).reshape(-1, 3)
+        result["rgba"] = np.repeat(self.data["rgba"], len(normals), axis=0)
+        return result
@@ -0,0 +1,178 @@
+"""
+Persistent, content-addressed cache of compiled Tex path data.
+
+ManimGL already memoizes the LaTeX -> SVG step, but every run still loads
+the SVG and re-parses it into Bézier paths, and the in-memory
+``SVG_HASH_TO_MOB_MAP`` is lost between runs and between scenes.  ``CachedTex``
+stores the parsed submobject data (points, colors, labels) on disk, keyed by
+the normalized LaTeX content and template, so warm runs never call LaTeX or
+svgelements at all.
+
+    from tex_cache import CachedTex, TEX_CACHE
+
+    num = CachedTex("0.42", font_size=22, color=WHITE)
+    TEX_CACHE.report()   # "Tex cache: 118 hits, 6 misses (95% hit rate) ..."
+"""
+from __future__ import annotations
+
+import atexit
+import hashlib
+import io
+import os
+import re
+from pathlib import Path
+
+import numpy as np
+
+from manimlib import Tex
+from manimlib import VMobject
+from manimlib.logger import log
+from manimlib.utils.directories import get_cache_dir
+
+
+# Bump when the stored layout changes so stale entries are never reused
+TEX_CACHE_VERSION = 1
+TEX_CACHE_DIR = Path(get_cache_dir(), "clip_tex_paths")
+TEX_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+def normalize_tex(source: str) -> str:
+    """
+    Collapse runs of spaces and tabs, which LaTeX treats as a single space.
+    Line breaks are kept: a blank line is a paragraph break, and a newline
+    ends a ``%`` comment, so only runs of blank lines collapse (to one).
+    """
+    source = re.sub(r"[ \t]+", " ", source)
+    source = re.sub(r" ?\n ?", "\n", source)
+    return re.sub(r"\n{3,}", "\n\n", source).strip()
+
+
+class TexCache(object):
+    """
+    One ``.npz`` file per compiled string, named by the hash of its key.
+    Entries are evicted least-recently-used first (by mtime, which is
+    refreshed on every hit) once the directory grows past ``max_bytes``.
+    """
+
+    def __init__(self, directory=TEX_CACHE_DIR, max_bytes=TEX_CACHE_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._memory = {}
+
+    def key_for(self, *parts) -> str:
+        raw = "\x1f".join([str(TEX_CACHE_VERSION), *map(str, parts)])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        return self.directory / f"{key}.npz"
+
+    def get(self, key: str):
+        """Return (data_arrays, labels) or None."""
+        if key in self._memory:
+            self.hits += 1
+            return self._memory[key]
+        path = self.path_for(key)
+        try:
+            with np.load(path) as npz:
+                offsets = npz["offsets"]
+                data = npz["data"]
+                labels = npz["labels"].tolist()
+            os.utime(path)
+        except (OSError, KeyError, ValueError):
+            self.misses += 1
+            return None
+        entry = ([data[a:b] for a, b in zip(offsets[:-1], offsets[1:])], labels)
+        self._memory[key] = entry
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, submobjects) -> None:
+        datas = [sm.data for sm in submobjects]
+        labels = [getattr(sm, "label", 0) for sm in submobjects]
+        offsets = np.cumsum([0, *map(len, datas)])
+        data = np.concatenate(datas) if datas else np.zeros(0, dtype=VMobject.data_dtype)
+        self._memory[key] = ([d.copy() for d in datas], labels)
+
+        buff = io.BytesIO()
+        np.savez(buff, data=data, offsets=offsets, labels=np.array(labels, dtype=int))
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.path_for(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(buff.getvalue())
+        os.replace(tmp_path, path)  # Atomic, so parallel renders can share the cache
+        self.evict()
+
+    def evict(self) -> None:
+        entries = []
+        for path in self.directory.glob("*.npz"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self) -> None:
+        self._memory.clear()
+        for path in self.directory.glob("*.npz"):
+            path.unlink(missing_ok=True)
+
+    def report(self) -> None:
+        lookups = self.hits + self.misses
+        if lookups == 0:
+            return
+        log.info(
+            "Tex cache: %d hits, %d misses (%.0f%% hit rate), %s",
+            self.hits, self.misses, 100 * self.hits / lookups, self.directory,
+        )
+
+
+TEX_CACHE = TexCache()
+atexit.register(TEX_CACHE.report)
+
+
+class CachedTex(Tex):
+    """
+    Drop-in replacement for ``Tex`` backed by ``TEX_CACHE``.
+
+    Path data does not depend on font size or color (both are applied after
+    parsing), so neither is part of the key and e.g. every ``"0"`` shares one
+    entry regardless of how it is styled.
+    """
+    cache: TexCache = TEX_CACHE
+
+    def get_svg_string(self, is_labelled: bool = False) -> str:
+        self.cache_key = self.cache.key_for(
+            "Tex",
+            self.tex_environment,
+            normalize_tex(self.get_content(is_labelled or self.use_labelled_svg)),
+            self.template,
+            self.additional_preamble,
+        )
+        self.cached_entry = self.cache.get(self.cache_key)
+        if self.cached_entry is not None:
+            # Placeholder only, init_svg_mobject never parses it on a hit
+            return "<svg/>"
+        return super().get_svg_string(is_labelled)
+
+    def init_svg_mobject(self) -> None:
+        if self.cached_entry is None:
+            super().init_svg_mobject()
+            self.cache.put(self.cache_key, self.submobjects)
+            return
+        datas, labels = self.cached_entry
+        submobs = []
+        for data, label in zip(datas, labels):
+            sm = VMobject()
+            sm.set_data(data)
+            sm.label = label
+            submobs.append(sm)
+        # Stored data is already flipped into manim's y-up orientation
+        self.add(*submobs)
@@ -0,0 +1,214 @@
+"""
+Many small animation steps precomposed into one ``self.play``.
+
+A chain of short ``self.play`` calls (say four per matrix cell) pays the fixed
+per-play cost each time: beginning and finishing animations, rebuilding the
+scene's render groups, and a frame-rate-rounded run time.  A ``Timeline``
+holds the same steps with explicit start and end times and plays them as one
+animation, so the cost grows with the frames rendered rather than with the
+number of steps.
+
+    timeline = Timeline()
+    t = 0
+    for cell in cells:
+        timeline.show(cell.box, at=t)                       # like self.add(...)
+        t = timeline.add(FadeIn(cell.num), start=t, run_time=0.3)
+        t = timeline.add(timeline.animate(cell.num).shift(UP), start=t, run_time=0.2)
+        timeline.hide(cell.num, at=t)                       # like self.remove(...)
+    self.play(timeline)
+
+Each step is prepared and begins when the timeline reaches its start time
+(so it starts from whatever earlier steps left behind), exactly as if it had
+been played in turn.  ``mobject.animate`` builds its target the moment it is
+accessed, so a step scheduled that way would start from the state at
+scheduling time; ``timeline.animate(mobject)`` records the same method calls
+and replays them on ``mobject.animate`` when the step begins instead, and
+``add`` refuses a plain ``.animate``.
+Mobjects appear and disappear only through ``show``/``hide``, and removers
+such as ``FadeOut`` hide theirs when they end (it leaves the scene once the
+timeline finishes); whatever is still shown at the end stays in the scene.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable
+
+from manimlib import Animation
+from manimlib import Group
+from manimlib.animation.animation import prepare_animation
+from manimlib.mobject.mobject import _AnimationBuilder
+
+
+class DeferredAnimate(object):
+    """
+    ``mobject.animate`` with its method calls recorded rather than applied,
+    so the target is only built, from the mobject's state at that moment,
+    by ``build``.
+    """
+
+    def __init__(self, mobject, **anim_args):
+        self.mobject = mobject
+        self.anim_args = anim_args
+        self.calls: list[tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, method_name: str):
+        if method_name.startswith("_"):
+            raise AttributeError(method_name)
+
+        def record(*args, **kwargs):
+            self.calls.append((method_name, args, kwargs))
+            return self
+        return record
+
+    def build(self) -> Animation:
+        builder = self.mobject.animate
+        for method_name, args, kwargs in self.calls:
+            builder = getattr(builder, method_name)(*args, **kwargs)
+        if self.anim_args:
+            builder = builder.set_anim_args(**self.anim_args)
+        return prepare_animation(builder)
+
+
+@dataclass
+class TimelineStep:
+    proto: Animation | DeferredAnimate
+    start: float
+    end: float
+    animation: Animation | None = None
+    begun: bool = False
+    done: bool = False
+
+
+class Timeline(Animation):
+    def __init__(
+        self,
+        run_time: float = -1,  # If negative, default to the end of the last step
+        **kwargs
+    ):
+        self.steps: list[TimelineStep] = []
+        # (time, insertion order, callback) for show/hide and step starts
+        self.events: list[tuple[float, int, Callable]] = []
+        self.end_time = 0.0
+        self.fixed_run_time = run_time
+        self.group = Group()
+        super().__init__(self.group, run_time=max(run_time, 0), **kwargs)
+
+    def add(self, *animations, start: float, run_time: float) -> float:
+        """Play ``animations`` over [start, start + run_time]; returns the end time."""
+        end = start + run_time
+        for proto in animations:
+            if isinstance(proto, _AnimationBuilder):
+                raise TypeError(
+                    "mobject.animate builds its target when scheduled; "
+                    "use timeline.animate(mobject) so the step starts from the state it finds"
+                )
+            step = TimelineStep(proto, start, end)
+            self.steps.append(step)
+            self.add_event(start, lambda step=step: self.begin_step(step))
+        self.extend_to(end)
+        return end
+
+    def animate(self, mobject, **anim_args) -> DeferredAnimate:
+        """Like ``mobject.animate``, but built when its step begins; pass the result to ``add``."""
+        return DeferredAnimate(mobject, **anim_args)
+
+    def show(self, *mobjects, at: float):
+        self.add_event(at, lambda: self.show_now(*mobjects))
+        self.extend_to(at)
+        return self
+
+    def hide(self, *mobjects, at: float):
+        self.add_event(at, lambda: self.hide_now(*mobjects))
+        self.extend_to(at)
+        return self
+
+    def add_event(self, time: float, callback) -> None:
+        self.events.append((time, len(self.events), callback))
+
+    def extend_to(self, time: float) -> None:
+        self.end_time = max(self.end_time, time)
+        if self.fixed_run_time < 0:
+            self.run_time = self.end_time
+
+    def show_now(self, *mobjects) -> None:
+        self.group.add(*mobjects)
+        self.group.note_changed_data()
+
+    def hide_now(self, *mobjects) -> None:
+        self.group.remove(*mobjects)
+        self.group.note_changed_data()
+
+    def begin_step(self, step: TimelineStep) -> None:
+        proto = step.proto
+        step.animation = proto.build() if isinstance(proto, DeferredAnimate) else prepare_animation(proto)
+        step.animation.run_time = step.end - step.start
+        step.animation.begin()
+        step.begun = True
+
+    # ------------------------------------------------------------------
+    # Animation interface
+    # ------------------------------------------------------------------
+    def get_all_mobjects(self):
+        return self.group
+
+    def begin(self) -> None:
+        if self.run_time <= 0:
+            raise ValueError(
+                "Timeline has a run time of 0; add steps, or show/hide after time 0, before playing it"
+            )
+        self.group.clear()
+        for step in self.steps:
+            step.begun = step.done = False
+        self.events.sort(key=lambda event: event[:2])
+        self.next_event = 0
+        self.interpolate(0)
+
+    def interpolate(self, alpha: float) -> None:
+        time = alpha * self.end_time
+        while self.next_event < len(self.events) and self.events[self.next_event][0] <= time:
+            event_time, _, callback = self.events[self.next_event]
+            # Steps that end by now must be complete before a later one starts
+            # from the state they leave behind
+            for step in self.steps:
+                if step.begun and not step.done and step.end <= event_time:
+                    self.finish_step(step)
+            callback()
+            self.next_event += 1
+        for step in self.steps:
+            if not step.begun or step.done:
+                continue
+            if time >= step.end:
+                self.finish_step(step)
+            else:
+                step.animation.interpolate((time - step.start) / (step.end - step.start))
+
+    def finish_step(self, step: TimelineStep) -> None:
+        step.done = True
+        if step.animation.is_remover():
+            # Removers (e.g. FadeOut) restore their mobject in finish() and count
+            # on it leaving the scene, so hold the final frame until clean up
+            step.animation.interpolate(1)
+            self.hide_now(step.animation.mobject)
+        else:
+            step.animation.finish()
+
+    def update_mobjects(self, dt: float) -> None:
+        for step in self.steps:
+            if step.begun and not step.done:
+                step.animation.update_mobjects(dt)
+
+    def finish(self) -> None:
+        self.interpolate(1)
+
+    def clean_up_from_scene(self, scene) -> None:
+        shown = list(self.group.submobjects)
+        scene.remove(self.group)
+        self.group.clear()
+        scene.add(*shown)
+        for step in self.steps:
+            if step.animation is None:
+                continue
+            step.animation.clean_up_from_scene(scene)
+            if step.animation.is_remover():
+                step.animation.finish()
+
@@ -0,0 +1,398 @@
+"""
+UMAP-style 2D projection of embeddings, in vectorized NumPy.
+
+Follows the UMAP recipe (McInnes et al.): k-nearest neighbors (after a PCA
+reduction; exact for small sets, random projection forest plus NN-descent
+for large ones), per-point smooth kNN distances turned into a fuzzy graph,
+fuzzy-union symmetrization, then epochs of edge sampling with negative
+sampling that pull neighbors together and push random pairs apart.  Each
+epoch updates every sampled edge at once instead of looping edge by edge.
+
+    result = umap_project(data, n_neighbors=15, n_epochs=200)
+    result.embedding           # (N, 2) final layout
+    result.snapshots           # (S, N, 2) layouts at result.snapshot_epochs
+    result.layout_at(0.5)      # layout halfway through the optimization
+    result.fitted(6, 4)        # every snapshot framed into a 6 x 4 box
+
+Results are cached on disk, keyed by a hash of the input rows and the
+parameters, so re-rendering a scene never re-runs the optimization.
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+from pathlib import Path
+
+import numpy as np
+from scipy.optimize import curve_fit
+
+from manimlib.logger import log
+from manimlib.utils.directories import get_cache_dir
+
+from embedding_dataset import EmbeddingDataset
+
+
+UMAP_CACHE_VERSION = 1
+UMAP_CACHE_DIR = Path(get_cache_dir(), "clip_umap")
+KNN_CHUNK_ROWS = 1024
+# Above this many points the kNN graph is approximate (RP forest + NN-descent)
+EXACT_KNN_MAX_ROWS = 8192
+# Lower bound on sigma relative to the mean neighbor distance, as in umap-learn
+MIN_SIGMA_SCALE = 1e-3
+GRADIENT_CLIP = 4.0
+
+
+def find_ab_params(spread: float = 1.0, min_dist: float = 0.1) -> tuple[float, float]:
+    """Fit the low-dimensional similarity 1 / (1 + a d^2b) to the min_dist curve."""
+    xv = np.linspace(0, spread * 3, 300)
+    yv = np.where(xv < min_dist, 1.0, np.exp(-(xv - min_dist) / spread))
+    (a, b), _ = curve_fit(lambda x, a, b: 1.0 / (1.0 + a * x ** (2 * b)), xv, yv)
+    return float(a), float(b)
+
+
+def exact_nearest_neighbors(X: np.ndarray, k: int, chunk_rows: int = KNN_CHUNK_ROWS):
+    """Exact kNN (excluding each point itself), a block of rows at a time."""
+    n = len(X)
+    sq_norms = np.einsum("ij,ij->i", X, X)
+    indices = np.empty((n, k), dtype=np.int64)
+    dists = np.empty((n, k), dtype=np.float32)
+    for start in range(0, n, chunk_rows):
+        stop = min(start + chunk_rows, n)
+        d2 = sq_norms[start:stop, None] - 2 * X[start:stop] @ X.T + sq_norms[None, :]
+        d2[np.arange(stop - start), np.arange(start, stop)] = np.inf
+        part = np.argpartition(d2, k - 1, axis=1)[:, :k]
+        part_d2 = np.take_along_axis(d2, part, axis=1)
+        order = np.argsort(part_d2, axis=1)
+        indices[start:stop] = np.take_along_axis(part, order, axis=1)
+        dists[start:stop] = np.sqrt(np.maximum(np.take_along_axis(part_d2, order, axis=1), 0))
+    return indices, dists
+
+
+def smallest_k(ids: np.ndarray, dists: np.ndarray, k: int):
+    """Per row, the k distinct ids with the smallest distances, sorted."""
+    order = np.argsort(ids, axis=1, kind="stable")
+    ids = np.take_along_axis(ids, order, axis=1)
+    dists = np.take_along_axis(dists, order, axis=1).copy()
+    dists[:, 1:][ids[:, 1:] == ids[:, :-1]] = np.inf
+    part = np.argpartition(dists, k - 1, axis=1)[:, :k]
+    part_dists = np.take_along_axis(dists, part, axis=1)
+    order = np.argsort(part_dists, axis=1)
+    best = np.take_along_axis(part, order, axis=1)
+    return np.take_along_axis(ids, best, axis=1), np.take_along_axis(part_dists, order, axis=1)
+
+
+def rp_tree_leaves(X: np.ndarray, leaf_size: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Leaf id of every point in a random projection tree, grown one level at
+    a time for all nodes at once: each node splits at the median of its
+    points' projections onto a random direction, so leaves stay balanced.
+    """
+    n, d = X.shape
+    node = np.zeros(n, dtype=np.int64)
+    depth = max(0, int(np.ceil(np.log2(n / leaf_size))))
+    for level in range(depth):
+        n_nodes = 2 ** level
+        directions = rng.normal(size=(n_nodes, d)).astype(X.dtype)
+        proj = np.einsum("ij,ij->i", X, directions[node])
+        order = np.lexsort((proj, node))
+        sizes = np.bincount(node, minlength=n_nodes)
+        starts = np.cumsum(sizes) - sizes
+        rank = np.empty(n, dtype=np.int64)
+        rank[order] = np.arange(n) - starts[node[order]]
+        node = 2 * node + (rank >= sizes[node] // 2)
+    return node
+
+
+def leaf_neighbors(X: np.ndarray, leaves: np.ndarray, k: int):
+    """Exact kNN within each leaf, all leaves batched into one padded array."""
+    n = len(X)
+    sizes = np.bincount(leaves)
+    order = np.argsort(leaves, kind="stable")
+    starts = np.cumsum(sizes) - sizes
+    slot = np.arange(n) - starts[leaves[order]]
+    members = np.full((len(sizes), sizes.max()), -1, dtype=np.int64)
+    members[leaves[order], slot] = order
+
+    valid = members >= 0
+    P = X[np.maximum(members, 0)]
+    sq = np.einsum("lij,lij->li", P, P)
+    d2 = sq[:, :, None] + sq[:, None, :] - 2 * P @ P.transpose(0, 2, 1)
+    d2[~np.broadcast_to(valid[:, None, :], d2.shape)] = np.inf
+    d2[:, np.arange(d2.shape[1]), np.arange(d2.shape[1])] = np.inf
+
+    part = np.argpartition(d2, k - 1, axis=2)[:, :, :k]
+    ids = np.full((n, k), -1, dtype=np.int64)
+    dists = np.full((n, k), np.inf, dtype=np.float32)
+    rows = members[valid]
+    ids[rows] = np.take_along_axis(members[:, None, :], part, axis=2)[valid]
+    dists[rows] = np.sqrt(np.maximum(np.take_along_axis(d2, part, axis=2)[valid], 0))
+    return ids, dists
+
+
+def refine_neighbors(X: np.ndarray, ids: np.ndarray, dists: np.ndarray, chunk_rows: int = KNN_CHUNK_ROWS):
+    """One round of NN-descent: neighbors of neighbors become candidates."""
+    n, k = ids.shape
+    new_ids = np.empty_like(ids)
+    new_dists = np.empty_like(dists)
+    for start in range(0, n, chunk_rows):
+        stop = min(start + chunk_rows, n)
+        rows = np.arange(start, stop)
+        cand = ids[ids[start:stop]].reshape(stop - start, k * k)
+        diff = X[cand] - X[start:stop, None, :]
+        cand_dists = np.sqrt(np.einsum("ijk,ijk->ij", diff, diff))
+        cand_dists[cand == rows[:, None]] = np.inf
+        new_ids[start:stop], new_dists[start:stop] = smallest_k(
+            np.hstack([ids[start:stop], cand]),
+            np.hstack([dists[start:stop], cand_dists]),
+            k,
+        )
+    return new_ids, new_dists
+
+
+def nearest_neighbors(
+    X: np.ndarray,
+    k: int,
+    rng: np.random.Generator,
+    n_trees: int = 12,
+    n_refine: int = 3,
+):
+    """
+    kNN graph of the rows of X.  Small inputs are searched exactly; larger
+    ones use a random projection forest followed by NN-descent refinement,
+    which is near exact on embedding data at a fraction of the O(N^2) cost.
+    """
+    if len(X) <= EXACT_KNN_MAX_ROWS:
+        return exact_nearest_neighbors(X, k)
+    leaf_size = max(64, 4 * k)
+    ids, dists = leaf_neighbors(X, rp_tree_leaves(X, leaf_size, rng), k)
+    for _ in range(n_trees - 1):
+        tree_ids, tree_dists = leaf_neighbors(X, rp_tree_leaves(X, leaf_size, rng), k)
+        ids, dists = smallest_k(np.hstack([ids, tree_ids]), np.hstack([dists, tree_dists]), k)
+    for _ in range(n_refine):
+        ids, dists = refine_neighbors(X, ids, dists)
+    return ids, dists
+
+
+def smooth_knn_weights(dists: np.ndarray, n_iter: int = 64) -> np.ndarray:
+    """
+    Membership strengths exp(-(d - rho) / sigma), with rho the distance to
+    the nearest neighbor and sigma found per point (all points bisected at
+    once) so that the strengths sum to log2(k).
+    """
+    n, k = dists.shape
+    target = np.log2(k)
+    rho = dists[:, 0].astype(float)
+    excess = np.maximum(dists - rho[:, None], 0)
+
+    lo = np.zeros(n)
+    hi = np.full(n, np.inf)
+    sigma = np.ones(n)
+    for _ in range(n_iter):
+        total = np.exp(-excess / sigma[:, None]).sum(axis=1)
+        too_wide = total > target
+        hi = np.where(too_wide, sigma, hi)
+        lo = np.where(too_wide, lo, sigma)
+        sigma = np.where(np.isinf(hi), sigma * 2, (lo + hi) / 2)
+    sigma = np.maximum(sigma, MIN_SIGMA_SCALE * dists.mean())
+    return np.exp(-excess / sigma[:, None])
+
+
+def fuzzy_union_edges(indices: np.ndarray, weights: np.ndarray):
+    """
+    Symmetrize the directed kNN graph with w = a + b - ab and return each
+    undirected edge once as (heads, tails, weights).
+    """
+    n, k = indices.shape
+    heads = np.repeat(np.arange(n), k)
+    tails = indices.ravel()
+    w = weights.ravel().astype(float)
+
+    keys = heads * n + tails
+    order = np.argsort(keys)
+    keys, heads, tails, w = keys[order], heads[order], tails[order], w[order]
+    reverse = tails * n + heads
+    pos = np.minimum(np.searchsorted(keys, reverse), len(keys) - 1)
+    has_reverse = keys[pos] == reverse
+    w_reverse = np.where(has_reverse, w[pos], 0.0)
+    combined = w + w_reverse - w * w_reverse
+
+    # Mutual edges appear twice, keep the copy with head < tail
+    keep = ~has_reverse | (heads < tails)
+    return heads[keep], tails[keep], combined[keep]
+
+
+def pca_init(X: np.ndarray, rng: np.random.Generator, scale: float = 10.0) -> np.ndarray:
+    """Top two principal components scaled to [-scale, scale], plus a little jitter."""
+    centered = X - X.mean(axis=0)
+    _, _, vt = np.linalg.svd(centered[:min(len(X), 10000)], full_matrices=False)
+    layout = centered @ vt[:2].T
+    layout *= scale / np.abs(layout).max()
+    return layout + rng.normal(scale=1e-4 * scale, size=layout.shape)
+
+
+def optimize_layout(
+    layout: np.ndarray,
+    heads: np.ndarray,
+    tails: np.ndarray,
+    weights: np.ndarray,
+    n_epochs: int,
+    a: float,
+    b: float,
+    rng: np.random.Generator,
+    learning_rate: float = 1.0,
+    negative_sample_rate: int = 5,
+    snapshot_every: int = 10,
+):
+    """
+    Run the sampled-edge SGD.  Each epoch gathers every edge due for
+    sampling, computes all attractive and negative-sample gradients in one
+    pass and scatters them with bincount.  Returns (layout, snapshots, epochs).
+    """
+    n = len(layout)
+    layout = layout.copy()
+    epochs_per_sample = weights.max() / weights
+    next_sample = epochs_per_sample.copy()
+
+    def scatter(index, delta):
+        layout[:, 0] += np.bincount(index, weights=delta[:, 0], minlength=n)
+        layout[:, 1] += np.bincount(index, weights=delta[:, 1], minlength=n)
+
+    snapshots = [layout.astype(np.float32)]
+    snapshot_epochs = [0]
+    for epoch in range(1, n_epochs + 1):
+        alpha = learning_rate * (1.0 - (epoch - 1) / n_epochs)
+        active = np.flatnonzero(next_sample <= epoch)
+        next_sample[active] += epochs_per_sample[active]
+        head = heads[active]
+        tail = tails[active]
+
+        # Attraction along sampled edges moves both ends
+        diff = layout[head] - layout[tail]
+        d2 = np.einsum("ij,ij->i", diff, diff)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            coef = -2.0 * a * b * d2 ** (b - 1.0) / (1.0 + a * d2 ** b)
+        coef = np.where(d2 > 0, coef, 0.0)
+        grad = np.clip(coef[:, None] * diff, -GRADIENT_CLIP, GRADIENT_CLIP) * alpha
+        scatter(head, grad)
+        scatter(tail, -grad)
+
+        # Repulsion from random vertices moves only the head
+        neg_head = np.repeat(head, negative_sample_rate)
+        neg_tail = rng.integers(n, size=len(neg_head))
+        diff = layout[neg_head] - layout[neg_tail]
+        d2 = np.einsum("ij,ij->i", diff, diff)
+        coef = 2.0 * b / ((0.001 + d2) * (1.0 + a * d2 ** b))
+        coef = np.where(neg_head != neg_tail, coef, 0.0)
+        grad = np.clip(coef[:, None] * diff, -GRADIENT_CLIP, GRADIENT_CLIP) * alpha
+        scatter(neg_head, grad)
+
+        if epoch % snapshot_every == 0 or epoch == n_epochs:
+            snapshots.append(layout.astype(np.float32))
+            snapshot_epochs.append(epoch)
+    return layout, np.array(snapshots), np.array(snapshot_epochs)
+
+
+def fit_to_box(layout: np.ndarray, width: float, height: float, center=(0, 0)) -> np.ndarray:
+    """Center a 2D layout on ``center`` and scale it uniformly to fit width x height."""
+    lo = layout.min(axis=0)
+    hi = layout.max(axis=0)
+    extent = np.maximum(hi - lo, 1e-9)
+    scale = min(width / extent[0], height / extent[1])
+    return (layout - (lo + hi) / 2) * scale + np.asarray(center)
+
+
+class UMAPResult(object):
+    def __init__(self, embedding, snapshots, snapshot_epochs, knn_indices):
+        self.embedding = embedding
+        self.snapshots = snapshots
+        self.snapshot_epochs = snapshot_epochs
+        self.knn_indices = knn_indices
+
+    def fitted(self, width: float, height: float, center=(0, 0)) -> UMAPResult:
+        """Copy with every snapshot framed into the same on-screen box."""
+        snapshots = np.array([fit_to_box(s, width, height, center) for s in self.snapshots])
+        return UMAPResult(snapshots[-1], snapshots, self.snapshot_epochs, self.knn_indices)
+
+    def layout_at(self, alpha: float) -> np.ndarray:
+        """Layout at fraction ``alpha`` of the optimization, between snapshots."""
+        epoch = alpha * self.snapshot_epochs[-1]
+        i = int(np.clip(np.searchsorted(self.snapshot_epochs, epoch) - 1, 0, len(self.snapshots) - 2))
+        e0, e1 = self.snapshot_epochs[i], self.snapshot_epochs[i + 1]
+        t = np.clip((epoch - e0) / (e1 - e0), 0, 1)
+        return (1 - t) * self.snapshots[i] + t * self.snapshots[i + 1]
+
+    def to_npz_bytes(self) -> bytes:
+        buff = io.BytesIO()
+        np.savez(
+            buff,
+            embedding=self.embedding,
+            snapshots=self.snapshots,
+            snapshot_epochs=self.snapshot_epochs,
+            knn_indices=self.knn_indices,
+        )
+        return buff.getvalue()
+
+    @classmethod
+    def from_npz(cls, path) -> UMAPResult:
+        with np.load(path) as npz:
+            return cls(**{key: npz[key] for key in npz.files})
+
+
+def data_fingerprint(data: EmbeddingDataset, *params) -> str:
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(repr((UMAP_CACHE_VERSION, len(data), data.dim, params)).encode("utf-8"))
+    for _, rows in data.iter_chunks(dtype=np.float32):
+        hasher.update(np.ascontiguousarray(rows).tobytes())
+    return hasher.hexdigest()
+
+
+def umap_project(
+    data,
+    n_neighbors: int = 15,
+    min_dist: float = 0.1,
+    n_epochs: int = 200,
+    negative_sample_rate: int = 5,
+    learning_rate: float = 1.0,
+    pca_dims: int = 50,
+    snapshot_every: int = 10,
+    seed: int = 0,
+    use_cache: bool = True,
+) -> UMAPResult:
+    """
+    2D UMAP layout of ``data`` (an EmbeddingDataset or (N, D) array), read
+    from the cache when the same rows were projected with the same parameters.
+    """
+    if not isinstance(data, EmbeddingDataset):
+        data = EmbeddingDataset.from_arrays(np.asarray(data))
+    params = (n_neighbors, min_dist, n_epochs, negative_sample_rate, learning_rate, pca_dims, snapshot_every, seed)
+    key = data_fingerprint(data, *params)
+    path = Path(UMAP_CACHE_DIR, f"{key}.npz")
+    if use_cache and path.exists():
+        return UMAPResult.from_npz(path)
+
+    rng = np.random.default_rng(seed)
+    X = data.project(pca_dims) if data.dim > pca_dims else data.to_array(dtype=np.float64)
+    X = X.astype(np.float32)
+    k = min(n_neighbors, len(X) - 1)
+    knn_indices, knn_dists = nearest_neighbors(X, k, rng)
+    heads, tails, weights = fuzzy_union_edges(knn_indices, smooth_knn_weights(knn_dists))
+    # Edges too weak to be sampled even once are dropped, as in umap-learn
+    keep = weights >= weights.max() / n_epochs
+    a, b = find_ab_params(1.0, min_dist)
+    layout, snapshots, epochs = optimize_layout(
+        pca_init(X, rng), heads[keep], tails[keep], weights[keep],
+        n_epochs, a, b, rng,
+        learning_rate=learning_rate,
+        negative_sample_rate=negative_sample_rate,
+        snapshot_every=snapshot_every,
+    )
+    result = UMAPResult(layout, snapshots, epochs, knn_indices)
+
+    if use_cache:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(result.to_npz_bytes())
+        os.replace(tmp_path, path)
+        log.info("UMAP layout of %d points cached at %s", len(X), path)
+    return result